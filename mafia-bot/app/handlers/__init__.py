@@ -2,7 +2,7 @@
 
 from aiogram import Router
 
-from app.handlers import admin, city, game, menu, profile, registration
+from app.handlers import admin, city, game, matchmaking, menu, profile, registration
 
 
 def get_routers() -> list[Router]:
@@ -12,6 +12,7 @@ def get_routers() -> list[Router]:
         menu.router,
         profile.router,
         city.router,
+        matchmaking.router,
         game.router,
         admin.router,
     ]
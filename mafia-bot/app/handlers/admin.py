@@ -1,10 +1,10 @@
 """Admin handlers."""
 
-from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, InlineKeyboardButton, Message
+from aiogram.utils.keyboard import InlineKeyboardBuilder
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,14 +14,29 @@ from app.keyboards import (
     get_event_selection_keyboard,
     get_main_menu_keyboard,
 )
+from app.keyboards.callbacks import (
+    AdminBroadcastCallback,
+    AdminEventCallback,
+    AdminEventCityCallback,
+    AdminMenuCallback,
+    AdminNewCityCallback,
+    AdminStartEventCallback,
+    AdminStatsCallback,
+)
 from app.models.city import City
-from app.models.event import Event, EventType
+from app.models.event import EventType
 from app.models.game import Game, GameStatus
 from app.models.player import Player
+from app.services.background import answer_and_run
+from app.services.city_membership import CityMembership
+from app.services.event_manager import EventManager
+from app.utils.callback_data import CallbackRouter
 from app.utils.i18n import i18n
+from app.utils.logger import get_logger
 from app.config import settings
 
-router = Router()
+router = CallbackRouter()
+logger = get_logger(__name__)
 
 
 class AdminStates(StatesGroup):
@@ -54,7 +69,7 @@ async def cmd_admin(
     )
 
 
-@router.callback_query(F.data == "menu:admin")
+@router.callback_query(AdminMenuCallback.filter())
 async def show_admin_menu(
     callback: CallbackQuery,
     lang: str,
@@ -70,7 +85,7 @@ async def show_admin_menu(
     )
 
 
-@router.callback_query(F.data == "admin:new_city")
+@router.callback_query(AdminNewCityCallback.filter())
 async def start_new_city(
     callback: CallbackQuery,
     state: FSMContext,
@@ -125,13 +140,14 @@ async def process_new_city_name(
     city = City(
         name=city_name,
         creator_id=player.id,
+        language=player.language,
     )
     
     session.add(city)
     await session.flush()
     
     # Add creator to city
-    city.players.append(player)
+    await CityMembership(session).add_creator(city, player.id)
     await session.commit()
     
     await state.clear()
@@ -141,7 +157,7 @@ async def process_new_city_name(
     )
 
 
-@router.callback_query(F.data == "admin:stats")
+@router.callback_query(AdminStatsCallback.filter(), flags={"read_only": True})
 async def show_stats(
     callback: CallbackQuery,
     session: AsyncSession,
@@ -173,7 +189,7 @@ async def show_stats(
     )
 
 
-@router.callback_query(F.data == "admin:start_event")
+@router.callback_query(AdminStartEventCallback.filter())
 async def start_event_selection(
     callback: CallbackQuery,
     lang: str,
@@ -189,10 +205,10 @@ async def start_event_selection(
     )
 
 
-@router.callback_query(F.data.startswith("admin:event:"))
+@router.callback_query(AdminEventCallback.filter())
 async def process_event_selection(
     callback: CallbackQuery,
-    session: AsyncSession,
+    callback_data: AdminEventCallback,
     state: FSMContext,
     lang: str,
 ) -> None:
@@ -201,48 +217,52 @@ async def process_event_selection(
         await callback.answer(i18n.get("errors.no_permission", lang))
         return
     
-    event_type_str = callback.data.split(":")[2]
-    event_type = EventType(event_type_str)
-    
     # Store selected event type
-    await state.update_data(event_type=event_type_str)
+    await state.update_data(event_type=callback_data.event_type.value)
     await state.set_state(AdminStates.selecting_city_for_event)
     
-    # Show list of active cities
-    result = await session.execute(
-        select(City).where(City.is_active == True)
-    )
-    cities = result.scalars().all()
-    
-    from aiogram.types import InlineKeyboardButton
-    from aiogram.utils.keyboard import InlineKeyboardBuilder
-    
-    builder = InlineKeyboardBuilder()
-    
-    for city in cities:
+    async def show_cities(session: AsyncSession) -> None:
+        # Show list of active cities
+        result = await session.execute(
+            select(City).where(City.is_active == True)
+        )
+        cities = result.scalars().all()
+        
+        builder = InlineKeyboardBuilder()
+        
+        for city in cities:
+            builder.row(
+                InlineKeyboardButton(
+                    text=f"{city.name} ({city.player_count} игроков)",
+                    callback_data=AdminEventCityCallback(city_id=city.id).pack()
+                )
+            )
+        
         builder.row(
             InlineKeyboardButton(
-                text=f"{city.name} ({city.player_count} игроков)",
-                callback_data=f"admin:event:city:{city.id}"
+                text=i18n.get("general.back", lang),
+                callback_data=AdminMenuCallback().pack()
             )
         )
-    
-    builder.row(
-        InlineKeyboardButton(
-            text=i18n.get("general.back", lang),
-            callback_data="menu:admin"
+        
+        await callback.message.edit_text(
+            "Выберите город для события:",
+            reply_markup=builder.as_markup(),
         )
-    )
     
-    await callback.message.edit_text(
-        "Выберите город для события:",
-        reply_markup=builder.as_markup(),
+    await answer_and_run(
+        callback,
+        show_cities,
+        lang=lang,
+        name="event_city_selection",
+        read_only=True,
     )
 
 
-@router.callback_query(F.data.startswith("admin:event:city:"))
+@router.callback_query(AdminEventCityCallback.filter())
 async def start_event_in_city(
     callback: CallbackQuery,
+    callback_data: AdminEventCityCallback,
     session: AsyncSession,
     state: FSMContext,
     lang: str,
@@ -252,14 +272,16 @@ async def start_event_in_city(
         await callback.answer(i18n.get("errors.no_permission", lang))
         return
     
-    city_id = int(callback.data.split(":")[3])
+    city_id = callback_data.city_id
     data = await state.get_data()
     event_type_str = data.get("event_type")
     
     result = await session.execute(
-        select(City).where(City.id == city_id)
+        select(City.name, Game)
+        .outerjoin(Game, Game.id == City.current_game_id)
+        .where(City.id == city_id)
     )
-    city = result.scalar_one_or_none()
+    city = result.one_or_none()
     
     if not city:
         await callback.answer(i18n.get("city.invalid_id", lang))
@@ -267,11 +289,7 @@ async def start_event_in_city(
         return
     
     # Get active game in city
-    active_game = None
-    for game in city.games:
-        if game.status not in [GameStatus.ENDED, GameStatus.WAITING]:
-            active_game = game
-            break
+    city_name, active_game = city
     
     if not active_game:
         await callback.message.edit_text(
@@ -281,24 +299,17 @@ async def start_event_in_city(
         await state.clear()
         return
     
-    # Create event
-    event = Event(
-        game_id=active_game.id,
-        event_type=EventType(event_type_str),
-        day_number=active_game.day_number,
-    )
-    
-    session.add(event)
-    await session.commit()
+    # Create event and record its effects
+    await EventManager(session).trigger_event(active_game, EventType(event_type_str))
     
     await state.clear()
     await callback.message.edit_text(
-        i18n.get("admin.event_started", lang, event=event_type_str, city=city.name),
+        i18n.get("admin.event_started", lang, event=event_type_str, city=city_name),
         reply_markup=get_admin_keyboard(lang),
     )
 
 
-@router.callback_query(F.data == "admin:broadcast")
+@router.callback_query(AdminBroadcastCallback.filter())
 async def start_broadcast(
     callback: CallbackQuery,
     state: FSMContext,
@@ -344,7 +355,7 @@ async def process_broadcast(
             )
             sent_count += 1
         except Exception as e:
-            print(f"Failed to send broadcast to {player.id}: {e}")
+            logger.warning("broadcast_failed", player_id=player.id, error=str(e))
     
     await state.clear()
     await message.answer(
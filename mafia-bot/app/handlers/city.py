@@ -1,12 +1,15 @@
 """City handlers."""
 
-from aiogram import F, Router
+from typing import Optional, Union
+
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+from cachetools import TTLCache
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
 from app.keyboards import (
     get_back_keyboard,
@@ -15,11 +18,27 @@ from app.keyboards import (
     get_city_menu_keyboard,
     get_main_menu_keyboard,
 )
+from app.keyboards.callbacks import (
+    CityCreateCallback,
+    CityJoinCallback,
+    CityJoinConfirmCallback,
+    CityJoinMenuCallback,
+    CityLeaveCallback,
+    CityListCallback,
+    CityMenuCallback,
+    CityPageCallback,
+    CityViewCallback,
+)
+from app.config import settings
 from app.models.city import City
+from app.models.game import Game, GameStatus
 from app.models.player import Player
+from app.services.city_directory import CityCursor, CityDirectory, CityFilter, CityPage
+from app.services.city_membership import CityMembership, JoinResult
+from app.utils.callback_data import CallbackRouter
 from app.utils.i18n import i18n
 
-router = Router()
+router = CallbackRouter()
 
 
 class CityStates(StatesGroup):
@@ -52,7 +71,7 @@ async def cmd_city(
     )
 
 
-@router.callback_query(F.data == "menu:city")
+@router.callback_query(CityMenuCallback.filter())
 async def show_city_menu(
     callback: CallbackQuery,
     session: AsyncSession,
@@ -74,58 +93,130 @@ async def show_city_menu(
     )
 
 
-@router.callback_query(F.data == "city:list")
+# Rendered city list pages, keyed by (filter, direction, cursor, lang)
+_city_page_cache: TTLCache = TTLCache(maxsize=1024, ttl=settings.CITY_LIST_CACHE_TTL)
+
+
+async def render_city_page(
+    session: AsyncSession,
+    city_filter: CityFilter,
+    lang: str,
+    direction: str = "n",
+    cursor_token: str = "0",
+) -> Optional[InlineKeyboardMarkup]:
+    """Render city list page keyboard, or None if the page is empty."""
+    cache_key = (city_filter.pack(), direction, cursor_token, lang)
+    if cache_key in _city_page_cache:
+        return _city_page_cache[cache_key]
+    
+    directory = CityDirectory(session)
+    page = await directory.get_page(
+        city_filter,
+        cursor=CityCursor.unpack(cursor_token),
+        backward=direction == "p",
+    )
+    
+    markup = get_city_list_keyboard(page, city_filter, lang) if page.items else None
+    _city_page_cache[cache_key] = markup
+    return markup
+
+
+@router.callback_query(CityListCallback.filter(), flags={"read_only": True})
 async def list_cities(
     callback: CallbackQuery,
     session: AsyncSession,
     lang: str,
 ) -> None:
-    """List available cities."""
-    result = await session.execute(
-        select(City).where(City.is_active == True).order_by(City.created_at.desc())
+    """List available cities (first page, no filters)."""
+    await show_city_page(callback, session, lang, CityFilter())
+
+
+@router.callback_query(CityPageCallback.filter(), flags={"read_only": True})
+async def paginate_cities(
+    callback: CallbackQuery,
+    callback_data: CityPageCallback,
+    session: AsyncSession,
+    lang: str,
+) -> None:
+    """Show a page of the city list."""
+    await show_city_page(
+        callback,
+        session,
+        lang,
+        CityFilter.unpack(callback_data.filter_token),
+        callback_data.direction,
+        callback_data.cursor,
     )
-    cities = result.scalars().all()
+
+
+async def show_city_page(
+    callback: CallbackQuery,
+    session: AsyncSession,
+    lang: str,
+    city_filter: CityFilter,
+    direction: str = "n",
+    cursor_token: str = "0",
+) -> None:
+    """Edit message to show the requested city list page."""
+    markup = await render_city_page(session, city_filter, lang, direction, cursor_token)
     
-    if not cities:
+    if markup is None:
+        # Keep the filter row reachable when filters hide every city
+        empty_page = CityPage(items=[])
         await callback.message.edit_text(
             i18n.get("city.no_cities", lang),
-            reply_markup=get_back_keyboard(lang),
+            reply_markup=(
+                get_city_list_keyboard(empty_page, city_filter, lang)
+                if city_filter != CityFilter()
+                else get_back_keyboard(lang)
+            ),
         )
         return
     
     await callback.message.edit_text(
         i18n.get("city.list", lang),
-        reply_markup=get_city_list_keyboard(cities, lang),
+        reply_markup=markup,
     )
 
 
-@router.callback_query(F.data.startswith("city:view:"))
+@router.callback_query(CityViewCallback.filter(), flags={"read_only": True})
 async def view_city(
     callback: CallbackQuery,
+    callback_data: CityViewCallback,
     session: AsyncSession,
     lang: str,
 ) -> None:
     """View city details."""
-    city_id = int(callback.data.split(":")[2])
+    city_id = callback_data.id
     
     result = await session.execute(
-        select(City).where(City.id == city_id)
+        select(City, Game.status)
+        .outerjoin(Game, Game.id == City.current_game_id)
+        .options(raiseload(City.players), raiseload(City.games))
+        .where(City.id == city_id)
     )
-    city = result.scalar_one_or_none()
+    row = result.one_or_none()
     
-    if not city:
+    if not row:
         await callback.answer(i18n.get("city.invalid_id", lang))
         return
     
+    city, game_status = row
+    creator = await session.scalar(
+        select(Player).options(raiseload("*")).where(Player.id == city.creator_id)
+    )
+    
     # Check if user is a member
-    player_result = await session.execute(
-        select(Player).where(Player.telegram_id == callback.from_user.id)
+    player_id = await session.scalar(
+        select(Player.id).where(Player.telegram_id == callback.from_user.id)
     )
-    player = player_result.scalar_one_or_none()
     
-    is_member = player in city.players if player else False
+    is_member = (
+        await CityMembership(session).is_member(city.id, player_id)
+        if player_id else False
+    )
     
-    city_text = format_city_info(city, lang)
+    city_text = format_city_info(city, lang, game_status, creator)
     
     await callback.message.edit_text(
         city_text,
@@ -133,15 +224,21 @@ async def view_city(
     )
 
 
-def format_city_info(city: City, lang: str) -> str:
-    """Format city information text."""
-    from app.models.game import GameStatus
-    
-    # Get current game status
-    game_status = i18n.get("game.status.waiting", lang)
-    if city.games:
-        latest_game = city.games[-1]
-        game_status = i18n.get(f"game.status.{latest_game.status.value}", lang)
+def format_city_info(
+    city: City,
+    lang: str,
+    game_status: Optional[GameStatus] = None,
+    creator: Optional[Player] = None,
+) -> str:
+    """Format city information text.
+    
+    Args:
+        city: City to describe
+        lang: Language code
+        game_status: Status of the city's current game, if any
+        creator: City creator, if loaded
+    """
+    game_status = i18n.get(f"game.status.{(game_status or GameStatus.WAITING).value}", lang)
     
     info_text = f"""
 🏙️ <b>{city.name}</b>
@@ -150,13 +247,13 @@ def format_city_info(city: City, lang: str) -> str:
 
 {i18n.get("city.players", lang, current=city.player_count, max=city.max_players)}
 {i18n.get("city.status", lang, status=game_status)}
-{i18n.get("city.creator", lang, name=city.creator.display_name if city.creator else "Unknown")}
+{i18n.get("city.creator", lang, name=creator.display_name if creator else "Unknown")}
 {i18n.get("city.created", lang, date=city.created_at.strftime("%d.%m.%Y"))}
 """
     return info_text
 
 
-@router.callback_query(F.data == "city:create")
+@router.callback_query(CityCreateCallback.filter())
 async def start_city_creation(
     callback: CallbackQuery,
     state: FSMContext,
@@ -227,13 +324,14 @@ async def process_city_description(
         name=city_name,
         description=description,
         creator_id=player.id,
+        language=player.language,
     )
     
     session.add(city)
     await session.flush()  # Get city ID
     
     # Add creator to city
-    city.players.append(player)
+    await CityMembership(session).add_creator(city, player.id)
     
     await session.commit()
     
@@ -244,7 +342,7 @@ async def process_city_description(
     )
 
 
-@router.callback_query(F.data == "city:join")
+@router.callback_query(CityJoinMenuCallback.filter())
 async def start_city_join(
     callback: CallbackQuery,
     state: FSMContext,
@@ -275,12 +373,11 @@ async def process_city_join(
         )
         return
     
-    result = await session.execute(
-        select(City).where(City.id == city_id)
+    city_name = await session.scalar(
+        select(City.name).where(City.id == city_id)
     )
-    city = result.scalar_one_or_none()
     
-    if not city:
+    if not city_name:
         await message.answer(
             i18n.get("city.invalid_id", lang),
             reply_markup=get_back_keyboard(lang),
@@ -288,131 +385,116 @@ async def process_city_join(
         return
     
     # Get player
-    player_result = await session.execute(
-        select(Player).where(Player.telegram_id == message.from_user.id)
+    player_id = await session.scalar(
+        select(Player.id).where(Player.telegram_id == message.from_user.id)
     )
-    player = player_result.scalar_one_or_none()
     
-    if not player:
+    if not player_id:
         await message.answer(i18n.get("errors.not_registered", lang))
         await state.clear()
         return
     
-    # Check if already member
-    if player in city.players:
+    join_result = await CityMembership(session).join(city_id, player_id)
+    
+    await state.clear()
+    
+    if join_result == JoinResult.ALREADY_MEMBER:
         await message.answer(
             i18n.get("city.already_member", lang),
             reply_markup=get_main_menu_keyboard(lang),
         )
-        await state.clear()
         return
     
-    # Check if city is full
-    if city.is_full:
+    if join_result == JoinResult.FULL:
         await message.answer(
             i18n.get("city.full", lang),
             reply_markup=get_main_menu_keyboard(lang),
         )
-        await state.clear()
         return
     
-    # Add player to city
-    city.players.append(player)
-    await session.commit()
-    
-    await state.clear()
     await message.answer(
-        i18n.get("city.joined", lang, name=city.name),
+        i18n.get("city.joined", lang, name=city_name),
         reply_markup=get_main_menu_keyboard(lang),
     )
 
 
-@router.callback_query(F.data.startswith("city:join:"))
+@router.callback_query(CityJoinCallback.filter())
+@router.callback_query(CityJoinConfirmCallback.filter())
 async def join_city_callback(
     callback: CallbackQuery,
+    callback_data: Union[CityJoinCallback, CityJoinConfirmCallback],
     session: AsyncSession,
     lang: str,
 ) -> None:
     """Join city from callback."""
-    city_id = int(callback.data.split(":")[2])
+    city_id = callback_data.id
     
-    result = await session.execute(
-        select(City).where(City.id == city_id)
+    city_name = await session.scalar(
+        select(City.name).where(City.id == city_id)
     )
-    city = result.scalar_one_or_none()
     
-    if not city:
+    if not city_name:
         await callback.answer(i18n.get("city.invalid_id", lang))
         return
     
     # Get player
-    player_result = await session.execute(
-        select(Player).where(Player.telegram_id == callback.from_user.id)
+    player_id = await session.scalar(
+        select(Player.id).where(Player.telegram_id == callback.from_user.id)
     )
-    player = player_result.scalar_one_or_none()
     
-    if not player:
+    if not player_id:
         await callback.answer(i18n.get("errors.not_registered", lang))
         return
     
-    # Check if already member
-    if player in city.players:
+    join_result = await CityMembership(session).join(city_id, player_id)
+    
+    if join_result == JoinResult.ALREADY_MEMBER:
         await callback.answer(i18n.get("city.already_member", lang))
         return
     
-    # Check if city is full
-    if city.is_full:
+    if join_result == JoinResult.FULL:
         await callback.answer(i18n.get("city.full", lang))
         return
     
-    # Add player to city
-    city.players.append(player)
-    await session.commit()
-    
     await callback.message.edit_text(
-        i18n.get("city.joined", lang, name=city.name),
+        i18n.get("city.joined", lang, name=city_name),
         reply_markup=get_main_menu_keyboard(lang),
     )
 
 
-@router.callback_query(F.data.startswith("city:leave:"))
+@router.callback_query(CityLeaveCallback.filter())
 async def leave_city(
     callback: CallbackQuery,
+    callback_data: CityLeaveCallback,
     session: AsyncSession,
     lang: str,
 ) -> None:
     """Leave city."""
-    city_id = int(callback.data.split(":")[2])
+    city_id = callback_data.id
     
-    result = await session.execute(
-        select(City).where(City.id == city_id)
+    city_name = await session.scalar(
+        select(City.name).where(City.id == city_id)
     )
-    city = result.scalar_one_or_none()
     
-    if not city:
+    if not city_name:
         await callback.answer(i18n.get("city.invalid_id", lang))
         return
     
     # Get player
-    player_result = await session.execute(
-        select(Player).where(Player.telegram_id == callback.from_user.id)
+    player_id = await session.scalar(
+        select(Player.id).where(Player.telegram_id == callback.from_user.id)
     )
-    player = player_result.scalar_one_or_none()
     
-    if not player:
+    if not player_id:
         await callback.answer(i18n.get("errors.not_registered", lang))
         return
     
-    # Check if member
-    if player not in city.players:
+    # Remove player from city
+    if not await CityMembership(session).leave(city_id, player_id):
         await callback.answer(i18n.get("city.not_member", lang))
         return
     
-    # Remove player from city
-    city.players.remove(player)
-    await session.commit()
-    
     await callback.message.edit_text(
-        i18n.get("city.left", lang, name=city.name),
+        i18n.get("city.left", lang, name=city_name),
         reply_markup=get_main_menu_keyboard(lang),
     )
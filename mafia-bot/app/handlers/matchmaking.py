@@ -0,0 +1,76 @@
+"""Matchmaking handlers."""
+
+from aiogram.types import CallbackQuery
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.keyboards import get_city_menu_keyboard
+from app.keyboards.callbacks import (
+    MatchJoinCallback,
+    MatchLeaveCallback,
+)
+from app.models.player import Player
+from app.services.game_lookup import GameLookup
+from app.services.matchmaking import Matchmaker
+from app.utils.callback_data import CallbackRouter
+from app.utils.i18n import i18n
+
+router = CallbackRouter()
+
+
+@router.callback_query(MatchJoinCallback.filter())
+async def join_queue(
+    callback: CallbackQuery,
+    session: AsyncSession,
+    matchmaker: Matchmaker,
+    lang: str,
+) -> None:
+    """Put player in the matchmaking queue."""
+    result = await session.execute(
+        select(Player.id, Player.language, Player.level)
+        .where(Player.telegram_id == callback.from_user.id)
+    )
+    player = result.one_or_none()
+
+    if not player:
+        await callback.answer(i18n.get("errors.not_registered", lang))
+        return
+
+    if await GameLookup(session).get_player_active_game(player.id):
+        await callback.answer(i18n.get("matchmaking.in_game", lang))
+        return
+
+    if not await matchmaker.enqueue(session, player.id, player.language, player.level):
+        await callback.answer(i18n.get("matchmaking.already_queued", lang))
+        return
+
+    await callback.message.edit_text(
+        i18n.get("matchmaking.queued", lang),
+        reply_markup=get_city_menu_keyboard(lang),
+    )
+
+
+@router.callback_query(MatchLeaveCallback.filter())
+async def leave_queue(
+    callback: CallbackQuery,
+    session: AsyncSession,
+    matchmaker: Matchmaker,
+    lang: str,
+) -> None:
+    """Remove player from the matchmaking queue."""
+    player_id = await session.scalar(
+        select(Player.id).where(Player.telegram_id == callback.from_user.id)
+    )
+
+    if not player_id:
+        await callback.answer(i18n.get("errors.not_registered", lang))
+        return
+
+    if not await matchmaker.cancel(session, player_id):
+        await callback.answer(i18n.get("matchmaking.not_queued", lang))
+        return
+
+    await callback.message.edit_text(
+        i18n.get("matchmaking.left", lang),
+        reply_markup=get_city_menu_keyboard(lang),
+    )
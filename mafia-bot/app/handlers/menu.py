@@ -1,6 +1,5 @@
 """Main menu handlers."""
 
-from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy import select
@@ -12,11 +11,20 @@ from app.keyboards import (
     get_language_keyboard,
     get_main_menu_keyboard,
 )
+from app.keyboards.callbacks import (
+    AdminMenuCallback,
+    CityMenuCallback,
+    HelpCallback,
+    LanguageCallback,
+    LanguageMenuCallback,
+    MainMenuCallback,
+)
 from app.models.player import Player
+from app.utils.callback_data import CallbackRouter
 from app.utils.i18n import i18n
 from app.config import settings
 
-router = Router()
+router = CallbackRouter()
 
 
 @router.message(Command("menu"))
@@ -41,7 +49,7 @@ async def cmd_menu(
     )
 
 
-@router.callback_query(F.data == "menu:main")
+@router.callback_query(MainMenuCallback.filter())
 async def show_main_menu(
     callback: CallbackQuery,
     session: AsyncSession,
@@ -63,7 +71,7 @@ async def show_main_menu(
     )
 
 
-@router.callback_query(F.data == "menu:city")
+@router.callback_query(CityMenuCallback.filter())
 async def show_city_menu(
     callback: CallbackQuery,
     session: AsyncSession,
@@ -85,7 +93,7 @@ async def show_city_menu(
     )
 
 
-@router.callback_query(F.data == "menu:language")
+@router.callback_query(LanguageMenuCallback.filter())
 async def show_language_menu(
     callback: CallbackQuery,
     session: AsyncSession,
@@ -107,14 +115,15 @@ async def show_language_menu(
     )
 
 
-@router.callback_query(F.data.startswith("lang:"))
+@router.callback_query(LanguageCallback.filter())
 async def change_language(
     callback: CallbackQuery,
+    callback_data: LanguageCallback,
     session: AsyncSession,
     lang: str,
 ) -> None:
     """Change user language."""
-    new_lang = callback.data.split(":")[1]
+    new_lang = callback_data.code
     
     result = await session.execute(
         select(Player).where(Player.telegram_id == callback.from_user.id)
@@ -137,7 +146,7 @@ async def change_language(
     )
 
 
-@router.callback_query(F.data == "menu:help")
+@router.callback_query(HelpCallback.filter())
 async def show_help(
     callback: CallbackQuery,
     session: AsyncSession,
@@ -187,7 +196,7 @@ async def show_help(
     )
 
 
-@router.callback_query(F.data == "menu:admin")
+@router.callback_query(AdminMenuCallback.filter())
 async def show_admin_menu(
     callback: CallbackQuery,
     session: AsyncSession,
@@ -1,19 +1,22 @@
 """Profile handlers."""
 
-from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.keyboards import get_back_keyboard, get_main_menu_keyboard
+from app.keyboards.callbacks import (
+    ProfileCallback,
+)
 from app.models.player import Player
+from app.utils.callback_data import CallbackRouter
 from app.utils.i18n import i18n
 
-router = Router()
+router = CallbackRouter()
 
 
-@router.message(Command("profile"))
+@router.message(Command("profile"), flags={"read_only": True})
 async def cmd_profile(
     message: Message,
     session: AsyncSession,
@@ -37,7 +40,7 @@ async def cmd_profile(
     )
 
 
-@router.callback_query(F.data == "menu:profile")
+@router.callback_query(ProfileCallback.filter(), flags={"read_only": True})
 async def show_profile(
     callback: CallbackQuery,
     session: AsyncSession,
@@ -1,6 +1,5 @@
 """Registration handlers."""
 
-from aiogram import F, Router
 from aiogram.filters import CommandStart
 from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
@@ -9,10 +8,15 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.keyboards import get_language_keyboard, get_main_menu_keyboard, get_registration_keyboard
+from app.keyboards.callbacks import (
+    LanguageCallback,
+    UseTelegramNameCallback,
+)
 from app.models.player import Player
+from app.utils.callback_data import CallbackRouter
 from app.utils.i18n import i18n
 
-router = Router()
+router = CallbackRouter()
 
 
 class RegistrationStates(StatesGroup):
@@ -53,14 +57,15 @@ async def cmd_start(
     )
 
 
-@router.callback_query(F.data.startswith("lang:"), RegistrationStates.choosing_language)
+@router.callback_query(LanguageCallback.filter(), RegistrationStates.choosing_language)
 async def process_language_selection(
     callback: CallbackQuery,
+    callback_data: LanguageCallback,
     session: AsyncSession,
     state: FSMContext,
 ) -> None:
     """Process language selection."""
-    lang_code = callback.data.split(":")[1]
+    lang_code = callback_data.code
     await state.update_data(language=lang_code)
     
     # Update user's language preference if they exist
@@ -89,7 +94,7 @@ async def process_language_selection(
     )
 
 
-@router.callback_query(F.data == "reg:use_telegram_name", RegistrationStates.entering_name)
+@router.callback_query(UseTelegramNameCallback.filter(), RegistrationStates.entering_name)
 async def process_telegram_name(
     callback: CallbackQuery,
     session: AsyncSession,
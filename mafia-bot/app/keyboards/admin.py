@@ -3,6 +3,15 @@
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.keyboards.callbacks import (
+    AdminBroadcastCallback,
+    AdminEventCallback,
+    AdminMenuCallback,
+    AdminNewCityCallback,
+    AdminStartEventCallback,
+    AdminStatsCallback,
+    MainMenuCallback,
+)
 from app.models.event import EventType
 from app.utils.i18n import i18n
 
@@ -14,32 +23,32 @@ def get_admin_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("admin.new_city", lang),
-            callback_data="admin:new_city"
+            callback_data=AdminNewCityCallback().pack()
         )
     )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("admin.start_event", lang),
-            callback_data="admin:start_event"
+            callback_data=AdminStartEventCallback().pack()
         )
     )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("admin.stats", lang),
-            callback_data="admin:stats"
+            callback_data=AdminStatsCallback().pack()
         ),
         InlineKeyboardButton(
             text=i18n.get("admin.broadcast", lang),
-            callback_data="admin:broadcast"
+            callback_data=AdminBroadcastCallback().pack()
         )
     )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.back", lang),
-            callback_data="menu:main"
+            callback_data=MainMenuCallback().pack()
         )
     )
     
@@ -64,14 +73,14 @@ def get_event_selection_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
         builder.row(
             InlineKeyboardButton(
                 text=display_name,
-                callback_data=f"admin:event:{event_type.value}"
+                callback_data=AdminEventCallback(event_type=event_type).pack()
             )
         )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.back", lang),
-            callback_data="menu:admin"
+            callback_data=AdminMenuCallback().pack()
         )
     )
     
@@ -0,0 +1,174 @@
+"""Callback data schemas (see docs/API.md)."""
+
+from typing import Literal
+
+from app.models.event import EventType
+from app.utils.callback_data import CallbackSchema
+
+
+# Menu
+class MainMenuCallback(CallbackSchema, prefix="menu:main"):
+    pass
+
+
+class CityMenuCallback(CallbackSchema, prefix="menu:city"):
+    pass
+
+
+class ProfileCallback(CallbackSchema, prefix="menu:profile"):
+    pass
+
+
+class JournalCallback(CallbackSchema, prefix="menu:journal"):
+    pass
+
+
+class SettingsCallback(CallbackSchema, prefix="menu:settings"):
+    pass
+
+
+class LanguageMenuCallback(CallbackSchema, prefix="menu:language"):
+    pass
+
+
+class HelpCallback(CallbackSchema, prefix="menu:help"):
+    pass
+
+
+class AdminMenuCallback(CallbackSchema, prefix="menu:admin"):
+    pass
+
+
+# Registration
+class UseTelegramNameCallback(CallbackSchema, prefix="reg:use_telegram_name"):
+    pass
+
+
+class LanguageCallback(CallbackSchema, prefix="lang"):
+    code: str
+
+
+# City
+class CityCreateCallback(CallbackSchema, prefix="city:create"):
+    pass
+
+
+class CityJoinMenuCallback(CallbackSchema, prefix="city:join"):
+    pass
+
+
+class CityListCallback(CallbackSchema, prefix="city:list"):
+    pass
+
+
+class CityPageCallback(CallbackSchema, prefix="city:page"):
+    filter_token: str
+    direction: Literal["n", "p"]
+    cursor: str
+
+
+class CityViewCallback(CallbackSchema, prefix="city:view"):
+    id: int
+
+
+class CityJoinCallback(CallbackSchema, prefix="city:join"):
+    id: int
+
+
+class CityJoinConfirmCallback(CallbackSchema, prefix="city:join:confirm"):
+    id: int
+
+
+class CityLeaveCallback(CallbackSchema, prefix="city:leave"):
+    id: int
+
+
+# Matchmaking
+class MatchJoinCallback(CallbackSchema, prefix="match:join"):
+    pass
+
+
+class MatchLeaveCallback(CallbackSchema, prefix="match:leave"):
+    pass
+
+
+# Game
+class GameStartCallback(CallbackSchema, prefix="game:start"):
+    city_id: int
+
+
+class NightActionsCallback(CallbackSchema, prefix="game:night_actions"):
+    pass
+
+
+class VoteMenuCallback(CallbackSchema, prefix="game:vote"):
+    pass
+
+
+class GameJournalCallback(CallbackSchema, prefix="game:journal"):
+    pass
+
+
+class PlayersCallback(CallbackSchema, prefix="game:players"):
+    pass
+
+
+# Actions
+class ActionCallback(CallbackSchema, prefix="action"):
+    action: str
+
+
+class ActionTargetCallback(CallbackSchema, prefix="action"):
+    action: str
+    target_id: int
+
+
+class ActionConfirmCallback(CallbackSchema, prefix="action:confirm"):
+    action: str
+    target_id: int
+
+
+class ActionSkipCallback(CallbackSchema, prefix="action:skip"):
+    pass
+
+
+class ActionCancelCallback(CallbackSchema, prefix="action:cancel"):
+    pass
+
+
+class ActionBackCallback(CallbackSchema, prefix="action:back"):
+    pass
+
+
+class ConfirmCallback(CallbackSchema, prefix="action:confirm"):
+    pass
+
+
+# Voting
+class VoteCallback(CallbackSchema, prefix="vote"):
+    player_id: int
+
+
+# Admin
+class AdminNewCityCallback(CallbackSchema, prefix="admin:new_city"):
+    pass
+
+
+class AdminStartEventCallback(CallbackSchema, prefix="admin:start_event"):
+    pass
+
+
+class AdminStatsCallback(CallbackSchema, prefix="admin:stats"):
+    pass
+
+
+class AdminBroadcastCallback(CallbackSchema, prefix="admin:broadcast"):
+    pass
+
+
+class AdminEventCallback(CallbackSchema, prefix="admin:event"):
+    event_type: EventType
+
+
+class AdminEventCityCallback(CallbackSchema, prefix="admin:event:city"):
+    city_id: int
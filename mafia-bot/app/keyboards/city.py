@@ -5,7 +5,23 @@ from typing import List
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.keyboards.callbacks import (
+    CityCreateCallback,
+    CityJoinCallback,
+    CityJoinConfirmCallback,
+    CityJoinMenuCallback,
+    CityLeaveCallback,
+    CityListCallback,
+    CityMenuCallback,
+    CityPageCallback,
+    CityViewCallback,
+    GameStartCallback,
+    MainMenuCallback,
+    MatchJoinCallback,
+    MatchLeaveCallback,
+)
 from app.models.city import City
+from app.services.city_directory import CityFilter, CityPage
 from app.utils.i18n import i18n
 
 
@@ -16,50 +32,101 @@ def get_city_menu_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("city.create_new", lang),
-            callback_data="city:create"
+            callback_data=CityCreateCallback().pack()
         )
     )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("city.join", lang),
-            callback_data="city:join"
+            callback_data=CityJoinMenuCallback().pack()
         )
     )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("city.list", lang),
-            callback_data="city:list"
+            callback_data=CityListCallback().pack()
+        )
+    )
+    
+    builder.row(
+        InlineKeyboardButton(
+            text=i18n.get("matchmaking.join", lang),
+            callback_data=MatchJoinCallback().pack()
+        ),
+        InlineKeyboardButton(
+            text=i18n.get("matchmaking.leave", lang),
+            callback_data=MatchLeaveCallback().pack()
         )
     )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.back", lang),
-            callback_data="menu:main"
+            callback_data=MainMenuCallback().pack()
         )
     )
     
     return builder.as_markup()
 
 
-def get_city_list_keyboard(cities: List[City], lang: str = "ru") -> InlineKeyboardMarkup:
-    """Get city list keyboard."""
+def get_city_list_keyboard(
+    page: CityPage,
+    city_filter: CityFilter,
+    lang: str = "ru",
+) -> InlineKeyboardMarkup:
+    """Get city list keyboard for a single page."""
     builder = InlineKeyboardBuilder()
     
-    for city in cities:
+    for city in page.items:
         builder.row(
             InlineKeyboardButton(
                 text=f"{city.name} ({city.player_count}/{city.max_players})",
-                callback_data=f"city:view:{city.id}"
+                callback_data=CityViewCallback(id=city.id).pack()
+            )
+        )
+    
+    # Filter toggles always restart from the first page
+    filters = [
+        ("city.filter_open", city_filter.open_only, city_filter.toggle_open()),
+        ("city.filter_not_started", city_filter.not_started, city_filter.toggle_not_started()),
+        ("city.filter_language", city_filter.language is not None, city_filter.toggle_language(lang)),
+    ]
+    builder.row(*[
+        InlineKeyboardButton(
+            text=f"{'✅' if enabled else '▫️'} {i18n.get(text_key, lang)}",
+            callback_data=CityPageCallback(filter_token=toggled.pack(), direction="n", cursor="0").pack()
+        )
+        for text_key, enabled, toggled in filters
+    ])
+    
+    navigation = []
+    if page.prev_cursor:
+        navigation.append(
+            InlineKeyboardButton(
+                text=i18n.get("city.page_prev", lang),
+                callback_data=CityPageCallback(
+                    filter_token=city_filter.pack(), direction="p", cursor=page.prev_cursor.pack()
+                ).pack()
+            )
+        )
+    if page.next_cursor:
+        navigation.append(
+            InlineKeyboardButton(
+                text=i18n.get("city.page_next", lang),
+                callback_data=CityPageCallback(
+                    filter_token=city_filter.pack(), direction="n", cursor=page.next_cursor.pack()
+                ).pack()
             )
         )
+    if navigation:
+        builder.row(*navigation)
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.back", lang),
-            callback_data="menu:city"
+            callback_data=CityMenuCallback().pack()
         )
     )
     
@@ -74,16 +141,16 @@ def get_city_actions_keyboard(city: City, is_member: bool, lang: str = "ru") ->
         builder.row(
             InlineKeyboardButton(
                 text=i18n.get("city.leave", lang),
-                callback_data=f"city:leave:{city.id}"
+                callback_data=CityLeaveCallback(id=city.id).pack()
             )
         )
         
         # Show start game button if enough players and not in game
-        if city.can_start and (not city.games or city.games[-1].status.value == "ended"):
+        if city.can_start and not city.has_active_game:
             builder.row(
                 InlineKeyboardButton(
                     text="🎮 Начать игру",
-                    callback_data=f"game:start:{city.id}"
+                    callback_data=GameStartCallback(city_id=city.id).pack()
                 )
             )
     else:
@@ -91,14 +158,14 @@ def get_city_actions_keyboard(city: City, is_member: bool, lang: str = "ru") ->
             builder.row(
                 InlineKeyboardButton(
                     text=i18n.get("city.join", lang),
-                    callback_data=f"city:join:{city.id}"
+                    callback_data=CityJoinCallback(id=city.id).pack()
                 )
             )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.back", lang),
-            callback_data="city:list"
+            callback_data=CityListCallback().pack()
         )
     )
     
@@ -112,11 +179,11 @@ def get_city_join_confirmation_keyboard(city_id: int, lang: str = "ru") -> Inlin
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.confirm", lang),
-            callback_data=f"city:join:confirm:{city_id}"
+            callback_data=CityJoinConfirmCallback(id=city_id).pack()
         ),
         InlineKeyboardButton(
             text=i18n.get("general.cancel", lang),
-            callback_data=f"city:view:{city_id}"
+            callback_data=CityViewCallback(id=city_id).pack()
         )
     )
     
@@ -5,6 +5,18 @@ from typing import List, Optional
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.keyboards.callbacks import (
+    ActionCallback,
+    ActionCancelCallback,
+    ActionConfirmCallback,
+    ActionSkipCallback,
+    ActionTargetCallback,
+    GameJournalCallback,
+    NightActionsCallback,
+    PlayersCallback,
+    VoteCallback,
+    VoteMenuCallback,
+)
 from app.models.role import PlayerRole
 from app.models.role import Role
 from app.utils.i18n import i18n
@@ -18,25 +30,25 @@ def get_game_menu_keyboard(game_status: str, lang: str = "ru") -> InlineKeyboard
         builder.row(
             InlineKeyboardButton(
                 text="🌑 Ночные действия",
-                callback_data="game:night_actions"
+                callback_data=NightActionsCallback().pack()
             )
         )
     elif game_status in ["day", "voting"]:
         builder.row(
             InlineKeyboardButton(
                 text="🗳️ Голосовать",
-                callback_data="game:vote"
+                callback_data=VoteMenuCallback().pack()
             )
         )
     
     builder.row(
         InlineKeyboardButton(
             text="📜 Журнал",
-            callback_data="game:journal"
+            callback_data=GameJournalCallback().pack()
         ),
         InlineKeyboardButton(
             text="👥 Игроки",
-            callback_data="game:players"
+            callback_data=PlayersCallback().pack()
         )
     )
     
@@ -56,14 +68,14 @@ def get_target_selection_keyboard(
         builder.row(
             InlineKeyboardButton(
                 text=f"👤 {display_name}",
-                callback_data=f"action:{action}:{target.player_id}"
+                callback_data=ActionTargetCallback(action=action, target_id=target.player_id).pack()
             )
         )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.cancel", lang),
-            callback_data="action:cancel"
+            callback_data=ActionCancelCallback().pack()
         )
     )
     
@@ -82,14 +94,14 @@ def get_vote_keyboard(
         builder.row(
             InlineKeyboardButton(
                 text=f"👤 {display_name}",
-                callback_data=f"vote:{candidate.player_id}"
+                callback_data=VoteCallback(player_id=candidate.player_id).pack()
             )
         )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.cancel", lang),
-            callback_data="action:cancel"
+            callback_data=ActionCancelCallback().pack()
         )
     )
     
@@ -101,29 +113,29 @@ def get_action_keyboard(role_key: str, lang: str = "ru") -> InlineKeyboardMarkup
     builder = InlineKeyboardBuilder()
     
     action_buttons = {
-        "mafia": ("actions.kill", "action:kill"),
-        "don": ("actions.kill", "action:kill"),
-        "doctor": ("actions.heal", "action:heal"),
-        "sheriff": ("actions.investigate", "action:investigate"),
-        "maniac": ("actions.kill", "action:maniac_kill"),
-        "cupid": ("actions.matchmake", "action:matchmake"),
-        "prostitute": ("actions.block", "action:block"),
-        "bodyguard": ("actions.protect", "action:protect"),
+        "mafia": ("actions.kill", "kill"),
+        "don": ("actions.kill", "kill"),
+        "doctor": ("actions.heal", "heal"),
+        "sheriff": ("actions.investigate", "investigate"),
+        "maniac": ("actions.kill", "maniac_kill"),
+        "cupid": ("actions.matchmake", "matchmake"),
+        "prostitute": ("actions.block", "block"),
+        "bodyguard": ("actions.protect", "protect"),
     }
     
     if role_key in action_buttons:
-        text_key, callback = action_buttons[role_key]
+        text_key, action = action_buttons[role_key]
         builder.row(
             InlineKeyboardButton(
                 text=i18n.get(text_key, lang),
-                callback_data=callback
+                callback_data=ActionCallback(action=action).pack()
             )
         )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.cancel", lang),
-            callback_data="action:cancel"
+            callback_data=ActionCancelCallback().pack()
         )
     )
     
@@ -141,11 +153,11 @@ def get_night_action_confirmation_keyboard(
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.confirm", lang),
-            callback_data=f"action:{action}:confirm:{target_id}"
+            callback_data=ActionConfirmCallback(action=action, target_id=target_id).pack()
         ),
         InlineKeyboardButton(
             text=i18n.get("general.cancel", lang),
-            callback_data="action:cancel"
+            callback_data=ActionCancelCallback().pack()
         )
     )
     
@@ -159,7 +171,7 @@ def get_skip_action_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text="⏭️ Пропустить",
-            callback_data="action:skip"
+            callback_data=ActionSkipCallback().pack()
         )
     )
     
@@ -3,6 +3,19 @@
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from app.keyboards.callbacks import (
+    ActionBackCallback,
+    ActionCancelCallback,
+    CityMenuCallback,
+    ConfirmCallback,
+    HelpCallback,
+    JournalCallback,
+    LanguageCallback,
+    LanguageMenuCallback,
+    ProfileCallback,
+    SettingsCallback,
+    UseTelegramNameCallback,
+)
 from app.utils.i18n import i18n
 
 
@@ -13,33 +26,33 @@ def get_main_menu_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("menu.city", lang),
-            callback_data="menu:city"
+            callback_data=CityMenuCallback().pack()
         ),
         InlineKeyboardButton(
             text=i18n.get("menu.profile", lang),
-            callback_data="menu:profile"
+            callback_data=ProfileCallback().pack()
         )
     )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("menu.journal", lang),
-            callback_data="menu:journal"
+            callback_data=JournalCallback().pack()
         ),
         InlineKeyboardButton(
             text=i18n.get("menu.settings", lang),
-            callback_data="menu:settings"
+            callback_data=SettingsCallback().pack()
         )
     )
     
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("menu.language", lang),
-            callback_data="menu:language"
+            callback_data=LanguageMenuCallback().pack()
         ),
         InlineKeyboardButton(
             text=i18n.get("menu.help", lang),
-            callback_data="menu:help"
+            callback_data=HelpCallback().pack()
         )
     )
     
@@ -60,7 +73,7 @@ def get_language_keyboard() -> InlineKeyboardMarkup:
             row.append(
                 InlineKeyboardButton(
                     text=lang_name,
-                    callback_data=f"lang:{lang_code}"
+                    callback_data=LanguageCallback(code=lang_code).pack()
                 )
             )
         builder.row(*row)
@@ -75,7 +88,7 @@ def get_cancel_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.cancel", lang),
-            callback_data="action:cancel"
+            callback_data=ActionCancelCallback().pack()
         )
     )
     
@@ -89,11 +102,11 @@ def get_confirm_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.yes", lang),
-            callback_data="action:confirm"
+            callback_data=ConfirmCallback().pack()
         ),
         InlineKeyboardButton(
             text=i18n.get("general.no", lang),
-            callback_data="action:cancel"
+            callback_data=ActionCancelCallback().pack()
         )
     )
     
@@ -107,7 +120,7 @@ def get_back_keyboard(lang: str = "ru") -> InlineKeyboardMarkup:
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("general.back", lang),
-            callback_data="action:back"
+            callback_data=ActionBackCallback().pack()
         )
     )
     
@@ -121,7 +134,7 @@ def get_registration_keyboard(name: str, lang: str = "ru") -> InlineKeyboardMark
     builder.row(
         InlineKeyboardButton(
             text=i18n.get("registration.use_telegram_name", lang, name=name),
-            callback_data="reg:use_telegram_name"
+            callback_data=UseTelegramNameCallback().pack()
         )
     )
     
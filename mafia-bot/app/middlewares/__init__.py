@@ -1,11 +1,32 @@
 """Middlewares for Mafia Bot."""
 
+from app.middlewares.callback_data import CallbackDataMiddleware
 from app.middlewares.database import DatabaseMiddleware
+from app.middlewares.edit_coalescing import EditCoalescingMiddleware
 from app.middlewares.i18n import I18nMiddleware
+from app.middlewares.lanes import UserLanesMiddleware
+from app.middlewares.log_context import HandlerLogContextMiddleware, UpdateLogContextMiddleware
+from app.middlewares.metrics import (
+    HandlerMetricsMiddleware,
+    RequestMetricsMiddleware,
+    TimedMiddleware,
+    UpdateMetricsMiddleware,
+)
+from app.middlewares.query_stats import QueryStatsMiddleware
 from app.middlewares.throttling import ThrottlingMiddleware
 
 __all__ = [
+    "CallbackDataMiddleware",
     "DatabaseMiddleware",
+    "EditCoalescingMiddleware",
+    "HandlerLogContextMiddleware",
+    "HandlerMetricsMiddleware",
     "I18nMiddleware",
+    "QueryStatsMiddleware",
+    "RequestMetricsMiddleware",
     "ThrottlingMiddleware",
+    "TimedMiddleware",
+    "UpdateLogContextMiddleware",
+    "UpdateMetricsMiddleware",
+    "UserLanesMiddleware",
 ]
@@ -0,0 +1,27 @@
+"""Callback data parsing middleware."""
+
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery, TelegramObject
+
+from app.utils.callback_data import parse_callback
+
+
+class CallbackDataMiddleware(BaseMiddleware):
+    """Outer callback query middleware parsing callback data once per update.
+
+    The parsed schema is passed as ``callback_data`` to every router's
+    dispatch table and to handlers.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Parse callback data and pass it on."""
+        if isinstance(event, CallbackQuery):
+            data["callback_data"] = parse_callback(event.data)
+        return await handler(event, data)
@@ -1,16 +1,114 @@
 """Database middleware."""
 
-from typing import Any, Awaitable, Callable, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
 from aiogram.types import TelegramObject
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, sessionmaker
 
-from app.models.database import AsyncSessionLocal
+from app.middlewares.query_stats import handler_name
+from app.models.database import AsyncSessionLocal, replica_router
+from app.utils.metrics import DB_SESSIONS
+
+HAS_WRITES = "has_writes"
+COMMITTED_WRITES = "committed_writes"
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context) -> None:
+    session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_dml(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_writes(session: Session) -> None:
+    if session.info.pop(HAS_WRITES, None):
+        session.info[COMMITTED_WRITES] = True
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_writes(session: Session, previous_transaction) -> None:
+    session.info.pop(HAS_WRITES, None)
+
+
+class LazySession:
+    """AsyncSession proxy that creates the session on first use.
+
+    Handlers receive it as ``session`` and use it like an ``AsyncSession``;
+    updates whose handlers never touch it cost no session and no connection.
+    """
+
+    def __init__(self, factory: sessionmaker = AsyncSessionLocal):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def opened(self) -> bool:
+        """Check if the handler has used the session."""
+        return self._session is not None
+
+    @property
+    def session(self) -> AsyncSession:
+        """Get the underlying session, creating it if needed."""
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    @property
+    def has_changes(self) -> bool:
+        """Check for pending ORM changes or uncommitted writes."""
+        session = self._session
+        if session is None:
+            return False
+        return bool(
+            session.new
+            or session.dirty
+            or session.deleted
+            or session.sync_session.info.get(HAS_WRITES)
+        )
+
+    @property
+    def wrote(self) -> bool:
+        """Check if the handler committed or left any writes."""
+        return self.has_changes or bool(
+            self._session is not None and self._session.sync_session.info.get(COMMITTED_WRITES)
+        )
+
+    async def commit_if_needed(self) -> bool:
+        """Commit only when there is something to commit."""
+        if not self.has_changes:
+            return False
+        await self._session.commit()
+        return True
+
+    async def rollback(self) -> None:
+        """Roll back if the session was opened."""
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        """Close the session if it was opened."""
+        if self._session is not None:
+            await self._session.close()
 
 
 class DatabaseMiddleware(BaseMiddleware):
-    """Middleware to inject database session into handler data."""
+    """Middleware to inject a lazily opened database session into handler data.
+
+    Handlers registered with ``flags={"read_only": True}`` are served from
+    the read replica when the replica router allows it.
+    """
     
     async def __call__(
         self,
@@ -18,15 +116,23 @@ class DatabaseMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: Dict[str, Any],
     ) -> Any:
-        """Create database session and pass it to handler."""
-        async with AsyncSessionLocal() as session:
-            data["session"] = session
-            try:
-                result = await handler(event, data)
-                await session.commit()
-                return result
-            except Exception as e:
-                await session.rollback()
-                raise e
-            finally:
-                await session.close()
+        """Pass lazy session to handler and commit only pending changes."""
+        user = data.get("event_from_user")
+        user_id = user.id if user else None
+
+        factory = replica_router.session_factory(bool(get_flag(data, "read_only")), user_id)
+        session = LazySession(factory)
+        data["session"] = session
+        try:
+            result = await handler(event, data)
+            await session.commit_if_needed()
+            if session.wrote:
+                replica_router.mark_write(user_id)
+            return result
+        except Exception as e:
+            await session.rollback()
+            raise e
+        finally:
+            await session.close()
+            data["db_used"] = session.opened
+            DB_SESSIONS.inc(handler_name(data), "true" if session.opened else "false")
@@ -0,0 +1,104 @@
+"""Outbound message edit coalescing."""
+
+import asyncio
+import time
+from typing import Any, Hashable, Optional
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import EditMessageReplyMarkup, EditMessageText
+from cachetools import TTLCache
+
+from app.config import settings
+from app.utils.metrics import EDITS_SUPPRESSED
+
+
+class _EditState:
+    """Last content sent to one message."""
+
+    __slots__ = ("text_hash", "markup_hash", "sent_at", "version")
+
+    def __init__(self):
+        self.text_hash: Optional[int] = None
+        self.markup_hash: Optional[int] = None
+        self.sent_at = 0.0
+        self.version = 0
+
+
+def _markup_hash(markup: Any) -> int:
+    return hash(markup.model_dump_json(exclude_none=True) if markup is not None else None)
+
+
+class EditCoalescingMiddleware(BaseRequestMiddleware):
+    """Bot session middleware that drops redundant message edits.
+
+    - An edit whose text and markup equal what was last sent to the same
+      message is not sent at all (Telegram would reject it with
+      "message is not modified").
+    - Edits of one message within ``debounce`` seconds of the previous one
+      are delayed until the window ends, and only the newest is sent.
+
+    Suppressed edits return ``True``, like a successful inline edit.
+    """
+
+    def __init__(self, debounce: float = settings.EDIT_DEBOUNCE_SECONDS, maxsize: int = 50000):
+        self.debounce = debounce
+        self._states: TTLCache = TTLCache(maxsize=maxsize, ttl=3600)
+
+    @staticmethod
+    def _key(method: Any) -> Hashable:
+        if method.inline_message_id:
+            return ("inline", method.inline_message_id)
+        return (method.chat_id, method.message_id)
+
+    async def __call__(self, make_request, bot, method):
+        """Suppress or delay edits; pass other requests through."""
+        if isinstance(method, EditMessageText):
+            text_hash = hash((method.text, str(method.parse_mode)))
+        elif isinstance(method, EditMessageReplyMarkup):
+            text_hash = None
+        else:
+            return await make_request(bot, method)
+
+        markup_hash = _markup_hash(method.reply_markup)
+        key = self._key(method)
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _EditState()
+
+        if self._unchanged(state, text_hash, markup_hash):
+            EDITS_SUPPRESSED.inc("unchanged")
+            return True
+
+        state.version += 1
+        version = state.version
+
+        wait = state.sent_at + self.debounce - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+            if state.version != version:
+                EDITS_SUPPRESSED.inc("superseded")
+                return True
+            if self._unchanged(state, text_hash, markup_hash):
+                EDITS_SUPPRESSED.inc("unchanged")
+                return True
+
+        state.sent_at = time.monotonic()
+        try:
+            result = await make_request(bot, method)
+        except TelegramBadRequest as e:
+            if "message is not modified" not in e.message:
+                raise
+            EDITS_SUPPRESSED.inc("not_modified")
+            result = True
+
+        if text_hash is not None:
+            state.text_hash = text_hash
+        state.markup_hash = markup_hash
+        return result
+
+    @staticmethod
+    def _unchanged(state: _EditState, text_hash: Optional[int], markup_hash: int) -> bool:
+        if state.markup_hash != markup_hash:
+            return False
+        return text_hash is None or state.text_hash == text_hash
@@ -28,13 +28,12 @@ class I18nMiddleware(BaseMiddleware):
         
         if user and session:
             # Try to get player language from database
-            result = await session.execute(
-                select(Player).where(Player.telegram_id == user.id)
+            player_lang = await session.scalar(
+                select(Player.language).where(Player.telegram_id == user.id)
             )
-            player = result.scalar_one_or_none()
             
-            if player:
-                lang = player.language
+            if player_lang:
+                lang = player_lang
             else:
                 # Use Telegram language code if available
                 lang = user.language_code or "ru"
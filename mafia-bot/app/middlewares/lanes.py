@@ -0,0 +1,120 @@
+"""Per-user ordered update processing."""
+
+import asyncio
+import time
+from contextlib import suppress
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import TelegramObject
+
+from app.config import settings
+from app.utils.metrics import LANE_DROPPED, LANE_WAIT, LANES_ACTIVE, UPDATES_IN_FLIGHT, UPDATES_QUEUED
+
+
+class _Lane:
+    """Sequential lane of one user's updates."""
+
+    __slots__ = ("lock", "pending")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+class UserLanesMiddleware(BaseMiddleware):
+    """Outer update middleware processing each user's updates in order.
+
+    Polling runs every update as its own task; this middleware makes tasks of
+    the same user wait on that user's lane (a FIFO lock), so two rapid taps
+    are handled in arrival order while different users run concurrently.
+    At most ``max_concurrency`` handlers run at once, and updates arriving
+    while a lane already holds ``max_lane_depth`` updates are dropped (a
+    dropped callback query is still answered).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.UPDATE_CONCURRENCY,
+        max_lane_depth: int = settings.UPDATE_LANE_DEPTH,
+    ):
+        """Initialize lanes middleware.
+
+        Args:
+            max_concurrency: Maximum number of updates processed at once
+            max_lane_depth: Maximum queued updates per user, including the running one
+        """
+        self.max_lane_depth = max_lane_depth
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lanes: Dict[Hashable, _Lane] = {}
+        super().__init__()
+
+    @staticmethod
+    def lane_key(data: Dict[str, Any]) -> Optional[Hashable]:
+        """Get lane of the update: its user, or its chat for user-less updates."""
+        user = data.get("event_from_user")
+        if user is not None:
+            return user.id
+        chat = data.get("event_chat")
+        return ("chat", chat.id) if chat is not None else None
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Wait for the user's lane and a global slot, then handle the update."""
+        key = self.lane_key(data)
+        if key is None:
+            UPDATES_QUEUED.inc()
+            return await self._run(handler, event, data, time.perf_counter())
+
+        lane = self._lanes.get(key)
+        if lane is None:
+            lane = self._lanes[key] = _Lane()
+            LANES_ACTIVE.inc()
+        elif lane.pending >= self.max_lane_depth:
+            LANE_DROPPED.inc()
+            await self._answer_dropped(event, data)
+            return None
+
+        lane.pending += 1
+        UPDATES_QUEUED.inc()
+        arrived = time.perf_counter()
+        try:
+            async with lane.lock:
+                return await self._run(handler, event, data, arrived)
+        finally:
+            lane.pending -= 1
+            if lane.pending == 0:
+                del self._lanes[key]
+                LANES_ACTIVE.dec()
+
+    @staticmethod
+    async def _answer_dropped(event: TelegramObject, data: Dict[str, Any]) -> None:
+        """Answer a dropped callback query so the client's button stops spinning."""
+        callback = getattr(event, "callback_query", None)
+        bot = data.get("bot")
+        if callback is None or bot is None:
+            return
+        # An expired query or network error leaves nothing more to do
+        with suppress(TelegramAPIError):
+            await bot.answer_callback_query(callback.id)
+
+    async def _run(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+        arrived: float,
+    ) -> Any:
+        async with self._semaphore:
+            LANE_WAIT.observe(time.perf_counter() - arrived)
+            UPDATES_QUEUED.dec()
+            UPDATES_IN_FLIGHT.inc()
+            try:
+                return await handler(event, data)
+            finally:
+                UPDATES_IN_FLIGHT.dec()
@@ -0,0 +1,43 @@
+"""Middlewares binding per-update logging context."""
+
+from typing import Any, Awaitable, Callable, Dict
+
+import structlog
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+from app.middlewares.query_stats import handler_name
+
+
+class UpdateLogContextMiddleware(BaseMiddleware):
+    """Outer update middleware binding update and user ids to log records."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Start a fresh log context for the update."""
+        user = data.get("event_from_user")
+
+        structlog.contextvars.clear_contextvars()
+        structlog.contextvars.bind_contextvars(
+            update_id=event.update_id if isinstance(event, Update) else None,
+            user_id=user.id if user else None,
+        )
+        return await handler(event, data)
+
+
+class HandlerLogContextMiddleware(BaseMiddleware):
+    """Inner middleware binding the resolved handler name to log records."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Run handler inside its log context."""
+        with structlog.contextvars.bound_contextvars(handler=handler_name(data)):
+            return await handler(event, data)
@@ -0,0 +1,106 @@
+"""Metrics middlewares for updates, handlers, middlewares and Bot API requests."""
+
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import TelegramObject, Update
+
+from app.middlewares.query_stats import handler_name
+from app.utils.metrics import (
+    HANDLER_ERRORS,
+    HANDLER_LATENCY,
+    MIDDLEWARE_LATENCY,
+    OUTBOUND_LATENCY,
+    OUTBOUND_RETRY_AFTER,
+    UPDATES,
+)
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Outer update middleware counting incoming updates by type."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Count update and pass it on."""
+        if isinstance(event, Update):
+            UPDATES.inc(event.event_type)
+        return await handler(event, data)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Inner middleware observing latency of the resolved handler.
+
+    Registered first, so the observed time includes the inner middlewares.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Time handler call."""
+        router, _, name = handler_name(data).partition(".")
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            HANDLER_ERRORS.inc(router, name)
+            raise
+        finally:
+            HANDLER_LATENCY.observe(time.perf_counter() - started, router, name)
+
+
+class TimedMiddleware(BaseMiddleware):
+    """Wrap a middleware to observe its own time, excluding downstream calls."""
+
+    def __init__(self, name: str, middleware: BaseMiddleware):
+        self.name = name
+        self.middleware = middleware
+        super().__init__()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Run wrapped middleware and subtract time spent in the handler."""
+        downstream = 0.0
+
+        async def timed_handler(event: TelegramObject, data: Dict[str, Any]) -> Any:
+            nonlocal downstream
+            started = time.perf_counter()
+            try:
+                return await handler(event, data)
+            finally:
+                downstream += time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            return await self.middleware(timed_handler, event, data)
+        finally:
+            MIDDLEWARE_LATENCY.observe(time.perf_counter() - started - downstream, self.name)
+
+
+class RequestMetricsMiddleware(BaseRequestMiddleware):
+    """Bot session middleware observing outbound request latency and 429s."""
+
+    async def __call__(self, make_request, bot, method):
+        """Time request and count flood control rejections."""
+        method_name = type(method).__name__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter:
+            OUTBOUND_RETRY_AFTER.inc(method_name)
+            raise
+        finally:
+            OUTBOUND_LATENCY.observe(time.perf_counter() - started, method_name)
@@ -0,0 +1,71 @@
+"""SQL query accounting middleware."""
+
+import logging
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.config import settings
+from app.utils.sql_stats import track_queries
+
+logger = logging.getLogger(__name__)
+
+
+def handler_name(data: Dict[str, Any]) -> str:
+    """Get ``router_module.function`` name of the handler resolved by the dispatcher."""
+    handler = data.get("handler")
+    callback = getattr(handler, "callback", None)
+    if callback is None:
+        return "unknown"
+
+    module = getattr(callback, "__module__", "").rsplit(".", 1)[-1]
+    return f"{module}.{getattr(callback, '__name__', repr(callback))}"
+
+
+class QueryStatsMiddleware(BaseMiddleware):
+    """Middleware to count SQL statements issued per update.
+
+    Must be registered before the database and i18n middlewares so that
+    their queries are attributed to the update as well.
+    """
+
+    def __init__(
+        self,
+        max_queries: int = settings.SQL_QUERY_BUDGET,
+        repeat_threshold: int = settings.SQL_REPEAT_THRESHOLD,
+    ):
+        """Initialize query stats middleware.
+
+        Args:
+            max_queries: Log updates issuing more statements than this
+            repeat_threshold: Log statement shapes repeated this many times (N+1)
+        """
+        self.max_queries = max_queries
+        self.repeat_threshold = repeat_threshold
+        super().__init__()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        """Run handler while counting its SQL statements."""
+        with track_queries(handler_name(data)) as stats:
+            data["query_stats"] = stats
+            try:
+                return await handler(event, data)
+            finally:
+                self._report(stats)
+
+    def _report(self, stats) -> None:
+        """Log updates over the query budget and suspected N+1 patterns."""
+        if stats.count > self.max_queries:
+            logger.warning(
+                f"{stats.handler} issued {stats.count} SQL statements "
+                f"({stats.total_time * 1000:.1f} ms)"
+            )
+
+        for shape, count in stats.repeated(self.repeat_threshold):
+            logger.warning(f"Possible N+1 in {stats.handler}: {count}x {shape[:200]}")
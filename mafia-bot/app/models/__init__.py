@@ -11,9 +11,10 @@ from app.models.achievement import PlayerAchievement
 from app.models.city import City
 from app.models.game import Game
 from app.models.role import Role, PlayerRole
-from app.models.action import Action, ActionType
+from app.models.action import Action, ActionReminder, ActionType
 from app.models.vote import Vote
-from app.models.event import Event
+from app.models.event import EffectKind, Event, EventEffect
+from app.models.matchmaking import MatchmakingTicket
 
 # Association tables (if defined as models)
 from app.models.game import GamePlayer
@@ -41,7 +42,13 @@ __all__ = [
     
     # Actions & Events
     "Action",
+    "ActionReminder",
     "ActionType",
     "Vote",
     "Event",
+    "EventEffect",
+    "EffectKind",
+    
+    # Matchmaking
+    "MatchmakingTicket",
 ]
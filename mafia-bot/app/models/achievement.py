@@ -7,6 +7,7 @@ from sqlalchemy import Boolean, BigInteger, DateTime, ForeignKey, Integer, Strin
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.player import Player
@@ -79,5 +80,5 @@ class PlayerAchievement(Base):
     def complete(self) -> None:
         """Mark achievement as completed."""
         self.is_completed = True
-        self.earned_at = datetime.utcnow()
+        self.earned_at = utcnow()
         self.progress = self.achievement.requirement_value
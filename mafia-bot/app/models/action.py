@@ -3,10 +3,11 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.game import Game
@@ -27,6 +28,10 @@ class Action(Base):
     """Represents an in-game action (kill, heal, investigate, etc.)."""
     
     __tablename__ = "actions"
+    __table_args__ = (
+        # "Has this role acted tonight?" (reminder anti-join)
+        Index("ix_actions_actor_night", "actor_role_id", "game_night"),
+    )
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     
@@ -57,10 +62,13 @@ class Action(Base):
     # Ночь действия
     game_night: Mapped[int] = mapped_column(Integer, nullable=False)
     
+    # Результат проверки: is_mafia / not_mafia или ключ роли (событие «Инквизитор»)
+    result: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
+    
     # Время создания
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=utcnow,
         nullable=False,
     )
     
@@ -81,3 +89,22 @@ class Action(Base):
     
     def __repr__(self) -> str:
         return f"<Action(id={self.id}, type={self.action_type}, night={self.game_night})>"
+
+
+class ActionReminder(Base):
+    """Reminder sent to a role that had not acted yet on a night.
+
+    One row per role and night, so each player is reminded at most once.
+    """
+    
+    __tablename__ = "action_reminders"
+    
+    player_role_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("player_roles.id"),
+        primary_key=True,
+    )
+    game_night: Mapped[int] = mapped_column(Integer, primary_key=True)
+    
+    def __repr__(self) -> str:
+        return f"<ActionReminder(role={self.player_role_id}, night={self.game_night})>"
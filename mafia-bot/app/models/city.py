@@ -3,10 +3,11 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import DateTime, BigInteger, Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import DateTime, BigInteger, Boolean, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.player import Player
@@ -17,6 +18,10 @@ class City(Base):
     """City model representing a game instance."""
     
     __tablename__ = "cities"
+    __table_args__ = (
+        # Keyset pagination of the city browser: (created_at, id) per active flag
+        Index("ix_cities_active_created_id", "is_active", "created_at", "id"),
+    )
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     name: Mapped[str] = mapped_column(String(64), nullable=False)
@@ -27,6 +32,17 @@ class City(Base):
     is_private: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     max_players: Mapped[int] = mapped_column(Integer, default=20, nullable=False)
     min_players: Mapped[int] = mapped_column(Integer, default=4, nullable=False)
+    language: Mapped[str] = mapped_column(String(5), default="ru", nullable=False)
+    
+    # Denormalized size of city_players, maintained by CityMembership
+    player_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Pointer to the game in progress (None when no game is running)
+    current_game_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("games.id", use_alter=True, name="fk_cities_current_game_id"),
+        nullable=True,
+    )
     
     # Creator
     creator_id: Mapped[int] = mapped_column(
@@ -42,7 +58,7 @@ class City(Base):
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=utcnow,
         nullable=False,
     )
     ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -56,18 +72,14 @@ class City(Base):
     )
     games: Mapped[List["Game"]] = relationship(
         "Game",
+        foreign_keys="[Game.city_id]",
         back_populates="city",
         lazy="selectin",
         cascade="all, delete-orphan",
     )
     
     def __repr__(self) -> str:
-        return f"<City(id={self.id}, name={self.name}, players={len(self.players)})>"
-    
-    @property
-    def player_count(self) -> int:
-        """Get current player count."""
-        return len(self.players)
+        return f"<City(id={self.id}, name={self.name}, players={self.player_count})>"
     
     @property
     def is_full(self) -> bool:
@@ -78,6 +90,11 @@ class City(Base):
     def can_start(self) -> bool:
         """Check if game can start."""
         return self.player_count >= self.min_players
+    
+    @property
+    def has_active_game(self) -> bool:
+        """Check if a game is in progress."""
+        return self.current_game_id is not None
 
 
 # Association table for City-Player many-to-many relationship
@@ -98,6 +115,6 @@ class CityPlayer(Base):
     )
     joined_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=utcnow,
         nullable=False,
     )
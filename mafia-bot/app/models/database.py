@@ -1,18 +1,93 @@
 """Database session and engine configuration."""
 
+import time
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+from cachetools import TTLCache
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.config import settings
 from app.models.base import Base
+from app.utils.logger import get_logger
+from app.utils.metrics import DB_POOL_CHECKOUTS, DB_POOL_WAIT, DB_REPLICA_LAG, DB_ROUTED, registry
+from app.utils.sql_stats import install_query_counter
+
+logger = get_logger(__name__)
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that observes how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - started)
+
+
+def engine_options() -> Dict[str, Any]:
+    """Build engine and asyncpg connection options from settings."""
+    connect_args: Dict[str, Any] = {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+    if settings.DB_PGBOUNCER:
+        # PgBouncer in transaction mode may hand each transaction a different
+        # server connection, so prepared statements must be neither cached
+        # nor reused by name.
+        connect_args.update(
+            statement_cache_size=0,
+            prepared_statement_cache_size=0,
+            prepared_statement_name_func=lambda: f"__asyncpg_{uuid4()}__",
+        )
+
+    return {
+        "echo": settings.DEBUG,
+        "future": True,
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
 
 # Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
+engine = create_async_engine(settings.DATABASE_URL, **engine_options())
+
+
+@event.listens_for(engine.sync_engine.pool, "checkout")
+def _count_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    DB_POOL_CHECKOUTS.inc()
+
+
+registry.gauge(
+    "mafia_db_pool_checked_out",
+    "Connections currently checked out",
+    callback=lambda: engine.sync_engine.pool.checkedout(),
+)
+registry.gauge(
+    "mafia_db_pool_overflow",
+    "Connections opened beyond pool size (negative while the pool is filling)",
+    callback=lambda: engine.sync_engine.pool.overflow(),
+)
+registry.gauge(
+    "mafia_db_pool_size",
+    "Configured pool size",
+    callback=lambda: engine.sync_engine.pool.size(),
 )
 
+# Count statements per update (see app.middlewares.query_stats)
+install_query_counter(engine)
+
 # Create async session factory
 AsyncSessionLocal = sessionmaker(
     engine,
@@ -21,6 +96,96 @@ AsyncSessionLocal = sessionmaker(
     autoflush=False,
 )
 
+# Optional read replica for handlers flagged read_only
+replica_engine = (
+    create_async_engine(settings.DATABASE_REPLICA_URL, **engine_options())
+    if settings.DATABASE_REPLICA_URL
+    else None
+)
+if replica_engine is not None:
+    install_query_counter(replica_engine)
+
+ReplicaSessionLocal = (
+    sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+    )
+    if replica_engine is not None
+    else None
+)
+
+# Zero when the replica has replayed everything it received, otherwise the
+# age of the last replayed transaction.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+class ReplicaRouter:
+    """Choose between primary and replica session factories.
+
+    Reads go to the replica unless it is not configured, lags more than
+    ``REPLICA_MAX_LAG`` seconds, or the user wrote recently: users stay on
+    the primary for ``REPLICA_STICKY_SECONDS`` after a write so they always
+    see their own changes.
+    """
+
+    def __init__(self):
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self._recent_writers: TTLCache = TTLCache(
+            maxsize=100000,
+            ttl=settings.REPLICA_STICKY_SECONDS,
+        )
+
+    def mark_write(self, user_id: Optional[int]) -> None:
+        """Pin user to the primary for the sticky window."""
+        if user_id is not None:
+            self._recent_writers[user_id] = True
+
+    def session_factory(self, read_only: bool, user_id: Optional[int] = None) -> sessionmaker:
+        """Get session factory for an update."""
+        if (
+            read_only
+            and ReplicaSessionLocal is not None
+            and self.healthy
+            and user_id not in self._recent_writers
+        ):
+            DB_ROUTED.inc("replica")
+            return ReplicaSessionLocal
+
+        DB_ROUTED.inc("primary")
+        return AsyncSessionLocal
+
+    async def refresh(self) -> None:
+        """Measure replica lag and update health."""
+        if replica_engine is None:
+            return
+
+        try:
+            async with replica_engine.connect() as conn:
+                lag = await conn.scalar(REPLICA_LAG_QUERY)
+        except Exception as e:
+            if self.healthy:
+                logger.warning("replica_unavailable", error=str(e))
+            self.healthy = False
+            self.lag = None
+            return
+
+        self.lag = float(lag or 0)
+        DB_REPLICA_LAG.set(self.lag)
+
+        healthy = self.lag <= settings.REPLICA_MAX_LAG
+        if healthy != self.healthy:
+            logger.info("replica_health_changed", healthy=healthy, lag=self.lag)
+        self.healthy = healthy
+
+
+replica_router = ReplicaRouter()
+
 
 async def get_db() -> AsyncSession:
     """Get database session."""
@@ -2,12 +2,14 @@
 
 import enum
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, Enum, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.game import Game
@@ -26,10 +28,26 @@ class EventType(str, enum.Enum):
     NONE = "none"
 
 
+class EffectKind(str, enum.Enum):
+    """Event effect kind enumeration."""
+    
+    ABILITY_BLOCKED = "ability_blocked"     # Role can not act (plague)
+    REVEALED = "revealed"                   # Role is shown to everyone
+    INVESTIGATE_ROLE = "investigate_role"   # Investigations reveal the exact role
+    MAYOR_ELECTION = "mayor_election"       # The mayor's vote weighs more
+    EXTRA_KILL = "extra_kill"               # Additional kill slots per night
+    VOTE_WEIGHT = "vote_weight"             # Role's vote counts with a different weight
+    NO_DAY_CHAT = "no_day_chat"             # Players can not talk during the day
+
+
 class Event(Base):
     """Special event model."""
     
     __tablename__ = "events"
+    __table_args__ = (
+        # Active events of a game
+        Index("ix_events_game_active", "game_id", "is_active"),
+    )
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     
@@ -43,6 +61,9 @@ class Event(Base):
     # Event details
     event_type: Mapped[EventType] = mapped_column(Enum(EventType), nullable=False)
     day_number: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Game.phase_index when the event started / ended
+    started_phase: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    ended_phase: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Status
@@ -51,28 +72,84 @@ class Event(Base):
     
     # Effect tracking
     affected_player_id: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
-    effect_data: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     # Timestamps
     started_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=utcnow,
         nullable=False,
     )
     ended_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     game: Mapped["Game"] = relationship("Game", back_populates="events")
+    effects: Mapped[List["EventEffect"]] = relationship(
+        "EventEffect",
+        back_populates="event",
+        cascade="all, delete-orphan",
+    )
     
     def __repr__(self) -> str:
         return f"<Event(game={self.game_id}, type={self.event_type}, day={self.day_number})>"
     
-    def complete(self) -> None:
-        """Mark event as completed."""
+    def complete(self, phase_index: Optional[int] = None) -> None:
+        """Mark event as completed (from game phase ``phase_index`` on, if known)."""
+        self.ended_phase = phase_index
+        self.is_active = False
         self.is_completed = True
-        self.ended_at = datetime.utcnow()
+        self.ended_at = utcnow()
+    
+    @property
+    def first_phase(self) -> int:
+        """Game phase the event started in."""
+        # Events without a recorded phase count from the start of their day
+        return self.started_phase if self.started_phase is not None else 2 * self.day_number - 1
+    
+    def is_active_in(self, phase_index: int) -> bool:
+        """Whether the event affected game phase ``phase_index`` (see ``Game.phase_index``)."""
+        return self.first_phase <= phase_index and (self.ended_phase is None or phase_index < self.ended_phase)
     
     @property
     def is_ongoing(self) -> bool:
         """Check if event is still ongoing."""
         return self.is_active and not self.is_completed
+
+
+class EventEffect(Base):
+    """Effect of an event on one role, or on the whole game when ``player_role_id`` is empty."""
+    
+    __tablename__ = "event_effects"
+    __table_args__ = (
+        Index("ix_event_effects_game_role", "game_id", "player_role_id"),
+    )
+    
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    
+    event_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("events.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    game_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("games.id"),
+        nullable=False,
+    )
+    player_role_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger,
+        ForeignKey("player_roles.id"),
+        nullable=True,
+    )
+    
+    kind: Mapped[EffectKind] = mapped_column(Enum(EffectKind), nullable=False)
+    data: Mapped[Dict[str, Any]] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        default=dict,
+        nullable=False,
+    )
+    
+    event: Mapped["Event"] = relationship("Event", back_populates="effects")
+    
+    def __repr__(self) -> str:
+        return f"<EventEffect(game={self.game_id}, role={self.player_role_id}, kind={self.kind})>"
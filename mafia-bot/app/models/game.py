@@ -4,10 +4,12 @@ import enum
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import Boolean, BigInteger, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import Boolean, BigInteger, DateTime, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.utils.clock import utcnow
+from app.utils.rng import new_seed
 
 if TYPE_CHECKING:
     from app.models.city import City
@@ -30,6 +32,16 @@ class GameStatus(str, enum.Enum):
     PAUSED = "paused"            # Game paused
 
 
+# Statuses of a game that is in progress
+ACTIVE_GAME_STATUSES = (
+    GameStatus.STARTING,
+    GameStatus.NIGHT,
+    GameStatus.DAY,
+    GameStatus.VOTING,
+    GameStatus.PAUSED,
+)
+
+
 class Game(Base):
     """Game model representing a single game session."""
     
@@ -56,6 +68,9 @@ class Game(Base):
         nullable=True,
     )
     
+    # Seed of the game's random streams (see app.utils.rng)
+    seed: Mapped[int] = mapped_column(BigInteger, default=new_seed, nullable=False)
+    
     # Winner
     winner_faction: Mapped[Optional[str]] = mapped_column(String(20), nullable=True)
     
@@ -70,7 +85,11 @@ class Game(Base):
     )
     
     # Relationships
-    city: Mapped["City"] = relationship("City", back_populates="games")
+    city: Mapped["City"] = relationship(
+        "City",
+        foreign_keys=[city_id],
+        back_populates="games",
+    )
     players: Mapped[List["Player"]] = relationship(
         "Player",
         secondary="game_players",
@@ -128,6 +147,13 @@ class Game(Base):
             if r.is_alive and r.role.role_type == RoleType.CIVILIAN
         ]
     
+    @property
+    def phase_index(self) -> int:
+        """Position of the current phase: night N is 2N, the day after it 2N + 1."""
+        if self.status == GameStatus.NIGHT:
+            return 2 * self.day_number
+        return 2 * self.day_number - 1
+    
     @property
     def is_night(self) -> bool:
         """Check if it's night phase."""
@@ -137,6 +163,20 @@ class Game(Base):
     def is_day(self) -> bool:
         """Check if it's day phase."""
         return self.status in [GameStatus.DAY, GameStatus.VOTING]
+    
+    @property
+    def is_active(self) -> bool:
+        """Check if game is in progress."""
+        return self.status in ACTIVE_GAME_STATUSES
+
+
+# At most one game in progress per city
+Index(
+    "uq_games_city_active",
+    Game.city_id,
+    unique=True,
+    postgresql_where=Game.status.in_(ACTIVE_GAME_STATUSES),
+)
 
 
 # Association table for Game-Player many-to-many relationship
@@ -144,6 +184,10 @@ class GamePlayer(Base):
     """Association table for game players."""
     
     __tablename__ = "game_players"
+    __table_args__ = (
+        # Player -> games lookup (the primary key leads with game_id)
+        Index("ix_game_players_player_id", "player_id"),
+    )
     
     game_id: Mapped[int] = mapped_column(
         BigInteger,
@@ -157,6 +201,6 @@ class GamePlayer(Base):
     )
     joined_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=utcnow,
         nullable=False,
     )
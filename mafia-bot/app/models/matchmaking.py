@@ -0,0 +1,37 @@
+"""Matchmaking queue model."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+from app.utils.clock import utcnow
+
+
+class MatchmakingTicket(Base):
+    """Persisted matchmaking queue entry.
+
+    Tickets are the queue of record; before every matching pass the
+    matchmaker adds tickets enqueued since its last pass to its in-memory
+    queue.
+    """
+
+    __tablename__ = "matchmaking_tickets"
+
+    player_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("players.id"),
+        primary_key=True,
+    )
+    language: Mapped[str] = mapped_column(String(5), nullable=False)
+    level: Mapped[int] = mapped_column(Integer, nullable=False)
+    enqueued_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utcnow,
+        nullable=False,
+        index=True,
+    )
+
+    def __repr__(self) -> str:
+        return f"<MatchmakingTicket(player={self.player_id}, language={self.language}, level={self.level})>"
@@ -7,6 +7,7 @@ from sqlalchemy import DateTime, BigInteger, Boolean, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.achievement import PlayerAchievement
@@ -49,7 +50,7 @@ class Player(Base):
     last_activity: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
     registered_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=utcnow,
         nullable=False,
     )
     
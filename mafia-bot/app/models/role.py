@@ -4,10 +4,11 @@ import enum
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Enum, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.player import Player
@@ -67,6 +68,9 @@ class PlayerRole(Base):
     """Player's role in a specific game."""
     
     __tablename__ = "player_roles"
+    __table_args__ = (
+        Index("ix_player_roles_game_player", "game_id", "player_id"),
+    )
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     
@@ -151,5 +155,5 @@ class PlayerRole(Base):
     def kill(self, cause: str) -> None:
         """Kill the player."""
         self.is_alive = False
-        self.died_at = datetime.utcnow()
+        self.died_at = utcnow()
         self.death_cause = cause
@@ -7,6 +7,7 @@ from sqlalchemy import DateTime, BigInteger, Boolean, DateTime, ForeignKey, Inte
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
+from app.utils.clock import utcnow
 
 if TYPE_CHECKING:
     from app.models.game import Game
@@ -47,7 +48,7 @@ class Vote(Base):
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.utcnow,
+        default=utcnow,
         nullable=False,
     )
     revoked_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -71,4 +72,4 @@ class Vote(Base):
     def revoke(self) -> None:
         """Revoke the vote."""
         self.is_active = False
-        self.revoked_at = datetime.utcnow()
+        self.revoked_at = utcnow()
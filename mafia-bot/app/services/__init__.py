@@ -3,11 +3,18 @@
 from app.services.game_engine import GameEngine
 from app.services.role_manager import RoleManager
 from app.services.xp_manager import XPManager
-from app.services.event_manager import EventManager
+from app.services.event_manager import EventManager, Modifier
+from app.services.city_directory import CityDirectory
+from app.services.city_membership import CityMembership
+from app.services.game_lookup import GameLookup
 
 __all__ = [
     "GameEngine",
     "RoleManager",
     "XPManager",
     "EventManager",
+    "Modifier",
+    "CityDirectory",
+    "CityMembership",
+    "GameLookup",
 ]
@@ -0,0 +1,144 @@
+"""Supervised background work started from handlers."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Coroutine, Dict, Hashable, Optional, Set
+
+from aiogram.types import CallbackQuery
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.middlewares.database import LazySession
+from app.models.database import replica_router
+from app.utils.i18n import i18n
+from app.utils.logger import get_logger
+from app.utils.metrics import BACKGROUND_ERRORS, BACKGROUND_TASKS
+
+logger = get_logger(__name__)
+
+
+class BackgroundTasks:
+    """Keep track of background tasks so they are logged and cancelled on shutdown.
+
+    Tasks spawned with a ``key`` are exclusive: while one is running, another
+    spawn with the same key is refused.
+    """
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        self._keys: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def running(self, key: Hashable) -> bool:
+        """Check whether a task with this key is running."""
+        return key in self._keys
+
+    def spawn(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        *,
+        name: str,
+        key: Optional[Hashable] = None,
+    ) -> Optional[asyncio.Task]:
+        """Run coroutine as a task, or close it and return None if ``key`` is busy."""
+        if key is not None and key in self._keys:
+            coro.close()
+            return None
+
+        task = asyncio.create_task(coro, name=name)
+        self._tasks.add(task)
+        if key is not None:
+            self._keys[key] = task
+        BACKGROUND_TASKS.inc()
+        task.add_done_callback(lambda t: self._done(t, key))
+        return task
+
+    def _done(self, task: asyncio.Task, key: Optional[Hashable]) -> None:
+        self._tasks.discard(task)
+        if key is not None and self._keys.get(key) is task:
+            del self._keys[key]
+        BACKGROUND_TASKS.dec()
+
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            BACKGROUND_ERRORS.inc(task.get_name())
+            logger.error("background_task_failed", task=task.get_name(), exc_info=error)
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Wait up to ``timeout`` seconds for running tasks, then cancel the rest."""
+        if not self._tasks:
+            return
+
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning("background_tasks_cancelled", count=len(pending))
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+background_tasks = BackgroundTasks()
+
+
+async def _run_with_session(
+    callback: CallbackQuery,
+    work: Callable[[AsyncSession], Awaitable[None]],
+    lang: str,
+    read_only: bool,
+) -> None:
+    user_id = callback.from_user.id
+    session = LazySession(replica_router.session_factory(read_only, user_id))
+    try:
+        await work(session)
+        await session.commit_if_needed()
+        if session.wrote:
+            replica_router.mark_write(user_id)
+    except asyncio.CancelledError:
+        await session.rollback()
+        raise
+    except Exception:
+        await session.rollback()
+        if callback.message:
+            try:
+                await callback.message.answer(i18n.get("errors.background_failed", lang))
+            except Exception as e:
+                logger.warning("background_error_report_failed", error=str(e))
+        raise
+    finally:
+        await session.close()
+
+
+async def answer_and_run(
+    callback: CallbackQuery,
+    work: Callable[[AsyncSession], Awaitable[None]],
+    *,
+    lang: str,
+    name: str,
+    text: Optional[str] = None,
+    key: Optional[Hashable] = None,
+    busy_text: Optional[str] = None,
+    read_only: bool = False,
+) -> bool:
+    """Answer callback query now and finish ``work`` in a background task.
+
+    ``work`` gets its own session, committed when it returns and rolled back
+    if it raises; failures are logged and reported to the user. The handler's
+    session must not be used by ``work``, it is closed when the handler
+    returns.
+
+    Returns False without running ``work`` if a task with ``key`` is still
+    running; the query is then answered with ``busy_text``.
+    """
+    if key is not None and background_tasks.running(key):
+        await callback.answer(busy_text)
+        return False
+
+    background_tasks.spawn(
+        _run_with_session(callback, work, lang, read_only),
+        name=name,
+        key=key,
+    )
+    await callback.answer(text)
+    return True
@@ -0,0 +1,66 @@
+"""Balance table: how many mafia a game of N players gets.
+
+The table is produced offline by ``python -m simulator --output ...`` and
+loaded from ``BALANCE_TABLE_PATH``. Player counts it does not cover, or a
+missing or broken table, fall back to ``default_mafia_count``.
+"""
+
+import json
+from typing import Dict, Mapping, Optional
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def default_mafia_count(player_count: int) -> int:
+    """A third of the players, at least one."""
+    return max(1, player_count // 3)
+
+
+class BalanceTable:
+    """Mafia count per player count."""
+
+    def __init__(self, mafia_counts: Optional[Mapping[int, int]] = None):
+        self.mafia_counts: Dict[int, int] = dict(mafia_counts or {})
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "BalanceTable":
+        """Table from the simulator's JSON output."""
+        return cls({
+            int(players): int(entry["mafia"])
+            for players, entry in data.get("player_counts", {}).items()
+        })
+
+    @classmethod
+    def load(cls, path: str) -> "BalanceTable":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def mafia_count(self, player_count: int) -> int:
+        """Mafia for ``player_count`` players; always leaves town the majority."""
+        count = self.mafia_counts.get(player_count, default_mafia_count(player_count))
+        return max(1, min(count, (player_count - 1) // 2))
+
+
+_table: Optional[BalanceTable] = None
+
+
+def get_balance_table() -> BalanceTable:
+    """Table from ``BALANCE_TABLE_PATH``, loaded once."""
+    global _table
+    if _table is None:
+        _table = BalanceTable()
+        if settings.BALANCE_TABLE_PATH:
+            try:
+                _table = BalanceTable.load(settings.BALANCE_TABLE_PATH)
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                logger.warning("balance_table_not_loaded", path=settings.BALANCE_TABLE_PATH, error=str(e))
+    return _table
+
+
+def set_balance_table(table: Optional[BalanceTable]) -> None:
+    """Install ``table`` (None reloads from settings on next use)."""
+    global _table
+    _table = table
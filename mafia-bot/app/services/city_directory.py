@@ -0,0 +1,179 @@
+"""City directory service for the paginated city browser."""
+
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.city import City
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class CityFilter:
+    """Filters applied to the city list.
+
+    Packed into callback data as three flags, e.g. ``10ru`` or ``00-``.
+    """
+
+    open_only: bool = False
+    not_started: bool = False
+    language: Optional[str] = None
+
+    def pack(self) -> str:
+        """Pack filter into a short callback data token."""
+        return f"{int(self.open_only)}{int(self.not_started)}{self.language or '-'}"
+
+    @classmethod
+    def unpack(cls, value: str) -> "CityFilter":
+        """Unpack filter from callback data token."""
+        if len(value) < 3:
+            return cls()
+        language = value[2:]
+        return cls(
+            open_only=value[0] == "1",
+            not_started=value[1] == "1",
+            language=None if language == "-" else language,
+        )
+
+    def toggle_open(self) -> "CityFilter":
+        """Toggle the open slots filter."""
+        return replace(self, open_only=not self.open_only)
+
+    def toggle_not_started(self) -> "CityFilter":
+        """Toggle the not started filter."""
+        return replace(self, not_started=not self.not_started)
+
+    def toggle_language(self, lang: str) -> "CityFilter":
+        """Toggle the language filter for given language."""
+        return replace(self, language=None if self.language else lang)
+
+
+@dataclass(frozen=True)
+class CityCursor:
+    """Keyset position in the city list: last seen ``(created_at, id)``."""
+
+    created_at: datetime
+    city_id: int
+
+    def pack(self) -> str:
+        """Pack cursor into a short callback data token."""
+        created_at = self.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        micros = (created_at - EPOCH) // timedelta(microseconds=1)
+        return f"{micros}_{self.city_id}"
+
+    @classmethod
+    def unpack(cls, value: str) -> Optional["CityCursor"]:
+        """Unpack cursor from callback data token ("0" means first page)."""
+        try:
+            micros, city_id = value.split("_")
+            return cls(
+                created_at=EPOCH + timedelta(microseconds=int(micros)),
+                city_id=int(city_id),
+            )
+        except ValueError:
+            return None
+
+
+@dataclass(frozen=True)
+class CityListItem:
+    """Lightweight city row for the browser (no relationships loaded)."""
+
+    id: int
+    name: str
+    player_count: int
+    max_players: int
+    created_at: datetime
+
+    @property
+    def cursor(self) -> CityCursor:
+        """Get keyset cursor pointing at this city."""
+        return CityCursor(self.created_at, self.id)
+
+
+@dataclass
+class CityPage:
+    """Single page of the city list."""
+
+    items: List[CityListItem]
+    next_cursor: Optional[CityCursor] = None
+    prev_cursor: Optional[CityCursor] = None
+
+
+class CityDirectory:
+    """Keyset-paginated access to active cities."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_page(
+        self,
+        city_filter: CityFilter,
+        cursor: Optional[CityCursor] = None,
+        backward: bool = False,
+        page_size: Optional[int] = None,
+    ) -> CityPage:
+        """Get a page of active cities, newest first.
+
+        Args:
+            city_filter: Filters to apply
+            cursor: Keyset position; ``None`` for the first page
+            backward: Fetch the page before ``cursor`` instead of after it
+            page_size: Number of cities per page
+        """
+        page_size = page_size or settings.CITY_PAGE_SIZE
+
+        query = (
+            select(
+                City.id,
+                City.name,
+                City.player_count,
+                City.max_players,
+                City.created_at,
+            )
+            .where(City.is_active == True)
+        )
+
+        if city_filter.open_only:
+            query = query.where(City.player_count < City.max_players)
+        if city_filter.language:
+            query = query.where(City.language == city_filter.language)
+        if city_filter.not_started:
+            query = query.where(City.current_game_id.is_(None))
+
+        key = tuple_(City.created_at, City.id)
+        if cursor is not None:
+            position = tuple_(cursor.created_at, cursor.city_id)
+            query = query.where(key > position if backward else key < position)
+
+        if backward:
+            query = query.order_by(City.created_at.asc(), City.id.asc())
+        else:
+            query = query.order_by(City.created_at.desc(), City.id.desc())
+
+        result = await self.session.execute(query.limit(page_size + 1))
+        rows = result.all()
+
+        has_more = len(rows) > page_size
+        items = [CityListItem(*row) for row in rows[:page_size]]
+        if backward:
+            items.reverse()
+
+        page = CityPage(items=items)
+        if not items:
+            return page
+
+        if backward:
+            page.next_cursor = items[-1].cursor
+            page.prev_cursor = items[0].cursor if has_more else None
+        else:
+            page.next_cursor = items[-1].cursor if has_more else None
+            page.prev_cursor = items[0].cursor if cursor is not None else None
+
+        return page
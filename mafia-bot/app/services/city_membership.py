@@ -0,0 +1,113 @@
+"""City membership service with atomic capacity enforcement."""
+
+import enum
+
+from sqlalchemy import delete, exists, func, literal, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.city import City, CityPlayer
+
+
+class JoinResult(str, enum.Enum):
+    """Outcome of a join attempt."""
+
+    JOINED = "joined"
+    FULL = "full"
+    ALREADY_MEMBER = "already_member"
+
+
+class CityMembership:
+    """Join/leave path that keeps ``City.player_count`` in sync.
+
+    All roster changes must go through this service instead of
+    ``city.players.append()`` so the denormalized counter stays exact.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def is_member(self, city_id: int, player_id: int) -> bool:
+        """Check membership with a primary key lookup."""
+        return await self.session.scalar(
+            select(
+                exists().where(
+                    CityPlayer.city_id == city_id,
+                    CityPlayer.player_id == player_id,
+                )
+            )
+        )
+
+    async def add_creator(self, city: City, player_id: int) -> None:
+        """Add creator to a freshly flushed city."""
+        self.session.add(CityPlayer(city_id=city.id, player_id=player_id))
+        city.player_count = 1
+
+    async def join(self, city_id: int, player_id: int) -> JoinResult:
+        """Join city in a single conditional statement.
+
+        The city row is locked by ``SELECT ... FOR UPDATE`` inside the
+        ``INSERT ... SELECT``, so concurrent joins are serialized on the
+        counter and re-check capacity against the committed value. The
+        roster primary key rejects duplicates via ``ON CONFLICT DO NOTHING``
+        and the counter is bumped only for rows that were really inserted.
+        """
+        if await self.is_member(city_id, player_id):
+            return JoinResult.ALREADY_MEMBER
+
+        seat = (
+            select(City.id, literal(player_id), func.now())
+            .where(City.id == city_id)
+            .where(City.player_count < City.max_players)
+            .with_for_update()
+        )
+        inserted = (
+            insert(CityPlayer)
+            .from_select(["city_id", "player_id", "joined_at"], seat)
+            .on_conflict_do_nothing()
+            .returning(CityPlayer.city_id)
+            .cte("inserted")
+        )
+        result = await self.session.execute(
+            update(City)
+            .where(City.id.in_(select(inserted.c.city_id)))
+            .values(player_count=City.player_count + 1)
+            .returning(City.player_count)
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.scalar_one_or_none() is not None:
+            await self.session.commit()
+            return JoinResult.JOINED
+
+        # Nothing inserted: lost a race against our own duplicate tap, or full
+        if await self.is_member(city_id, player_id):
+            return JoinResult.ALREADY_MEMBER
+        return JoinResult.FULL
+
+    async def leave(self, city_id: int, player_id: int) -> bool:
+        """Leave city.
+
+        Returns:
+            True if player was a member and has been removed
+        """
+        removed = (
+            delete(CityPlayer)
+            .where(CityPlayer.city_id == city_id)
+            .where(CityPlayer.player_id == player_id)
+            .returning(CityPlayer.city_id)
+            .cte("removed")
+        )
+        result = await self.session.execute(
+            update(City)
+            .where(City.id.in_(select(removed.c.city_id)))
+            .values(player_count=City.player_count - 1)
+            .returning(City.player_count)
+            .execution_options(synchronize_session=False)
+        )
+
+        if result.scalar_one_or_none() is None:
+            return False
+
+        await self.session.commit()
+        return True
@@ -1,15 +1,64 @@
 """Event manager service for special game events."""
 
-import random
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
-from app.models.event import Event, EventType
+from app.models.event import EffectKind, Event, EventEffect, EventType
 from app.models.game import Game
 from app.models.role import PlayerRole
 from app.utils.i18n import i18n
+from app.utils.rng import Stream, stream
+
+
+@dataclass(frozen=True)
+class Modifier:
+    """Active event effect, as consumed by phase resolution."""
+
+    event_id: int
+    event_type: EventType
+    kind: EffectKind
+    player_role_id: Optional[int] = None  # None: applies to the whole game
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+# Effects an event has on the whole game
+GAME_EFFECTS = {
+    EventType.INQUISITOR: [(EffectKind.INVESTIGATE_ROLE, {})],
+    EventType.MAYOR_ELECTION: [(EffectKind.MAYOR_ELECTION, {"mayor_weight": 2})],
+    # plan_roles deals no neutral roles, so there is no Maniac to use the slot yet
+    EventType.FULL_MOON: [(EffectKind.EXTRA_KILL, {"role": "Maniac", "kills": 1})],
+    EventType.CURFEW: [(EffectKind.NO_DAY_CHAT, {})],
+    EventType.DOUBLE_TROUBLE: [(EffectKind.EXTRA_KILL, {"team": "mafia", "kills": 1})],
+}
+
+# Phases an event lasts: the one it starts in and the next
+EVENT_PHASES = 2
+
+
+def active_modifiers_query(game_id: int) -> Select:
+    """Effects of all active events of a game.
+    
+    Uses ``ix_event_effects_game_role`` for the game's effects and
+    ``ix_events_game_active`` to keep only running events.
+    """
+    return (
+        select(
+            EventEffect.event_id,
+            Event.event_type,
+            EventEffect.kind,
+            EventEffect.player_role_id,
+            EventEffect.data,
+        )
+        .join(Event, Event.id == EventEffect.event_id)
+        .where(EventEffect.game_id == game_id)
+        .where(Event.game_id == game_id)
+        .where(Event.is_active == True)
+        .order_by(EventEffect.id)
+    )
 
 
 class EventManager:
@@ -24,6 +73,7 @@ class EventManager:
             game_id=game.id,
             event_type=event_type,
             day_number=game.day_number,
+            started_phase=game.phase_index,
         )
         
         self.session.add(event)
@@ -36,42 +86,76 @@ class EventManager:
         return event
     
     async def _apply_event_effects(self, game: Game, event: Event) -> None:
-        """Apply event-specific effects."""
-        if event.event_type == EventType.INQUISITOR:
-            # Sheriff can see all roles
-            pass  # Handled in investigation logic
+        """Apply event-specific effects and record them as effect rows."""
+        for kind, data in GAME_EFFECTS.get(event.event_type, ()):
+            self._add_effect(event, kind, data=data)
         
-        elif event.event_type == EventType.MAYOR_ELECTION:
-            # Start mayor election
-            pass  # Handled in voting logic
+        # Targets depend only on the game seed, day and event type
+        rng = stream(game.seed, Stream.EFFECTS, event.day_number, event.event_type.value)
         
-        elif event.event_type == EventType.PLAGUE:
+        if event.event_type == EventType.PLAGUE:
             # Random player loses ability
-            alive_players = game.alive_players
+            alive_players = await self._alive_roles(game.id)
             if alive_players:
-                affected = random.choice(alive_players)
+                affected = rng.choice(alive_players)
                 event.affected_player_id = affected.player_id
                 affected.ability_cooldown = 1
-        
-        elif event.event_type == EventType.FULL_MOON:
-            # Maniac can kill 2 people
-            pass  # Handled in action logic
-        
-        elif event.event_type == EventType.CURFEW:
-            # No talking during day
-            pass  # Handled in message handling
-        
-        elif event.event_type == EventType.DOUBLE_TROUBLE:
-            # Mafia can kill 2 players
-            pass  # Handled in action logic
+                self._add_effect(event, EffectKind.ABILITY_BLOCKED, affected)
         
         elif event.event_type == EventType.REVELATION:
             # Random role is revealed
-            alive_players = game.alive_players
+            alive_players = await self._alive_roles(game.id)
             if alive_players:
-                revealed = random.choice(alive_players)
+                revealed = rng.choice(alive_players)
                 event.affected_player_id = revealed.player_id
                 revealed.is_revealed = True
+                self._add_effect(event, EffectKind.REVEALED, revealed)
+        
+        elif event.event_type == EventType.MAYOR_ELECTION:
+            # The town elects a random player; an alive mayor stays in office
+            alive_players = await self._alive_roles(game.id)
+            if alive_players:
+                mayor = next((r for r in alive_players if r.is_mayor), None) or rng.choice(alive_players)
+                event.affected_player_id = mayor.player_id
+                mayor.is_mayor = True
+    
+    def _add_effect(
+        self,
+        event: Event,
+        kind: EffectKind,
+        player_role: Optional[PlayerRole] = None,
+        data: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.session.add(EventEffect(
+            event_id=event.id,
+            game_id=event.game_id,
+            player_role_id=player_role.id if player_role else None,
+            kind=kind,
+            data=dict(data or {}),
+        ))
+    
+    async def _alive_roles(self, game_id: int) -> List[PlayerRole]:
+        result = await self.session.scalars(
+            select(PlayerRole)
+            .where(PlayerRole.game_id == game_id)
+            .where(PlayerRole.is_alive == True)
+            .order_by(PlayerRole.id)
+        )
+        return list(result.all())
+    
+    async def active_modifiers(self, game_id: int) -> List[Modifier]:
+        """Get effects of all active events of a game in one query."""
+        result = await self.session.execute(active_modifiers_query(game_id))
+        return [
+            Modifier(
+                event_id=row.event_id,
+                event_type=row.event_type,
+                kind=row.kind,
+                player_role_id=row.player_role_id,
+                data=row.data or {},
+            )
+            for row in result
+        ]
     
     async def get_event_text(self, event: Event, lang: str) -> str:
         """Get localized event text."""
@@ -79,10 +163,12 @@ class EventManager:
         
         kwargs = {}
         if event.affected_player_id:
-            result = await self.session.execute(
-                select(PlayerRole).where(PlayerRole.player_id == event.affected_player_id)
+            player_role = await self.session.scalar(
+                select(PlayerRole)
+                .options(joinedload(PlayerRole.player), joinedload(PlayerRole.role))
+                .where(PlayerRole.game_id == event.game_id)
+                .where(PlayerRole.player_id == event.affected_player_id)
             )
-            player_role = result.scalar_one_or_none()
             if player_role:
                 kwargs["player"] = player_role.player.display_name
                 kwargs["role"] = i18n.get_role_name(player_role.role.name_key, lang)
@@ -91,7 +177,8 @@ class EventManager:
     
     async def process_random_event(self, game: Game) -> Optional[Event]:
         """Process random event with 20% chance."""
-        if random.random() > 0.8:  # 20% chance
+        rng = stream(game.seed, Stream.EVENTS, game.day_number)
+        if rng.random() > 0.8:  # 20% chance
             event_types = [
                 EventType.INQUISITOR,
                 EventType.MAYOR_ELECTION,
@@ -102,22 +189,46 @@ class EventManager:
                 EventType.REVELATION,
             ]
             
-            event_type = random.choice(event_types)
+            event_type = rng.choice(event_types)
             return await self.trigger_event(game, event_type)
         
         return None
     
+    async def expire_events(self, game: Game) -> List[Event]:
+        """Complete active events that do not last into the game's current phase.
+        
+        Called by the engine once the game has moved to a new phase, so live
+        play drops the effects in the same phase as ``Event.is_active_in``
+        does on replay. The caller commits.
+        """
+        phase = game.phase_index
+        active = await self.session.scalars(
+            select(Event)
+            .where(Event.game_id == game.id)
+            .where(Event.is_active == True)
+            .order_by(Event.id)
+        )
+        expired = [event for event in active if event.first_phase + EVENT_PHASES <= phase]
+        for event in expired:
+            await self._complete(event, phase)
+        return expired
+    
     async def end_event(self, event: Event) -> None:
         """End an active event."""
-        event.complete()
+        game = await self.session.get(Game, event.game_id)
+        await self._complete(event, game.phase_index if game else None)
+        await self.session.commit()
+    
+    async def _complete(self, event: Event, phase_index: Optional[int]) -> None:
+        event.complete(phase_index)
         
         # Revert event effects if needed
-        if event.event_type == EventType.PLAGUE and event.affected_player_id:
-            result = await self.session.execute(
-                select(PlayerRole).where(PlayerRole.player_id == event.affected_player_id)
+        if event.event_type == EventType.PLAGUE:
+            blocked = await self.session.scalars(
+                select(PlayerRole)
+                .join(EventEffect, EventEffect.player_role_id == PlayerRole.id)
+                .where(EventEffect.event_id == event.id)
+                .where(EventEffect.kind == EffectKind.ABILITY_BLOCKED)
             )
-            player_role = result.scalar_one_or_none()
-            if player_role:
+            for player_role in blocked:
                 player_role.ability_cooldown = 0
-        
-        await self.session.commit()
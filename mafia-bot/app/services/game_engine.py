@@ -1,135 +1,210 @@
 """Game engine service."""
 
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload
 
 from app.config import settings
 from app.models.action import Action, ActionType
-from app.models.game import Game, GameStatus
+from app.models.city import City
+from app.models.game import Game, GamePlayer, GameStatus
 from app.models.player import Player
-from app.models.role import PlayerRole, RoleType
+from app.models.role import PlayerRole, Role, RoleType
 from app.models.vote import Vote
+from app.services.balance import get_balance_table
+from app.services.event_manager import EventManager
+from app.services.modifiers import GameModifiers, compile_modifiers, killer_group
+from app.services.night import NightAction, NightOutcome, resolve_night
+from app.services.rules import Ballot, plan_roles, tally_votes, winner
+from app.utils.clock import Clock, get_clock
+from app.utils.metrics import SCHEDULER_JOB_LATENCY, timed
+from app.utils.rng import new_seed
 
 
 class GameEngine:
     """Game engine for processing game phases."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, clock: Optional[Clock] = None):
         self.session = session
+        self.clock = clock or get_clock()
     
+    @timed(SCHEDULER_JOB_LATENCY, "start_game")
+    async def start_game(self, city_id: int, player_ids: Sequence[int], seed: Optional[int] = None) -> Game:
+        """Create a game for given players, assign roles and start the first night."""
+        game = Game(
+            city_id=city_id,
+            status=GameStatus.STARTING,
+            started_at=self.clock.utcnow(),
+            seed=new_seed() if seed is None else seed,
+        )
+        self.session.add(game)
+        await self.session.flush()
+        
+        self.session.add_all(
+            GamePlayer(game_id=game.id, player_id=player_id)
+            for player_id in player_ids
+        )
+        
+        await self.assign_roles(game, player_ids)
+        
+        game.status = GameStatus.NIGHT
+        game.day_number = 1
+        # The first night ends with the next day start, like every other night
+        game.phase_end_time = self._next_day_start()
+        await self.session.execute(
+            update(City)
+            .where(City.id == city_id)
+            .values(current_game_id=game.id)
+        )
+        
+        await self.session.commit()
+        return game
+    
+    def _next_day_start(self) -> datetime:
+        """Next ``DAY_START_HOUR`` o'clock, when the night-end job runs."""
+        now = self.clock.utcnow()
+        day_start = now.replace(hour=settings.DAY_START_HOUR, minute=0, second=0, microsecond=0)
+        return day_start if day_start > now else day_start + timedelta(days=1)
+    
+    async def assign_roles(self, game: Game, player_ids: Sequence[int]) -> None:
+        """Assign roles to players."""
+        # Get available roles
+        result = await self.session.execute(
+            select(Role).where(Role.is_special == False).order_by(Role.id)
+        )
+        all_roles = result.scalars().all()
+        
+        self.session.add_all(
+            PlayerRole(player_id=player_id, game_id=game.id, role_id=role.id)
+            for player_id, role in plan_roles(
+                game.seed,
+                player_ids,
+                all_roles,
+                mafia_count=get_balance_table().mafia_count(len(player_ids)),
+            )
+        )
+        
+        await self.session.flush()
+    
+    @timed(SCHEDULER_JOB_LATENCY, "start_night")
     async def start_night(self, game: Game) -> None:
         """Start night phase."""
         game.status = GameStatus.NIGHT
-        game.phase_end_time = datetime.utcnow() + timedelta(
+        game.phase_end_time = self.clock.utcnow() + timedelta(
             hours=settings.NIGHT_START_HOUR + 24 - settings.DAY_START_HOUR
         )
+        await EventManager(self.session).expire_events(game)
         
         await self.session.commit()
     
-    async def end_night(self, game: Game) -> None:
+    @timed(SCHEDULER_JOB_LATENCY, "end_night")
+    async def end_night(self, game: Game) -> NightOutcome:
         """End night phase and process actions."""
-        # Get all actions for this night
-        actions = await self.session.execute(
-            select(Action)
-            .where(Action.game_id == game.id)
-            .where(Action.day_number == game.day_number)
-            .where(Action.processed_at.is_(None))
-            .order_by(Action.created_at)
-        )
-        actions = actions.scalars().all()
+        # Event effects are compiled once for the whole night
+        modifiers = await self.get_modifiers(game)
+        actions = await self._load_night_actions(game)
         
-        # Process actions by priority
-        await self._process_night_actions(game, actions)
+        outcome = resolve_night(actions, modifiers)
+        await self._apply_night_outcome(game, outcome)
         
         # Check win conditions
-        winner = await self._check_win_conditions(game)
-        if winner:
-            await self._end_game(game, winner)
-            return
+        winning_faction = await self._check_win_conditions(game)
+        if winning_faction:
+            await self._end_game(game, winning_faction)
+            return outcome
         
         # Start day phase
         await self.start_day(game)
+        return outcome
+    
+    async def get_modifiers(self, game: Game) -> GameModifiers:
+        """Compile modifiers of the game's active events."""
+        return compile_modifiers(await EventManager(self.session).active_modifiers(game.id))
     
-    async def _process_night_actions(self, game: Game, actions: List[Action]) -> None:
-        """Process all night actions in priority order."""
-        # Track protected and healed players
-        protected_players = set()
-        healed_players = set()
-        killed_players = set()
-        
-        # Sort actions by role priority
-        sorted_actions = sorted(
-            actions,
-            key=lambda a: a.player_role.role.action_priority
+    async def _load_night_actions(self, game: Game) -> List[NightAction]:
+        """Load tonight's actions of alive roles with their actor and target roles."""
+        actor = aliased(PlayerRole)
+        actor_role = aliased(Role)
+        target = aliased(PlayerRole)
+        target_role = aliased(Role)
+        
+        result = await self.session.execute(
+            select(
+                Action.actor_role_id,
+                Action.action_type,
+                actor_role.action_priority,
+                actor_role.team,
+                actor_role.name,
+                target.id.label("target_role_id"),
+                target_role.role_type,
+                target_role.name_key,
+            )
+            .join(actor, actor.id == Action.actor_role_id)
+            .join(actor_role, actor_role.id == actor.role_id)
+            # Actions against players who are already dead have no target
+            .outerjoin(target, and_(target.id == Action.target_role_id, target.is_alive == True))
+            .outerjoin(target_role, target_role.id == target.role_id)
+            .where(Action.game_id == game.id)
+            .where(Action.game_night == game.day_number)
+            .where(actor.is_alive == True)
+            .order_by(Action.created_at, Action.id)
         )
+        return [
+            NightAction(
+                actor_role_id=row.actor_role_id,
+                action_type=row.action_type,
+                priority=row.action_priority,
+                killer_group=killer_group(row.team, row.name),
+                target_role_id=row.target_role_id,
+                target_is_mafia=row.role_type == RoleType.MAFIA,
+                target_role_key=row.name_key,
+            )
+            for row in result
+        ]
+    
+    async def _apply_night_outcome(self, game: Game, outcome: NightOutcome) -> None:
+        """Kill the night's victims and store investigation results on their actions."""
+        for actor_role_id, result in outcome.investigations.items():
+            await self.session.execute(
+                update(Action)
+                .where(Action.game_id == game.id)
+                .where(Action.game_night == game.day_number)
+                .where(Action.actor_role_id == actor_role_id)
+                .where(Action.action_type == ActionType.INVESTIGATE)
+                .values(result=result)
+            )
         
-        for action in sorted_actions:
-            if not action.player_role.is_alive:
-                continue
-            
-            if action.action_type == ActionType.PROTECT:
-                # Bodyguard protection
-                if action.target:
-                    protected_players.add(action.target.player_id)
-                    action.mark_processed(True, f"Protected {action.target.player.display_name}")
-            
-            elif action.action_type == ActionType.HEAL:
-                # Doctor heal
-                if action.target:
-                    healed_players.add(action.target.player_id)
-                    action.mark_processed(True, f"Healed {action.target.player.display_name}")
-            
-            elif action.action_type == ActionType.BLOCK:
-                # Prostitute block
-                if action.target:
-                    # Block target's action for this night
-                    action.mark_processed(True, f"Blocked {action.target.player.display_name}")
-            
-            elif action.action_type == ActionType.INVESTIGATE:
-                # Sheriff investigation
-                if action.target:
-                    is_mafia = action.target.role.role_type == RoleType.MAFIA
-                    result = "is_mafia" if is_mafia else "not_mafia"
-                    action.mark_processed(True, result)
-            
-            elif action.action_type in [ActionType.KILL, ActionType.MANIAC_KILL]:
-                # Mafia or Maniac kill
-                if action.target:
-                    target_id = action.target.player_id
-                    
-                    # Check if target is protected or healed
-                    if target_id in protected_players or target_id in healed_players:
-                        action.mark_processed(False, "Target was protected")
-                    else:
-                        killed_players.add(target_id)
-                        action.mark_processed(True, f"Killed {action.target.player.display_name}")
-        
-        # Apply deaths
-        for action in sorted_actions:
-            if action.action_type in [ActionType.KILL, ActionType.MANIAC_KILL]:
-                if action.target and action.target.player_id in killed_players:
-                    action.target.kill("killed_night")
+        if outcome.killed:
+            victims = await self.session.scalars(
+                select(PlayerRole).where(PlayerRole.id.in_(outcome.killed))
+            )
+            for victim in victims:
+                victim.kill("killed_night")
         
         await self.session.commit()
     
+    @timed(SCHEDULER_JOB_LATENCY, "start_day")
     async def start_day(self, game: Game) -> None:
         """Start day phase."""
         game.status = GameStatus.DAY
         game.day_number += 1
-        game.phase_end_time = datetime.utcnow() + timedelta(
+        game.phase_end_time = self.clock.utcnow() + timedelta(
             hours=settings.DAY_START_HOUR + 16
         )
+        await EventManager(self.session).expire_events(game)
         
         await self.session.commit()
     
+    @timed(SCHEDULER_JOB_LATENCY, "start_voting")
     async def start_voting(self, game: Game) -> None:
         """Start voting phase."""
         game.status = GameStatus.VOTING
         await self.session.commit()
     
+    @timed(SCHEDULER_JOB_LATENCY, "process_votes")
     async def process_votes(self, game: Game) -> Optional[PlayerRole]:
         """Process votes and return executed player or None."""
         # Get active votes for current day
@@ -144,20 +219,15 @@ class GameEngine:
         if not votes:
             return None
         
-        # Count votes
-        vote_counts = {}
-        for vote in votes:
-            target_id = vote.target_id
-            vote_counts[target_id] = vote_counts.get(target_id, 0) + vote.weight
-        
-        # Find player with most votes
-        max_votes = max(vote_counts.values())
-        alive_count = len(game.alive_players)
+        executed_id = tally_votes(
+            (Ballot(v.voter_id, v.target_id, v.weight, v.voter.is_mayor) for v in votes),
+            alive_count=len(game.alive_players),
+            seed=game.seed,
+            day_number=game.day_number,
+            modifiers=await self.get_modifiers(game),
+        )
         
-        # Need majority to execute
-        if max_votes > alive_count / 2:
-            executed_id = max(vote_counts, key=vote_counts.get)
-            
+        if executed_id is not None:
             result = await self.session.execute(
                 select(PlayerRole).where(PlayerRole.id == executed_id)
             )
@@ -176,27 +246,38 @@ class GameEngine:
         Returns:
             Winner faction or None if game continues
         """
-        alive_mafia = len(game.alive_mafia)
-        alive_civilians = len(game.alive_civilians)
-        
-        # Mafia wins if they equal or outnumber civilians
-        if alive_mafia >= alive_civilians:
-            return "mafia"
-        
-        # Civilians win if no mafia left
-        if alive_mafia == 0:
-            return "town"
-        
-        return None
+        # Counted in SQL: roles of loaded PlayerRoles can not be lazy-loaded here
+        result = await self.session.execute(
+            select(Role.role_type, func.count())
+            .join(PlayerRole, PlayerRole.role_id == Role.id)
+            .where(PlayerRole.game_id == game.id)
+            .where(PlayerRole.is_alive == True)
+            .group_by(Role.role_type)
+        )
+        alive = dict(result.all())
+        return winner(alive.get(RoleType.MAFIA, 0), alive.get(RoleType.CIVILIAN, 0))
     
     async def _end_game(self, game: Game, winner: str) -> None:
         """End the game."""
         game.status = GameStatus.ENDED
         game.winner_faction = winner
-        game.ended_at = datetime.utcnow()
+        game.ended_at = self.clock.utcnow()
+        
+        # Release the city for a new game
+        await self.session.execute(
+            update(City)
+            .where(City.id == game.city_id)
+            .where(City.current_game_id == game.id)
+            .values(current_game_id=None)
+        )
         
         # Update player statistics
-        for player_role in game.roles:
+        roles = await self.session.scalars(
+            select(PlayerRole)
+            .options(joinedload(PlayerRole.player), joinedload(PlayerRole.role))
+            .where(PlayerRole.game_id == game.id)
+        )
+        for player_role in roles:
             player = player_role.player
             player.games_played += 1
             
@@ -0,0 +1,64 @@
+"""Indexed lookups of games in progress."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.city import City
+from app.models.game import ACTIVE_GAME_STATUSES, Game, GamePlayer
+from app.models.role import PlayerRole
+
+
+@dataclass
+class PlayerActiveGame:
+    """Player's game in progress together with their role in it."""
+
+    game: Game
+    player_role: Optional[PlayerRole]
+    city_name: str
+
+
+class GameLookup:
+    """Find current games without walking ``city.games`` or ``player.games``."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_player_active_game(self, player_id: int) -> Optional[PlayerActiveGame]:
+        """Get player's game in progress and their role in one query.
+
+        Uses ``ix_game_players_player_id`` to find the player's games and
+        ``ix_player_roles_game_player`` for the role, so the cost does not
+        depend on how many games the player has played before.
+        """
+        result = await self.session.execute(
+            select(Game, PlayerRole, City.name)
+            .join(GamePlayer, GamePlayer.game_id == Game.id)
+            .join(City, City.id == Game.city_id)
+            .outerjoin(
+                PlayerRole,
+                and_(
+                    PlayerRole.game_id == Game.id,
+                    PlayerRole.player_id == player_id,
+                ),
+            )
+            .where(GamePlayer.player_id == player_id)
+            .where(Game.status.in_(ACTIVE_GAME_STATUSES))
+            .order_by(Game.id.desc())
+            .limit(1)
+        )
+        row = result.one_or_none()
+
+        if row is None:
+            return None
+
+        game, player_role, city_name = row
+        return PlayerActiveGame(game=game, player_role=player_role, city_name=city_name)
+
+    async def get_city_current_game(self, city: City) -> Optional[Game]:
+        """Get city's game in progress via ``City.current_game_id``."""
+        if city.current_game_id is None:
+            return None
+        return await self.session.get(Game, city.current_game_id)
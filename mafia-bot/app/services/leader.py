@@ -0,0 +1,184 @@
+"""Leader election for cluster-wide scheduled jobs.
+
+Every replica serves updates, but phase transitions and reminders must run
+in exactly one process. Leadership is a Postgres session-level advisory
+lock held on a dedicated connection: when the leader exits or its
+connection dies, Postgres releases the lock and the next replica to retry
+takes over within ``LEADER_RETRY_INTERVAL``.
+"""
+
+import asyncio
+import os
+import socket
+from typing import Any, Awaitable, Callable, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.models.database import engine_options
+from app.utils.logger import get_logger
+from app.utils.metrics import SCHEDULER_LEADER, SCHEDULER_LEADER_CHANGES
+
+logger = get_logger(__name__)
+
+TRY_LOCK = text("SELECT pg_try_advisory_lock(:key)")
+UNLOCK = text("SELECT pg_advisory_unlock(:key)")
+PING = text("SELECT 1")
+
+
+def instance_id() -> str:
+    """Name of this process in logs and metrics."""
+    return settings.INSTANCE_ID or f"{socket.gethostname()}:{os.getpid()}"
+
+
+def create_lock_engine() -> AsyncEngine:
+    """Engine for the lock connection.
+
+    The lock lives as long as one server connection, so it must not go
+    through PgBouncer transaction pooling; set ``LEADER_DATABASE_URL`` to a
+    direct URL in that setup.
+    """
+    return create_async_engine(
+        settings.LEADER_DATABASE_URL or settings.DATABASE_URL,
+        poolclass=NullPool,
+        connect_args=engine_options()["connect_args"],
+    )
+
+
+class LeaderElection:
+    """Run ``scheduler`` only while this process holds the leader lock.
+
+    The scheduler must be started paused; it is resumed on election and
+    paused again when the lock connection is lost. Non-Postgres databases
+    (single-process development setups) and ``LEADER_ELECTION=false`` make
+    the process leader unconditionally.
+    """
+
+    def __init__(
+        self,
+        scheduler: AsyncIOScheduler,
+        engine: Optional[AsyncEngine] = None,
+        on_elected: Optional[Callable[[], Awaitable[Any]]] = None,
+        key: int = settings.LEADER_LOCK_KEY,
+        interval: float = settings.LEADER_RETRY_INTERVAL,
+    ):
+        self.scheduler = scheduler
+        self.engine = engine
+        self._owns_engine = engine is None
+        self.on_elected = on_elected
+        self.key = key
+        self.interval = interval
+        self.instance = instance_id()
+        self.is_leader = False
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+        SCHEDULER_LEADER.set(0, self.instance)
+
+    @property
+    def uses_lock(self) -> bool:
+        """Whether leadership depends on the advisory lock."""
+        if not settings.LEADER_ELECTION:
+            return False
+        if self.engine is None:
+            self.engine = create_lock_engine()
+        return self.engine.dialect.name == "postgresql"
+
+    async def start(self) -> None:
+        """Try to become leader now, then keep checking in the background."""
+        await self.check()
+        if self.uses_lock:
+            self._task = asyncio.create_task(self._run(), name="leader-election")
+
+    async def stop(self) -> None:
+        """Stop campaigning and hand leadership over."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        if self._conn is not None:
+            try:
+                await self._conn.execute(UNLOCK, {"key": self.key})
+            except Exception as e:
+                logger.warning("leader_unlock_failed", error=str(e))
+        await self._step_down()
+        if self._owns_engine and self.engine is not None:
+            await self.engine.dispose()
+
+    async def check(self) -> bool:
+        """Verify the lock if leader, otherwise try to take it."""
+        if not self.uses_lock:
+            if not self.is_leader:
+                await self._elected()
+            return True
+
+        if self.is_leader:
+            try:
+                await self._conn.execute(PING)
+            except Exception as e:
+                logger.warning("leader_lock_lost", instance=self.instance, error=str(e))
+                await self._step_down()
+            return self.is_leader
+
+        if await self._try_lock():
+            await self._elected()
+        return self.is_leader
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning("leader_check_failed", instance=self.instance, error=str(e))
+
+    async def _try_lock(self) -> bool:
+        conn = await self.engine.connect()
+        try:
+            # Autocommit: the session lock must not keep a transaction open
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            acquired = await conn.scalar(TRY_LOCK, {"key": self.key})
+        except BaseException:
+            await conn.close()
+            raise
+
+        if not acquired:
+            await conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    async def _elected(self) -> None:
+        self.is_leader = True
+        SCHEDULER_LEADER.set(1, self.instance)
+        SCHEDULER_LEADER_CHANGES.inc("elected")
+        logger.info("leader_elected", instance=self.instance)
+
+        if self.on_elected is not None:
+            try:
+                await self.on_elected()
+            except Exception:
+                logger.exception("leader_on_elected_failed", instance=self.instance)
+        self.scheduler.resume()
+
+    async def _step_down(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        self.scheduler.pause()
+        SCHEDULER_LEADER.set(0, self.instance)
+        SCHEDULER_LEADER_CHANGES.inc("demoted")
+        logger.warning("leader_demoted", instance=self.instance)
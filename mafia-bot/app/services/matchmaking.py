@@ -0,0 +1,315 @@
+"""Matchmaking service that fills cities and starts games automatically."""
+
+import heapq
+from datetime import datetime, timedelta
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from aiogram import Bot
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.city import City, CityPlayer
+from app.models.database import AsyncSessionLocal
+from app.models.game import Game
+from app.models.matchmaking import MatchmakingTicket
+from app.services.game_engine import GameEngine
+from app.services.notifications import notify_game_start
+from app.utils.clock import get_clock
+from app.utils.i18n import i18n
+from app.utils.logger import get_logger
+from app.utils.metrics import SCHEDULER_JOB_LATENCY, timed
+
+logger = get_logger(__name__)
+
+# Queue partition: (language, level band)
+PartitionKey = Tuple[str, int]
+
+
+def partition_key(language: str, level: int) -> PartitionKey:
+    """Get queue partition for player's language and level."""
+    return language, max(0, level - 1) // settings.MATCHMAKING_LEVEL_BAND
+
+
+class QueueEntry(NamedTuple):
+    """Queued player."""
+
+    player_id: int
+    enqueued_at: float
+
+
+class MatchmakingQueue:
+    """In-memory matchmaking queue partitioned by language and level band.
+
+    Each partition is a binary heap ordered by enqueue time, so enqueue and
+    dequeue are O(log n). Cancellation is O(1): the entry is dropped from the
+    index and its stale heap slot is skipped when it reaches the top.
+    """
+
+    def __init__(self):
+        self._heaps: Dict[PartitionKey, List[Tuple[float, int, int]]] = {}
+        self._sizes: Dict[PartitionKey, int] = {}
+        # player_id -> (partition, sequence number of the live heap slot)
+        self._index: Dict[int, Tuple[PartitionKey, int]] = {}
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, player_id: int) -> bool:
+        return player_id in self._index
+
+    def push(self, key: PartitionKey, player_id: int, enqueued_at: float) -> bool:
+        """Add player to partition; returns False if already queued."""
+        if player_id in self._index:
+            return False
+
+        self._seq += 1
+        heapq.heappush(self._heaps.setdefault(key, []), (enqueued_at, self._seq, player_id))
+        self._sizes[key] = self._sizes.get(key, 0) + 1
+        self._index[player_id] = (key, self._seq)
+        return True
+
+    def remove(self, player_id: int) -> bool:
+        """Remove player from the queue; returns False if not queued."""
+        entry = self._index.pop(player_id, None)
+        if entry is None:
+            return False
+
+        key, _ = entry
+        self._sizes[key] -= 1
+        self._compact(key)
+        return True
+
+    def size(self, key: PartitionKey) -> int:
+        """Get number of queued players in partition."""
+        return self._sizes.get(key, 0)
+
+    def partitions(self) -> List[PartitionKey]:
+        """Get non-empty partitions."""
+        return [key for key, size in self._sizes.items() if size > 0]
+
+    def oldest(self, key: PartitionKey) -> Optional[float]:
+        """Get enqueue time of the longest waiting player in partition."""
+        heap = self._heaps.get(key)
+        self._drop_stale(heap)
+        return heap[0][0] if heap else None
+
+    def pop_batch(self, key: PartitionKey, count: int) -> List[QueueEntry]:
+        """Pop up to ``count`` longest waiting players from partition."""
+        heap = self._heaps.get(key)
+        batch: List[QueueEntry] = []
+
+        while heap and len(batch) < count:
+            enqueued_at, seq, player_id = heapq.heappop(heap)
+            if self._index.get(player_id) != (key, seq):
+                continue
+            del self._index[player_id]
+            batch.append(QueueEntry(player_id, enqueued_at))
+
+        self._sizes[key] = self._sizes.get(key, 0) - len(batch)
+        return batch
+
+    def _drop_stale(self, heap: Optional[List[Tuple[float, int, int]]]) -> None:
+        """Pop cancelled entries from the top of the heap."""
+        while heap:
+            _, seq, player_id = heap[0]
+            entry = self._index.get(player_id)
+            if entry is not None and entry[1] == seq:
+                return
+            heapq.heappop(heap)
+
+    def _compact(self, key: PartitionKey) -> None:
+        """Rebuild heap once cancelled entries outnumber live ones."""
+        heap = self._heaps.get(key)
+        if not heap or len(heap) < 64 or len(heap) <= 2 * self._sizes[key]:
+            return
+
+        live = [item for item in heap if self._index.get(item[2]) == (key, item[1])]
+        heapq.heapify(live)
+        self._heaps[key] = live
+
+
+class Matchmaker:
+    """Batch queued players into new cities and auto-start their games.
+
+    Tickets in the database are the queue of record: any replica enqueues
+    and cancels, and the leader matches on an in-memory queue synced from
+    them.
+    """
+
+    def __init__(self, bot: Bot):
+        self.bot = bot
+        self.queue = MatchmakingQueue()
+        # Time of the last sync; None until the first, which reads every ticket
+        self._synced_at: Optional[datetime] = None
+
+    async def sync(self) -> int:
+        """Add tickets enqueued since the last sync; returns players added.
+
+        Later syncs read only tickets from the last sync on, less one
+        matching interval for inserts that committed late; pushing a queued
+        player again is a no-op. Cancellations are not read: a cancelled
+        player's ticket is gone when their batch claims it.
+        """
+        synced_at = get_clock().now()
+        query = select(MatchmakingTicket).order_by(MatchmakingTicket.enqueued_at)
+        if self._synced_at is not None:
+            since = self._synced_at - timedelta(seconds=settings.MATCHMAKING_INTERVAL)
+            query = query.where(MatchmakingTicket.enqueued_at >= since)
+
+        added = 0
+        async with AsyncSessionLocal() as session:
+            result = await session.stream_scalars(query.execution_options(yield_per=1000))
+            async for ticket in result:
+                added += self.queue.push(
+                    partition_key(ticket.language, ticket.level),
+                    ticket.player_id,
+                    ticket.enqueued_at.timestamp(),
+                )
+
+        self._synced_at = synced_at
+        return added
+
+    async def enqueue(
+        self,
+        session: AsyncSession,
+        player_id: int,
+        language: str,
+        level: int,
+    ) -> bool:
+        """Put player in the queue; returns False if already queued."""
+        enqueued_at = get_clock().now()
+        inserted = await session.scalar(
+            pg_insert(MatchmakingTicket)
+            .values(
+                player_id=player_id,
+                language=language,
+                level=level,
+                enqueued_at=enqueued_at,
+            )
+            .on_conflict_do_nothing()
+            .returning(MatchmakingTicket.player_id)
+        )
+        await session.commit()
+
+        return inserted is not None
+
+    async def cancel(self, session: AsyncSession, player_id: int) -> bool:
+        """Remove player from the queue; returns False if not queued."""
+        removed = await session.scalar(
+            delete(MatchmakingTicket)
+            .where(MatchmakingTicket.player_id == player_id)
+            .returning(MatchmakingTicket.player_id)
+        )
+        await session.commit()
+
+        return removed is not None
+
+    def collect_batches(self, now: Optional[float] = None) -> List[Tuple[PartitionKey, List[QueueEntry]]]:
+        """Pop every batch that is ready to become a city.
+
+        Full batches of ``MAX_PLAYERS`` are formed immediately; a partial batch
+        of at least ``MIN_PLAYERS`` is formed once its oldest player has waited
+        for the fill window.
+        """
+        now = get_clock().time() if now is None else now
+        batches = []
+
+        for key in self.queue.partitions():
+            while self.queue.size(key) >= settings.MAX_PLAYERS:
+                batches.append((key, self.queue.pop_batch(key, settings.MAX_PLAYERS)))
+
+            oldest = self.queue.oldest(key)
+            if (
+                oldest is not None
+                and self.queue.size(key) >= settings.MIN_PLAYERS
+                and now - oldest >= settings.MATCHMAKING_FILL_WINDOW
+            ):
+                batches.append((key, self.queue.pop_batch(key, settings.MAX_PLAYERS)))
+
+        return batches
+
+    @timed(SCHEDULER_JOB_LATENCY, "matchmaking")
+    async def run_matching(self) -> int:
+        """Run one matching pass; returns number of games started.
+
+        Runs on the leader only. New tickets are synced first, so players
+        queued through any replica count.
+        """
+        await self.sync()
+        batches = self.collect_batches()
+        if not batches:
+            return 0
+
+        started = 0
+        for key, entries in batches:
+            async with AsyncSessionLocal() as session:
+                try:
+                    game = await self._start_batch(session, key, entries)
+                except Exception:
+                    logger.exception("matchmaking_start_failed", language=key[0], players=len(entries))
+                    # Nothing of the batch was committed; its players wait for the next pass
+                    await session.rollback()
+                    self._requeue(key, entries)
+                    continue
+
+                if game is None:
+                    continue
+                started += 1
+                try:
+                    await notify_game_start(self.bot, session, game)
+                except Exception:
+                    logger.exception("matchmaking_notify_failed", game_id=game.id)
+
+        logger.info("matchmaking_games_started", games=started)
+        return started
+
+    async def _start_batch(
+        self,
+        session: AsyncSession,
+        key: PartitionKey,
+        entries: Sequence[QueueEntry],
+    ) -> Optional[Game]:
+        """Claim the batch's tickets, create its city and start its game in one transaction.
+
+        Players whose ticket is gone (cancelled, or claimed by an overlapping
+        pass during a leader change) are dropped; a batch left too small is
+        rolled back and waits for the next pass.
+        """
+        language, _ = key
+        claimed = set(await session.scalars(
+            delete(MatchmakingTicket)
+            .where(MatchmakingTicket.player_id.in_([entry.player_id for entry in entries]))
+            .returning(MatchmakingTicket.player_id)
+        ))
+        player_ids = [entry.player_id for entry in entries if entry.player_id in claimed]
+        if len(player_ids) < settings.MIN_PLAYERS:
+            await session.rollback()
+            self._requeue(key, [entry for entry in entries if entry.player_id in claimed])
+            return None
+
+        city_id = await session.scalar(
+            insert(City)
+            .values(
+                name=i18n.get("matchmaking.city_name", language),
+                creator_id=player_ids[0],
+                language=language,
+                max_players=settings.MAX_PLAYERS,
+                min_players=settings.MIN_PLAYERS,
+                player_count=len(player_ids),
+            )
+            .returning(City.id)
+        )
+        await session.execute(
+            insert(CityPlayer),
+            [{"city_id": city_id, "player_id": player_id} for player_id in player_ids],
+        )
+        # Commits the claimed tickets, the city and its players with the game
+        return await GameEngine(session).start_game(city_id, player_ids)
+
+    def _requeue(self, key: PartitionKey, entries: Sequence[QueueEntry]) -> None:
+        """Put players of a batch that did not start back in their place."""
+        for entry in entries:
+            self.queue.push(key, entry.player_id, entry.enqueued_at)
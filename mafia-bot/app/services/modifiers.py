@@ -0,0 +1,112 @@
+"""Compiled event modifiers.
+
+Active event effects are compiled once per phase into a ``GameModifiers``
+value; night and vote resolution read plain fields from it instead of
+looking at events for every action.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, Mapping
+
+from app.models.event import EffectKind
+from app.services.event_manager import Modifier
+
+
+@dataclass(frozen=True)
+class GameModifiers:
+    """Resolver hooks of a game's active events."""
+
+    # Killer group (see ``killer_group``) -> additional kills per night
+    extra_kills: Mapping[str, int] = field(default_factory=dict)
+    # Roles that can not act
+    blocked: FrozenSet[int] = frozenset()
+    # Investigations reveal the exact role instead of mafia / not mafia
+    investigate_role: bool = False
+    # Weight of a mayor's vote
+    mayor_vote_weight: int = 1
+    # Role -> vote weight, overriding the stored weight
+    vote_weights: Mapping[int, int] = field(default_factory=dict)
+    # Players can not talk during the day
+    no_day_chat: bool = False
+
+    def kill_slots(self, group: str) -> int:
+        """Kills a killer group may make tonight."""
+        return 1 + self.extra_kills.get(group, 0)
+
+    def vote_weight(self, voter_role_id: int, is_mayor: bool, weight: int) -> int:
+        """Effective weight of a vote."""
+        if voter_role_id in self.vote_weights:
+            return self.vote_weights[voter_role_id]
+        if is_mayor:
+            return max(weight, self.mayor_vote_weight)
+        return weight
+
+
+NO_MODIFIERS = GameModifiers()
+
+
+def killer_group(team: str, role_name: str) -> str:
+    """Kill slots are shared by the mafia team and owned by each other killer role."""
+    return team if team == "mafia" else role_name
+
+
+def _extra_kill(hooks: Dict, modifier: Modifier) -> None:
+    group = modifier.data.get("team") or modifier.data.get("role")
+    extra = hooks["extra_kills"]
+    extra[group] = extra.get(group, 0) + int(modifier.data.get("kills", 1))
+
+
+def _ability_blocked(hooks: Dict, modifier: Modifier) -> None:
+    if modifier.player_role_id is not None:
+        hooks["blocked"].add(modifier.player_role_id)
+
+
+def _investigate_role(hooks: Dict, modifier: Modifier) -> None:
+    hooks["investigate_role"] = True
+
+
+def _mayor_election(hooks: Dict, modifier: Modifier) -> None:
+    hooks["mayor_vote_weight"] = max(hooks["mayor_vote_weight"], int(modifier.data.get("mayor_weight", 2)))
+
+
+def _vote_weight(hooks: Dict, modifier: Modifier) -> None:
+    if modifier.player_role_id is not None:
+        hooks["vote_weights"][modifier.player_role_id] = int(modifier.data.get("weight", 1))
+
+
+def _no_day_chat(hooks: Dict, modifier: Modifier) -> None:
+    hooks["no_day_chat"] = True
+
+
+# Effect kind -> function folding an effect into the hooks
+COMPILERS: Dict[str, Callable[[Dict, Modifier], None]] = {
+    EffectKind.EXTRA_KILL: _extra_kill,
+    EffectKind.ABILITY_BLOCKED: _ability_blocked,
+    EffectKind.INVESTIGATE_ROLE: _investigate_role,
+    EffectKind.MAYOR_ELECTION: _mayor_election,
+    EffectKind.VOTE_WEIGHT: _vote_weight,
+    EffectKind.NO_DAY_CHAT: _no_day_chat,
+}
+
+
+def compile_modifiers(modifiers: Iterable[Modifier]) -> GameModifiers:
+    """Fold active effects into resolver hooks.
+
+    Effect kinds without a compiler (e.g. ``revealed``, which is applied
+    to the role when the event starts) do not affect resolution.
+    """
+    hooks = {
+        "extra_kills": {},
+        "blocked": set(),
+        "investigate_role": False,
+        "mayor_vote_weight": 1,
+        "vote_weights": {},
+        "no_day_chat": False,
+    }
+    for modifier in modifiers:
+        compiler = COMPILERS.get(modifier.kind)
+        if compiler is not None:
+            compiler(hooks, modifier)
+
+    hooks["blocked"] = frozenset(hooks["blocked"])
+    return GameModifiers(**hooks)
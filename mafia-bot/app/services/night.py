@@ -0,0 +1,79 @@
+"""Night resolution.
+
+Resolution works on plain ``NightAction`` records loaded in one query,
+so the loop touches neither the session nor event tables.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set
+
+from app.models.action import ActionType
+from app.services.modifiers import NO_MODIFIERS, GameModifiers
+
+
+@dataclass(frozen=True)
+class NightAction:
+    """Action with everything resolution needs about its actor and target."""
+
+    actor_role_id: int
+    action_type: str
+    priority: int
+    killer_group: str
+    target_role_id: Optional[int] = None
+    target_is_mafia: bool = False
+    target_role_key: Optional[str] = None
+
+
+@dataclass
+class NightOutcome:
+    """Result of a night."""
+
+    killed: List[int] = field(default_factory=list)
+    saved: List[int] = field(default_factory=list)
+    blocked: Set[int] = field(default_factory=set)
+    # Investigator role -> "is_mafia" / "not_mafia", or the target's role key
+    investigations: Dict[int, str] = field(default_factory=dict)
+
+
+def resolve_night(actions: Sequence[NightAction], modifiers: GameModifiers = NO_MODIFIERS) -> NightOutcome:
+    """Resolve a night's actions.
+
+    Actions run in role priority order; a block only stops actions that
+    come after it. Kills are limited to each killer group's slots and land
+    unless the target was protected or healed at any point of the night.
+    """
+    outcome = NightOutcome()
+    blocked = set(modifiers.blocked)
+    shielded: Set[int] = set()
+    attempts: List[int] = []
+    kills_used: Dict[str, int] = {}
+
+    for action in sorted(actions, key=lambda a: a.priority):
+        if action.actor_role_id in blocked:
+            outcome.blocked.add(action.actor_role_id)
+            continue
+        target = action.target_role_id
+        if target is None:
+            continue
+        kind = action.action_type
+
+        if kind == ActionType.BLOCK:
+            blocked.add(target)
+        elif kind in (ActionType.PROTECT, ActionType.HEAL):
+            shielded.add(target)
+        elif kind == ActionType.INVESTIGATE:
+            if modifiers.investigate_role and action.target_role_key:
+                outcome.investigations[action.actor_role_id] = action.target_role_key
+            else:
+                outcome.investigations[action.actor_role_id] = (
+                    "is_mafia" if action.target_is_mafia else "not_mafia"
+                )
+        elif kind == ActionType.KILL:
+            used = kills_used.get(action.killer_group, 0)
+            if used < modifiers.kill_slots(action.killer_group):
+                kills_used[action.killer_group] = used + 1
+                attempts.append(target)
+
+    for target in dict.fromkeys(attempts):
+        (outcome.saved if target in shielded else outcome.killed).append(target)
+    return outcome
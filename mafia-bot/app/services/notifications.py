@@ -0,0 +1,78 @@
+"""Player notifications sent by the bot."""
+
+from aiogram import Bot
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.action import Action
+from app.models.game import Game
+from app.models.player import Player
+from app.models.role import PlayerRole, Role
+from app.utils.i18n import i18n
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def notify_game_start(bot: Bot, session: AsyncSession, game: Game) -> None:
+    """Notify all players about game start and their roles."""
+    result = await session.execute(
+        select(Player.id, Player.telegram_id, Player.language, Role.name_key)
+        .join(PlayerRole, PlayerRole.player_id == Player.id)
+        .join(Role, Role.id == PlayerRole.role_id)
+        .where(PlayerRole.game_id == game.id)
+    )
+
+    for player_id, telegram_id, language, role_key in result.all():
+        role_text = i18n.get(
+            "game.your_role",
+            language,
+            role=i18n.get_role_name(role_key, language),
+            description=i18n.get_role_description(role_key, language),
+            team_info=i18n.get_role_team(role_key, language),
+        )
+
+        try:
+            await bot.send_message(telegram_id, role_text)
+        except Exception as e:
+            logger.warning("player_notify_failed", player_id=player_id, error=str(e))
+
+
+def investigation_text(result: str, language: str) -> str:
+    """Text of an investigation result: mafia or not, or the exact role."""
+    if result in ("is_mafia", "not_mafia"):
+        return i18n.get(f"actions.{result}", language)
+    return i18n.get_role_name(result, language)
+
+
+async def notify_investigations(bot: Bot, session: AsyncSession, game_id: int, night: int) -> None:
+    """Send investigators the results stored on their actions of ``night``."""
+    actor = aliased(PlayerRole)
+    investigator = aliased(Player)
+    target = aliased(PlayerRole)
+    suspect = aliased(Player)
+
+    result = await session.execute(
+        select(investigator.id, investigator.telegram_id, investigator.language, suspect.first_name, Action.result)
+        .join(actor, actor.id == Action.actor_role_id)
+        .join(investigator, investigator.id == actor.player_id)
+        .join(target, target.id == Action.target_role_id)
+        .join(suspect, suspect.id == target.player_id)
+        .where(Action.game_id == game_id)
+        .where(Action.game_night == night)
+        .where(Action.result.is_not(None))
+    )
+
+    for player_id, telegram_id, language, target_name, check_result in result.all():
+        text = i18n.get(
+            "actions.investigation_result",
+            language,
+            target=target_name,
+            result=investigation_text(check_result, language),
+        )
+
+        try:
+            await bot.send_message(telegram_id, text)
+        except Exception as e:
+            logger.warning("player_notify_failed", player_id=player_id, error=str(e))
@@ -0,0 +1,129 @@
+"""Night action reminders."""
+
+import asyncio
+from typing import List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError
+from sqlalchemy import Select, delete, exists, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.engine import Row
+
+from app.config import settings
+from app.keyboards.game import get_game_menu_keyboard
+from app.models.action import Action, ActionReminder
+from app.models.database import AsyncSessionLocal
+from app.models.game import Game, GameStatus
+from app.models.player import Player
+from app.models.role import PlayerRole, Role
+from app.utils.i18n import i18n
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def pending_reminders_query(after_role_id: int = 0, limit: int = settings.REMINDER_BATCH_SIZE) -> Select:
+    """Alive players with an actionable role who neither acted nor were reminded tonight.
+
+    One statement over all night games, paged by ``PlayerRole.id``.
+    """
+    return (
+        select(
+            PlayerRole.id.label("player_role_id"),
+            Game.day_number.label("game_night"),
+            Player.telegram_id,
+            Player.language,
+        )
+        .join(Game, Game.id == PlayerRole.game_id)
+        .join(Role, Role.id == PlayerRole.role_id)
+        .join(Player, Player.id == PlayerRole.player_id)
+        .where(Game.status == GameStatus.NIGHT)
+        .where(PlayerRole.is_alive == True)
+        .where(Player.notifications_enabled == True)
+        .where(or_(Role.can_kill, Role.can_heal, Role.can_investigate, Role.can_block))
+        .where(~exists().where(
+            Action.actor_role_id == PlayerRole.id,
+            Action.game_night == Game.day_number,
+        ))
+        .where(~exists().where(
+            ActionReminder.player_role_id == PlayerRole.id,
+            ActionReminder.game_night == Game.day_number,
+        ))
+        .where(PlayerRole.id > after_role_id)
+        .order_by(PlayerRole.id)
+        .limit(limit)
+    )
+
+
+async def _claim(rows: List[Row]) -> List[Row]:
+    """Record reminders before sending; rows claimed by a concurrent run are dropped."""
+    async with AsyncSessionLocal() as session:
+        claimed = await session.scalars(
+            pg_insert(ActionReminder)
+            .values([{"player_role_id": r.player_role_id, "game_night": r.game_night} for r in rows])
+            .on_conflict_do_nothing()
+            .returning(ActionReminder.player_role_id)
+        )
+        claimed_ids = set(claimed.all())
+        await session.commit()
+    return [r for r in rows if r.player_role_id in claimed_ids]
+
+
+async def _release(rows: List[Row]) -> None:
+    """Forget reminders that failed to send, so the next run retries them."""
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            delete(ActionReminder).where(
+                tuple_(ActionReminder.player_role_id, ActionReminder.game_night).in_(
+                    [(r.player_role_id, r.game_night) for r in rows]
+                )
+            )
+        )
+        await session.commit()
+
+
+async def send_action_reminders(bot: Optional[Bot], batch_size: int = settings.REMINDER_BATCH_SIZE) -> int:
+    """Remind players who have not used their night action; returns reminders sent."""
+    if bot is None:
+        logger.warning("action_reminders_without_bot")
+        return 0
+
+    semaphore = asyncio.Semaphore(settings.REMINDER_SEND_CONCURRENCY)
+    deadline = f"{settings.DAY_START_HOUR:02d}:00"
+
+    async def remind(row: Row) -> Optional[bool]:
+        """True if sent, False if it can be retried, None if it never will."""
+        async with semaphore:
+            try:
+                await bot.send_message(
+                    row.telegram_id,
+                    i18n.get("game.action_required", row.language, time=deadline),
+                    reply_markup=get_game_menu_keyboard("night", row.language),
+                )
+                return True
+            except TelegramForbiddenError:
+                # The player blocked the bot; keep the claim
+                return None
+            except Exception as e:
+                logger.warning("action_reminder_failed", player_role_id=row.player_role_id, error=str(e))
+                return False
+
+    sent = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(pending_reminders_query(last_id, batch_size))).all()
+        if not rows:
+            break
+        last_id = rows[-1].player_role_id
+
+        claimed = await _claim(rows)
+        results = await asyncio.gather(*(remind(row) for row in claimed))
+        sent += sum(1 for ok in results if ok)
+        failed = [row for row, ok in zip(claimed, results) if ok is False]
+        if failed:
+            await _release(failed)
+
+    if sent:
+        logger.info("action_reminders_sent", count=sent)
+    return sent
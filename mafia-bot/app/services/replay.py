@@ -0,0 +1,427 @@
+"""Deterministic game replay.
+
+Rebuilds a game's timeline from its seed, players, events and the
+``actions`` / ``votes`` log with the same rules the engine used, and
+checks the result against what is stored. Records are streamed phase by
+phase, so memory per game is bounded by its largest phase.
+
+Regression check of the archive: ``python -m app.services.replay [game_id ...]``.
+"""
+
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import noload, selectinload, sessionmaker
+
+from app.config import settings
+from app.models.action import Action
+from app.models.database import AsyncSessionLocal
+from app.models.event import Event
+from app.models.game import Game, GamePlayer, GameStatus
+from app.models.role import PlayerRole, Role, RoleType
+from app.models.vote import Vote
+from app.services.event_manager import Modifier
+from app.services.modifiers import GameModifiers, compile_modifiers, killer_group
+from app.services.night import NightAction, resolve_night
+from app.services.rules import Ballot, plan_roles, tally_votes, winner
+
+# Phases in timeline order: night N, then day N + 1. A phase is keyed by
+# (night number, NIGHT) or (day number - 1, DAY), so keys sort in order;
+# 2 * number + phase is its Game.phase_index.
+NIGHT = 0
+DAY = 1
+PhaseKey = Tuple[int, int]
+
+# Stored death causes of night kills and executions
+KILLED_NIGHT = "killed_night"
+EXECUTED = "executed"
+
+
+def phase_name(key: PhaseKey) -> str:
+    """Human-readable phase, e.g. ``night 2`` or ``day 3``."""
+    number, phase = key
+    return f"night {number}" if phase == NIGHT else f"day {number + 1}"
+
+
+def phase_index(key: PhaseKey) -> int:
+    """``Game.phase_index`` of a phase."""
+    return 2 * key[0] + key[1]
+
+
+def last_resolved_phase(status: GameStatus, day_number: int) -> Optional[PhaseKey]:
+    """Latest phase the engine has resolved for a game in ``status``."""
+    if status == GameStatus.ENDED:
+        # The game ends while resolving a night; no day follows
+        return (day_number, NIGHT)
+    if status == GameStatus.NIGHT:
+        return (day_number - 1, DAY) if day_number > 1 else None
+    if status in (GameStatus.DAY, GameStatus.VOTING):
+        return (day_number - 1, NIGHT) if day_number > 1 else None
+    return None
+
+
+@dataclass
+class TimelineEntry:
+    """What happened in one phase."""
+
+    key: PhaseKey
+    events: List[str] = field(default_factory=list)
+    killed: List[int] = field(default_factory=list)
+    saved: List[int] = field(default_factory=list)
+    blocked: List[int] = field(default_factory=list)
+    investigations: Dict[int, str] = field(default_factory=dict)
+    executed: Optional[int] = None
+    winner: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return phase_name(self.key)
+
+
+@dataclass
+class ReplayEvent:
+    """Event with the effects it had while active."""
+
+    event: Event
+    modifiers: List[Modifier]
+
+
+class Replay:
+    """Game state machine fed phase by phase.
+
+    ``roles`` maps player role ids to their roles; every role starts alive.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        roles: Mapping[int, Role],
+        events: Sequence[ReplayEvent] = (),
+        mayors: Iterable[int] = (),
+    ):
+        self.seed = seed
+        self.roles = dict(roles)
+        self.events = list(events)
+        self.mayors = set(mayors)
+        self.alive: Set[int] = set(self.roles)
+        self.death_causes: Dict[int, str] = {}
+        self.timeline: List[TimelineEntry] = []
+        self.winner: Optional[str] = None
+        self._shown_events: Set[int] = set()
+
+    def modifiers(self, key: PhaseKey) -> GameModifiers:
+        """Modifiers of events active during a phase."""
+        return compile_modifiers(
+            modifier
+            for item in self.events
+            if item.event.is_active_in(phase_index(key))
+            for modifier in item.modifiers
+        )
+
+    def _entry(self, key: PhaseKey) -> TimelineEntry:
+        # Events show up in the first phase they affected
+        started = [
+            item.event for item in self.events
+            if item.event.id not in self._shown_events and item.event.is_active_in(phase_index(key))
+        ]
+        self._shown_events.update(event.id for event in started)
+        entry = TimelineEntry(key=key, events=[event.event_type.value for event in started])
+        self.timeline.append(entry)
+        return entry
+
+    def night(self, number: int, actions: Iterable[Tuple[int, Optional[int], str]]) -> TimelineEntry:
+        """Resolve night ``number`` from ``(actor_role_id, target_role_id, action_type)`` in log order."""
+        entry = self._entry((number, NIGHT))
+        night_actions = []
+        for actor_id, target_id, action_type in actions:
+            # The engine only loads actions of alive actors against alive targets
+            if actor_id not in self.alive:
+                continue
+            actor = self.roles[actor_id]
+            target = self.roles.get(target_id) if target_id in self.alive else None
+            night_actions.append(NightAction(
+                actor_role_id=actor_id,
+                action_type=action_type,
+                priority=actor.action_priority,
+                killer_group=killer_group(actor.team, actor.name),
+                target_role_id=target_id if target is not None else None,
+                target_is_mafia=target is not None and target.role_type == RoleType.MAFIA,
+                target_role_key=target.name_key if target is not None else None,
+            ))
+
+        outcome = resolve_night(night_actions, self.modifiers(entry.key))
+        for role_id in outcome.killed:
+            self._kill(role_id, KILLED_NIGHT)
+        entry.killed = outcome.killed
+        entry.saved = outcome.saved
+        entry.blocked = sorted(outcome.blocked)
+        entry.investigations = outcome.investigations
+
+        alive_types = [self.roles[r].role_type for r in self.alive]
+        self.winner = entry.winner = winner(
+            alive_types.count(RoleType.MAFIA),
+            alive_types.count(RoleType.CIVILIAN),
+        )
+        return entry
+
+    def day(self, day_number: int, votes: Iterable[Tuple[int, int, int]]) -> TimelineEntry:
+        """Resolve the vote of ``day_number`` from ``(voter_role_id, target_role_id, weight)``."""
+        entry = self._entry((day_number - 1, DAY))
+        executed = tally_votes(
+            (Ballot(voter, target, weight, voter in self.mayors) for voter, target, weight in votes),
+            alive_count=len(self.alive),
+            seed=self.seed,
+            day_number=day_number,
+            modifiers=self.modifiers(entry.key),
+        )
+        if executed is not None and executed in self.roles:
+            self._kill(executed, EXECUTED)
+            entry.executed = executed
+        return entry
+
+    def _kill(self, role_id: int, cause: str) -> None:
+        self.alive.discard(role_id)
+        self.death_causes[role_id] = cause
+
+
+@dataclass
+class ReplayResult:
+    """Replayed game and its differences from the stored one."""
+
+    game_id: int
+    replay: Replay
+    mismatches: List[str] = field(default_factory=list)
+    complete: bool = True  # False when stopped before the game's current phase
+
+    @property
+    def ok(self) -> bool:
+        return not self.mismatches
+
+    @property
+    def timeline(self) -> List[TimelineEntry]:
+        return self.replay.timeline
+
+
+def log_query(game_id: int):
+    """A game's actions and votes as one stream in phase order."""
+    actions = select(
+        Action.game_night.label("number"),
+        literal(NIGHT).label("phase"),
+        Action.actor_role_id.label("actor_id"),
+        Action.target_role_id.label("target_id"),
+        Action.action_type.label("kind"),
+        literal(1).label("weight"),
+        Action.created_at.label("created_at"),
+        Action.id.label("record_id"),
+    ).where(Action.game_id == game_id)
+
+    votes = select(
+        (Vote.day_number - 1).label("number"),
+        literal(DAY).label("phase"),
+        Vote.voter_id,
+        Vote.target_id,
+        literal("vote"),
+        Vote.weight,
+        Vote.created_at,
+        Vote.id,
+    ).where(Vote.game_id == game_id).where(Vote.is_active == True)
+
+    log = union_all(actions, votes).subquery()
+    return select(log).order_by(log.c.number, log.c.phase, log.c.created_at, log.c.record_id)
+
+
+class GameReplay:
+    """Replay games stored in the database."""
+
+    def __init__(self, session: AsyncSession, yield_per: int = settings.REPLAY_YIELD_PER):
+        self.session = session
+        self.yield_per = yield_per
+
+    async def replay(self, game_id: int, until: Optional[PhaseKey] = None) -> ReplayResult:
+        """Replay a game up to ``until`` (inclusive) or its current phase.
+
+        A full replay is compared with the stored roles, deaths and winner;
+        a fast-forward only checks the role assignment.
+        """
+        # Columns only: loading Game would eager-load its whole action and vote log
+        game = (await self.session.execute(
+            select(Game.seed, Game.status, Game.day_number, Game.winner_faction).where(Game.id == game_id)
+        )).one_or_none()
+        if game is None:
+            raise ValueError(f"Game {game_id} not found")
+
+        # Roles' selectin relationships would load every game's player roles and actions
+        catalogue = (await self.session.scalars(select(Role).options(noload("*")).order_by(Role.id))).all()
+        roles_by_id = {role.id: role for role in catalogue}
+        stored = (await self.session.execute(
+            select(
+                PlayerRole.id,
+                PlayerRole.player_id,
+                PlayerRole.role_id,
+                PlayerRole.is_alive,
+                PlayerRole.death_cause,
+                PlayerRole.is_mayor,
+            )
+            .where(PlayerRole.game_id == game_id)
+            .order_by(PlayerRole.id)
+        )).all()
+        player_ids = (await self.session.scalars(
+            select(GamePlayer.player_id).where(GamePlayer.game_id == game_id)
+        )).all()
+        events = (await self.session.scalars(
+            select(Event)
+            .options(selectinload(Event.effects))
+            .where(Event.game_id == game_id)
+            .order_by(Event.id)
+        )).all()
+
+        replay = Replay(
+            seed=game.seed,
+            roles={row.id: roles_by_id[row.role_id] for row in stored},
+            events=[
+                ReplayEvent(event, [
+                    Modifier(event.id, event.event_type, effect.kind, effect.player_role_id, effect.data or {})
+                    for effect in event.effects
+                ])
+                for event in events
+            ],
+            mayors=[row.id for row in stored if row.is_mayor],
+        )
+        result = ReplayResult(game_id=game_id, replay=replay)
+        self._check_roles(result, stored, player_ids, [r for r in catalogue if not r.is_special])
+
+        last = last_resolved_phase(game.status, game.day_number)
+        if until is not None and (last is None or until < last):
+            last, result.complete = until, False
+        if last is not None:
+            await self._run(result, game_id, last)
+
+        if result.complete:
+            self._check_outcome(result, game, stored)
+        return result
+
+    async def _run(self, result: ReplayResult, game_id: int, last: PhaseKey) -> None:
+        replay = result.replay
+        key: PhaseKey = (1, NIGHT)
+        records: List = []
+
+        def resolve(phase_key: PhaseKey, rows: List) -> None:
+            number, phase = phase_key
+            if phase == NIGHT:
+                replay.night(number, ((r.actor_id, r.target_id, r.kind) for r in rows))
+            else:
+                replay.day(number + 1, ((r.actor_id, r.target_id, r.weight) for r in rows))
+
+        def advance(to: PhaseKey) -> PhaseKey:
+            """Resolve phases before ``to``; returns the first unresolved one."""
+            nonlocal key, records
+            while key < to and key <= last and replay.winner is None:
+                resolve(key, records)
+                records = []
+                key = (key[0], DAY) if key[1] == NIGHT else (key[0] + 1, NIGHT)
+            return key
+
+        stream = await self.session.stream(
+            log_query(game_id).execution_options(yield_per=self.yield_per)
+        )
+        try:
+            async for row in stream:
+                row_key = (row.number, row.phase)
+                if advance(row_key) > last or replay.winner is not None:
+                    break
+                if row_key == key:
+                    records.append(row)
+        finally:
+            await stream.close()
+
+        # Phases after the last record (e.g. a final night nobody acted in)
+        advance((last[0] + 1, last[1]))
+
+    def _check_roles(self, result: ReplayResult, stored, player_ids: Sequence[int], roles: Sequence[Role]) -> None:
+        # The stored mafia count, not today's balance table, decided the plan
+        mafia_ids = {role.id for role in roles if role.role_type == RoleType.MAFIA}
+        mafia_count = sum(1 for row in stored if row.role_id in mafia_ids) if mafia_ids else None
+        planned = {
+            player_id: role.id
+            for player_id, role in plan_roles(result.replay.seed, player_ids, roles, mafia_count=mafia_count)
+        }
+        actual = {row.player_id: row.role_id for row in stored}
+        for player_id in sorted(set(planned) | set(actual)):
+            if planned.get(player_id) != actual.get(player_id):
+                result.mismatches.append(
+                    f"player {player_id}: role {actual.get(player_id)} stored, {planned.get(player_id)} replayed"
+                )
+
+    def _check_outcome(self, result: ReplayResult, game: Row, stored) -> None:
+        replay = result.replay
+        for row in stored:
+            alive = row.id in replay.alive
+            if alive != row.is_alive:
+                result.mismatches.append(
+                    f"role {row.id}: {'alive' if row.is_alive else 'dead'} stored, "
+                    f"{'alive' if alive else 'dead'} replayed"
+                )
+            elif not alive and row.death_cause != replay.death_causes.get(row.id):
+                result.mismatches.append(
+                    f"role {row.id}: died of {row.death_cause} stored, {replay.death_causes.get(row.id)} replayed"
+                )
+
+        if game.status == GameStatus.ENDED and game.winner_faction != replay.winner:
+            result.mismatches.append(f"winner {game.winner_faction} stored, {replay.winner} replayed")
+
+
+async def replay_games(
+    status: GameStatus = GameStatus.ENDED,
+    batch_size: int = settings.REPLAY_BATCH_SIZE,
+    session_factory: sessionmaker = AsyncSessionLocal,
+) -> AsyncIterator[ReplayResult]:
+    """Replay every game in ``status``, one batch of ids and one session at a time."""
+    last_id = 0
+    while True:
+        async with session_factory() as session:
+            game_ids = (await session.scalars(
+                select(Game.id)
+                .where(Game.status == status)
+                .where(Game.id > last_id)
+                .order_by(Game.id)
+                .limit(batch_size)
+            )).all()
+            if not game_ids:
+                return
+            last_id = game_ids[-1]
+
+            for game_id in game_ids:
+                yield await GameReplay(session).replay(game_id)
+                # Keep the identity map from growing across the batch
+                session.expunge_all()
+
+
+async def main(game_ids: Sequence[int]) -> int:
+    """Replay given games, or all ended games; returns the number that diverged."""
+    diverged = 0
+
+    async def results() -> AsyncIterator[ReplayResult]:
+        if not game_ids:
+            async for result in replay_games():
+                yield result
+            return
+        async with AsyncSessionLocal() as session:
+            for game_id in game_ids:
+                yield await GameReplay(session).replay(game_id)
+
+    async for result in results():
+        if not result.ok:
+            diverged += 1
+            print(f"game {result.game_id}: " + "; ".join(result.mismatches))
+    print(f"{diverged} diverged")
+    return diverged
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+
+    sys.exit(1 if asyncio.run(main([int(arg) for arg in sys.argv[1:]])) else 0)
@@ -0,0 +1,89 @@
+"""Game rules as pure functions.
+
+Shared by the game engine and the replay engine, so a replayed game
+follows exactly the rules the live game did.
+"""
+
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from app.models.role import Role, RoleType
+from app.services.balance import default_mafia_count
+from app.services.modifiers import NO_MODIFIERS, GameModifiers
+from app.utils.rng import Stream, stream
+
+
+class Ballot(NamedTuple):
+    """Vote as counted by ``tally_votes``."""
+
+    voter_role_id: int
+    target_role_id: int
+    weight: int = 1
+    voter_is_mayor: bool = False
+
+
+def plan_roles(
+    seed: int,
+    player_ids: Sequence[int],
+    roles: Sequence[Role],
+    mafia_count: Optional[int] = None,
+) -> List[Tuple[int, Role]]:
+    """Choose ``(player_id, role)`` for every player.
+
+    ``roles`` are the non-special roles ordered by id. The same seed,
+    players, roles and mafia count always give the same plan, whatever
+    order players came in.
+    """
+    mafia_roles = [r for r in roles if r.role_type == RoleType.MAFIA]
+    civilian_roles = [r for r in roles if r.role_type == RoleType.CIVILIAN]
+
+    rng = stream(seed, Stream.ROLES)
+    players = sorted(player_ids)
+    rng.shuffle(players)
+
+    if mafia_count is None:
+        mafia_count = default_mafia_count(len(players))
+
+    plan = []
+    for i, player_id in enumerate(players):
+        pool = mafia_roles if i < mafia_count else civilian_roles
+        if pool:
+            plan.append((player_id, rng.choice(pool)))
+    return plan
+
+
+def tally_votes(
+    ballots: Iterable[Ballot],
+    alive_count: int,
+    seed: int,
+    day_number: int,
+    modifiers: GameModifiers = NO_MODIFIERS,
+) -> Optional[int]:
+    """Role executed by a day's votes, or None without a majority."""
+    vote_counts = {}
+    for ballot in ballots:
+        weight = modifiers.vote_weight(ballot.voter_role_id, ballot.voter_is_mayor, ballot.weight)
+        vote_counts[ballot.target_role_id] = vote_counts.get(ballot.target_role_id, 0) + weight
+
+    if not vote_counts:
+        return None
+
+    # Need majority to execute
+    max_votes = max(vote_counts.values())
+    if max_votes <= alive_count / 2:
+        return None
+
+    leaders = sorted(t for t, count in vote_counts.items() if count == max_votes)
+    return stream(seed, Stream.TIEBREAK, day_number).choice(leaders)
+
+
+def winner(alive_mafia: int, alive_civilians: int) -> Optional[str]:
+    """Winning faction, or None if the game continues."""
+    # Mafia wins if they equal or outnumber civilians
+    if alive_mafia >= alive_civilians:
+        return "mafia"
+
+    # Civilians win if no mafia left
+    if alive_mafia == 0:
+        return "town"
+
+    return None
@@ -1,105 +1,244 @@
 """Task scheduler for game phases."""
 
+import asyncio
 from datetime import datetime
+from typing import List, Optional, Tuple
 
+from aiogram import Bot
+from apscheduler.events import EVENT_SCHEDULER_START, SchedulerEvent
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.schedulers.base import STATE_STOPPED
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import settings
 from app.models.database import AsyncSessionLocal
 from app.models.game import Game, GameStatus
 from app.services.game_engine import GameEngine
+from app.services.notifications import notify_investigations
+from app.services.reminders import send_action_reminders
+from app.utils.clock import Clock, Job, VirtualClock, get_clock
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Job store for jobs that must survive restarts
+PERSISTENT_JOBSTORE = "persistent"
+
+
+def create_scheduler(persist: bool = settings.SCHEDULER_PERSIST_JOBS) -> AsyncIOScheduler:
+    """Create the application scheduler.
+
+    Jobs go to the in-memory ``default`` store unless added with
+    ``jobstore=PERSISTENT_JOBSTORE``; that store keeps them in the database
+    so a job missed while the bot was down still runs on startup (once,
+    if within ``SCHEDULER_MISFIRE_GRACE``).
+    """
+    if persist:
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+        persistent = SQLAlchemyJobStore(url=settings.scheduler_jobstore_url)
+    else:
+        persistent = MemoryJobStore()
+
+    return AsyncIOScheduler(
+        timezone="UTC",
+        jobstores={"default": MemoryJobStore(), PERSISTENT_JOBSTORE: persistent},
+        job_defaults={
+            "coalesce": True,
+            "misfire_grace_time": settings.SCHEDULER_MISFIRE_GRACE,
+            "max_instances": 1,
+        },
+    )
+
+
+# Scheduler whose jobs run_phase_job dispatches to
+_active: Optional["GameScheduler"] = None
+
+
+async def run_phase_job(job_id: str) -> None:
+    """Run a phase job of the started scheduler.
+
+    Persistent job stores save a textual reference to the job function, so
+    they store this function and the job id instead of a bound method.
+    """
+    if _active is None:
+        logger.warning("phase_job_without_scheduler", job_id=job_id)
+        return
+    func, _ = dict(_active.jobs())[job_id]
+    await func()
 
 
 class GameScheduler:
     """Scheduler for game phase transitions."""
-    
-    def __init__(self):
-        self.scheduler = AsyncIOScheduler()
-    
+
+    def __init__(
+        self,
+        scheduler: Optional[AsyncIOScheduler] = None,
+        clock: Optional[Clock] = None,
+        bot: Optional[Bot] = None,
+    ):
+        self.scheduler = scheduler
+        self.clock = clock or get_clock()
+        self.bot = bot
+
+    def jobs(self) -> List[Tuple[str, Job]]:
+        """Get ``(id, (job, trigger))`` for every phase job."""
+        return [
+            # Night end (day start)
+            ("end_nights", (self.end_all_nights, CronTrigger(hour=settings.DAY_START_HOUR, minute=0))),
+            # Voting end
+            ("end_voting", (self.end_all_voting, CronTrigger(hour=23, minute=settings.VOTE_END_MINUTE))),
+            # Action reminders; later runs in the hour retry failed sends
+            ("action_reminders", (
+                self.send_action_reminders,
+                CronTrigger(hour=settings.NIGHT_START_HOUR + 6, minute="*/15"),
+            )),
+        ]
+
+    def add_jobs(self) -> None:
+        """Register phase jobs in the persistent job store.
+
+        Job stores can only be read once the scheduler has started, so on a
+        stopped scheduler the jobs are added when it starts.
+        """
+        global _active
+        if self.scheduler is None:
+            self.scheduler = create_scheduler()
+        _active = self
+
+        if self.scheduler.state == STATE_STOPPED:
+            self.scheduler.add_listener(self._add_jobs_on_start, EVENT_SCHEDULER_START)
+        else:
+            self._add_jobs()
+
+    def _add_jobs_on_start(self, event: SchedulerEvent) -> None:
+        self.scheduler.remove_listener(self._add_jobs_on_start)
+        self._add_jobs()
+
+    def _add_jobs(self) -> None:
+        for job_id, (_, trigger) in self.jobs():
+            # Re-adding a stored job recomputes its next run from now and
+            # loses a run missed while the bot was down; keep it unless the
+            # schedule changed
+            stored = self.scheduler.get_job(job_id, jobstore=PERSISTENT_JOBSTORE)
+            if stored is not None and repr(stored.trigger) == repr(trigger):
+                continue
+
+            self.scheduler.add_job(
+                run_phase_job,
+                trigger,
+                args=[job_id],
+                id=job_id,
+                jobstore=PERSISTENT_JOBSTORE,
+                replace_existing=True,
+            )
+
     def start(self) -> None:
         """Start the scheduler."""
-        # Schedule night end (day start)
-        self.scheduler.add_job(
-            self.end_all_nights,
-            CronTrigger(hour=settings.DAY_START_HOUR, minute=0),
-            id="end_nights",
-            replace_existing=True,
-        )
-        
-        # Schedule voting end
-        self.scheduler.add_job(
-            self.end_all_voting,
-            CronTrigger(hour=23, minute=settings.VOTE_END_MINUTE),
-            id="end_voting",
-            replace_existing=True,
-        )
-        
-        # Schedule action reminders
-        self.scheduler.add_job(
-            self.send_action_reminders,
-            CronTrigger(hour=settings.NIGHT_START_HOUR + 6, minute=0),
-            id="action_reminders",
-            replace_existing=True,
-        )
-        
+        self.add_jobs()
         self.scheduler.start()
-        print("Scheduler started")
-    
+        logger.info("scheduler_started")
+
+    async def run_virtual(self, until: datetime) -> int:
+        """Run phase jobs on a ``VirtualClock`` until ``until``; returns job runs."""
+        if not isinstance(self.clock, VirtualClock):
+            raise TypeError("run_virtual needs a VirtualClock")
+        return await self.clock.run_jobs([job for _, job in self.jobs()], until)
+
     def shutdown(self) -> None:
         """Shutdown the scheduler."""
         self.scheduler.shutdown()
-    
+
     async def end_all_nights(self) -> None:
         """End night phase for all active games."""
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(Game).where(Game.status == GameStatus.NIGHT)
-            )
-            games = result.scalars().all()
-            
-            engine = GameEngine(session)
-            
-            for game in games:
-                try:
-                    await engine.end_night(game)
-                    print(f"Ended night for game {game.id}")
-                except Exception as e:
-                    print(f"Error ending night for game {game.id}: {e}")
-    
+        await self._advance_all(GameStatus.NIGHT)
+
     async def end_all_voting(self) -> None:
         """End voting phase for all active games."""
-        async with AsyncSessionLocal() as session:
-            result = await session.execute(
-                select(Game).where(Game.status == GameStatus.VOTING)
+        await self._advance_all(GameStatus.VOTING)
+
+    async def catch_up(self) -> int:
+        """Advance games whose phase ended while the bot was down.
+
+        Run on startup so a restart across a transition does not leave games
+        waiting for the next day's job. Returns number of games advanced.
+        """
+        advanced = 0
+        for status in (GameStatus.NIGHT, GameStatus.VOTING):
+            advanced += await self._advance_all(status, overdue_only=True)
+
+        if advanced:
+            logger.info("phase_catch_up", games=advanced)
+        return advanced
+
+    async def _advance_all(self, status: GameStatus, overdue_only: bool = False) -> int:
+        """Advance games in ``status`` batch by batch with bounded concurrency."""
+        semaphore = asyncio.Semaphore(settings.SCHEDULER_CONCURRENCY)
+        advanced = 0
+        last_id = 0
+
+        while True:
+            query = (
+                select(Game.id)
+                .where(Game.status == status)
+                .where(Game.id > last_id)
+                .order_by(Game.id)
+                .limit(settings.SCHEDULER_BATCH_SIZE)
             )
-            games = result.scalars().all()
-            
-            engine = GameEngine(session)
-            
-            for game in games:
+            if overdue_only:
+                query = query.where(Game.phase_end_time <= self.clock.now())
+
+            async with AsyncSessionLocal() as session:
+                game_ids = (await session.scalars(query)).all()
+            if not game_ids:
+                return advanced
+            last_id = game_ids[-1]
+
+            results = await asyncio.gather(
+                *(self._advance_game(game_id, status, semaphore) for game_id in game_ids)
+            )
+            advanced += sum(results)
+
+    async def _advance_game(self, game_id: int, status: GameStatus, semaphore: asyncio.Semaphore) -> bool:
+        """Advance one game if it is still in ``status`` and not locked by another run."""
+        async with semaphore, AsyncSessionLocal() as session:
+            game = await session.scalar(
+                select(Game)
+                .where(Game.id == game_id)
+                .where(Game.status == status)
+                .with_for_update(skip_locked=True)
+            )
+            if game is None:
+                return False
+
+            engine = GameEngine(session, self.clock)
+            night = game.day_number
+            try:
+                if status == GameStatus.NIGHT:
+                    await engine.end_night(game)
+                    logger.info("night_ended", game_id=game_id)
+                else:
+                    await engine.process_votes(game)
+                    # Start new night whether or not someone was executed
+                    await engine.start_night(game)
+                    logger.info("voting_ended", game_id=game_id)
+            except Exception:
+                await session.rollback()
+                logger.exception("phase_end_failed", game_id=game_id, status=status.value)
+                return False
+
+            if status == GameStatus.NIGHT and self.bot is not None:
                 try:
-                    executed = await engine.process_votes(game)
-                    
-                    # Notify players about execution
-                    if executed:
-                        # Start new night
-                        await engine.start_night(game)
-                    else:
-                        # No execution, start new night
-                        await engine.start_night(game)
-                    
-                    print(f"Ended voting for game {game.id}")
-                except Exception as e:
-                    print(f"Error ending voting for game {game.id}: {e}")
-    
+                    await notify_investigations(self.bot, session, game_id, night)
+                except Exception:
+                    logger.exception("investigation_notify_failed", game_id=game_id)
+
+            return True
+
     async def send_action_reminders(self) -> None:
         """Send reminders to players who haven't acted."""
-        # This would require bot instance to send messages
-        # Implementation depends on how bot is structured
-        pass
+        await send_action_reminders(self.bot)
 
 
 # Global scheduler instance
@@ -0,0 +1,188 @@
+"""Typed callback data with a precompiled dispatch table.
+
+Callback data strings look like ``city:view:42``: a static prefix that may
+itself contain separators (``admin:event:city``) followed by one segment per
+field. Every schema is registered under ``(prefix, field count)``; parsing
+tries the longest prefix first, so ``admin:event:city:42`` can never be
+taken for ``admin:event:{type}``.
+"""
+
+from typing import Any, ClassVar, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from aiogram import Router
+from aiogram.dispatcher.event.bases import UNHANDLED, SkipHandler
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.dispatcher.event.telegram import TelegramEventObserver
+from aiogram.filters import Filter
+from aiogram.types import CallbackQuery, TelegramObject
+from magic_filter import MagicFilter
+from pydantic import BaseModel, ValidationError
+
+SEPARATOR = ":"
+MAX_CALLBACK_LENGTH = 64
+
+T = TypeVar("T", bound="CallbackSchema")
+
+# (prefix, number of fields) -> schema
+_schemas: Dict[Tuple[str, int], Type["CallbackSchema"]] = {}
+
+
+class CallbackSchema(BaseModel):
+    """Base class for typed callback data.
+
+    Example:
+        class CityViewCallback(CallbackSchema, prefix="city:view"):
+            id: int
+
+        CityViewCallback(id=42).pack()  # "city:view:42"
+    """
+
+    __prefix__: ClassVar[str]
+
+    def __init_subclass__(cls, prefix: Optional[str] = None, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if prefix is None:
+            raise TypeError(f"{cls.__name__} requires a prefix")
+        cls.__prefix__ = prefix
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, prefix: Optional[str] = None, **kwargs: Any) -> None:
+        # Fields are known only once pydantic has built the model
+        super().__pydantic_init_subclass__(**kwargs)
+        key = (cls.__prefix__, len(cls.model_fields))
+        if key in _schemas:
+            raise ValueError(f"Callback schema {key} already registered by {_schemas[key].__name__}")
+        _schemas[key] = cls
+
+    def pack(self) -> str:
+        """Build callback data string."""
+        parts = [self.__prefix__]
+        for name, value in self.model_dump(mode="json").items():
+            encoded = "" if value is None else str(int(value) if isinstance(value, bool) else value)
+            if SEPARATOR in encoded:
+                raise ValueError(f"Separator can not be used in {name}={encoded!r}")
+            parts.append(encoded)
+
+        data = SEPARATOR.join(parts)
+        if len(data.encode()) > MAX_CALLBACK_LENGTH:
+            raise ValueError(f"Callback data {data!r} is too long")
+        return data
+
+    @classmethod
+    def unpack(cls: Type[T], data: str) -> T:
+        """Parse callback data string of this schema."""
+        parsed = parse_callback(data)
+        if not isinstance(parsed, cls):
+            raise ValueError(f"{data!r} is not {cls.__name__}")
+        return parsed
+
+    @classmethod
+    def filter(cls, rule: Optional[MagicFilter] = None) -> "CallbackSchemaFilter":
+        """Get filter matching this schema, optionally with a magic rule on its fields."""
+        return CallbackSchemaFilter(cls, rule)
+
+
+def parse_callback(data: Optional[str]) -> Optional[CallbackSchema]:
+    """Parse callback data into its schema instance, or None if unknown."""
+    if not data:
+        return None
+
+    parts = data.split(SEPARATOR)
+    for size in range(len(parts), 0, -1):
+        schema = _schemas.get((SEPARATOR.join(parts[:size]), len(parts) - size))
+        if schema is None:
+            continue
+        values = [None if v == "" else v for v in parts[size:]]
+        try:
+            return schema(**dict(zip(schema.model_fields, values)))
+        except ValidationError:
+            return None
+
+    return None
+
+
+def registered_schemas() -> Iterable[Type[CallbackSchema]]:
+    """Get all registered schemas."""
+    return _schemas.values()
+
+
+class CallbackSchemaFilter(Filter):
+    """Match callback queries of a schema and inject it as ``callback_data``."""
+
+    __slots__ = ("schema", "rule")
+
+    def __init__(self, schema: Type[CallbackSchema], rule: Optional[MagicFilter] = None):
+        self.schema = schema
+        self.rule = rule
+
+    def __str__(self) -> str:
+        return self._signature_to_string(schema=self.schema.__name__, rule=self.rule)
+
+    async def __call__(self, query: CallbackQuery, callback_data: Any = None) -> Any:
+        if callback_data is None and isinstance(query, CallbackQuery):
+            callback_data = parse_callback(query.data)
+        if not isinstance(callback_data, self.schema):
+            return False
+        if self.rule is not None and not self.rule.resolve(callback_data):
+            return False
+        return {"callback_data": callback_data}
+
+
+class IndexedCallbackObserver(TelegramEventObserver):
+    """Callback query observer that dispatches by schema with a dict lookup.
+
+    Handlers registered with a ``CallbackSchemaFilter`` are indexed by their
+    schema; only that bucket is checked for a parsed callback. Handlers
+    without a schema filter are checked afterwards in registration order.
+    """
+
+    def __init__(self, router: Router, event_name: str = "callback_query") -> None:
+        super().__init__(router=router, event_name=event_name)
+        self._index: Dict[Type[CallbackSchema], List[HandlerObject]] = {}
+        self._unindexed: List[HandlerObject] = []
+
+    def register(self, callback: Any, *filters: Any, flags: Optional[Dict[str, Any]] = None, **kwargs: Any) -> Any:
+        result = super().register(callback, *filters, flags=flags, **kwargs)
+        handler = self.handlers[-1]
+
+        schema = next(
+            (f.schema for f in filters if isinstance(f, CallbackSchemaFilter)),
+            None,
+        )
+        if schema is None:
+            self._unindexed.append(handler)
+        else:
+            self._index.setdefault(schema, []).append(handler)
+
+        return result
+
+    async def trigger(self, event: TelegramObject, **kwargs: Any) -> Any:
+        callback_data = kwargs.get("callback_data")
+        if callback_data is None and isinstance(event, CallbackQuery):
+            callback_data = kwargs["callback_data"] = parse_callback(event.data)
+
+        candidates = self._index.get(type(callback_data), [])
+        for handler in (*candidates, *self._unindexed):
+            kwargs["handler"] = handler
+            result, data = await handler.check(event, **kwargs)
+            if result:
+                kwargs.update(data)
+                try:
+                    wrapped_inner = self.outer_middleware.wrap_middlewares(
+                        self._resolve_middlewares(),
+                        handler.call,
+                    )
+                    return await wrapped_inner(event, kwargs)
+                except SkipHandler:
+                    continue
+
+        return UNHANDLED
+
+
+class CallbackRouter(Router):
+    """Router whose callback queries are dispatched through a schema index."""
+
+    def __init__(self, *, name: Optional[str] = None) -> None:
+        super().__init__(name=name)
+        self.callback_query = IndexedCallbackObserver(router=self)
+        self.observers["callback_query"] = self.callback_query
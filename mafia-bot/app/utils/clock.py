@@ -0,0 +1,151 @@
+"""Injectable clock.
+
+Game code reads time through the current clock instead of ``datetime``
+directly, so a simulation can install a ``VirtualClock`` and run weeks of
+game phases without waiting for them.
+
+Times are naive UTC (like ``datetime.utcnow()``) unless noted otherwise.
+"""
+
+import asyncio
+import heapq
+import itertools
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, Tuple
+
+Job = Tuple[Callable[[], Awaitable[Any]], Any]  # (coroutine function, APScheduler trigger)
+
+
+class Clock:
+    """Source of the current time."""
+
+    def utcnow(self) -> datetime:
+        """Current naive UTC time."""
+        raise NotImplementedError
+
+    def now(self) -> datetime:
+        """Current timezone-aware UTC time."""
+        return self.utcnow().replace(tzinfo=timezone.utc)
+
+    def time(self) -> float:
+        """Current time as a Unix timestamp."""
+        return self.now().timestamp()
+
+    async def sleep(self, seconds: float) -> None:
+        """Wait for ``seconds`` of this clock's time."""
+        raise NotImplementedError
+
+
+class SystemClock(Clock):
+    """Wall clock."""
+
+    def utcnow(self) -> datetime:
+        return datetime.utcnow()
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+
+class VirtualClock(Clock):
+    """Clock that only moves when advanced.
+
+    Sleepers are woken in deadline order as time is advanced;
+    ``advance_to_next`` jumps straight to the earliest deadline.
+    """
+
+    def __init__(self, start: Optional[datetime] = None):
+        start = start or datetime(2024, 1, 1)
+        self._now = start.astimezone(timezone.utc).replace(tzinfo=None) if start.tzinfo else start
+        self._sleepers: List[Tuple[datetime, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def utcnow(self) -> datetime:
+        return self._now
+
+    async def sleep(self, seconds: float) -> None:
+        if seconds <= 0:
+            await asyncio.sleep(0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self._now + timedelta(seconds=seconds), next(self._seq), future))
+        await future
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Earliest time a sleeper is waiting for."""
+        while self._sleepers and self._sleepers[0][2].done():
+            heapq.heappop(self._sleepers)  # cancelled sleeper
+        return self._sleepers[0][0] if self._sleepers else None
+
+    async def advance_to(self, when: datetime) -> None:
+        """Move time forward to ``when`` and let due sleepers run."""
+        if when < self._now:
+            raise ValueError(f"Can not move virtual clock back from {self._now} to {when}")
+
+        while self._sleepers and self._sleepers[0][0] <= when:
+            deadline, _, future = heapq.heappop(self._sleepers)
+            self._now = deadline
+            if not future.done():
+                future.set_result(None)
+                await asyncio.sleep(0)
+        self._now = when
+
+    async def advance(self, seconds: float) -> None:
+        """Move time forward by ``seconds``."""
+        await self.advance_to(self._now + timedelta(seconds=seconds))
+
+    async def advance_to_next(self) -> bool:
+        """Jump to the earliest sleeper's deadline; False if nobody sleeps."""
+        deadline = self.next_deadline()
+        if deadline is None:
+            return False
+        await self.advance_to(deadline)
+        return True
+
+    async def run_jobs(self, jobs: Sequence[Job], until: datetime) -> int:
+        """Fire scheduler jobs in virtual time until ``until``.
+
+        Triggers are APScheduler triggers; each job is awaited before time
+        moves on, so a job firing takes no virtual time. Returns the number
+        of job runs.
+        """
+        now = self.now()
+        end = until.replace(tzinfo=timezone.utc) if until.tzinfo is None else until
+        fire_times = [trigger.get_next_fire_time(None, now) for _, trigger in jobs]
+        runs = 0
+
+        while True:
+            pending = [(t, i) for i, t in enumerate(fire_times) if t is not None and t <= end]
+            if not pending:
+                break
+            fire_time, index = min(pending)
+            await self.advance_to(fire_time.astimezone(timezone.utc).replace(tzinfo=None))
+
+            func, trigger = jobs[index]
+            await func()
+            runs += 1
+            fire_times[index] = trigger.get_next_fire_time(fire_time, fire_time + timedelta(microseconds=1))
+
+        end_naive = end.astimezone(timezone.utc).replace(tzinfo=None)
+        if end_naive > self._now:
+            await self.advance_to(end_naive)
+        return runs
+
+
+_clock: Clock = SystemClock()
+
+
+def get_clock() -> Clock:
+    """Get the current clock."""
+    return _clock
+
+
+def set_clock(clock: Clock) -> Clock:
+    """Install ``clock`` for the whole process; returns the previous one."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+def utcnow() -> datetime:
+    """Current naive UTC time of the current clock (usable as a column default)."""
+    return _clock.utcnow()
@@ -5,6 +5,9 @@ from pathlib import Path
 from typing import Any, Dict, Optional
 
 from app.config import LOCALES_DIR, settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class I18n:
@@ -26,8 +29,8 @@ class I18n:
             try:
                 with open(lang_file, "r", encoding="utf-8") as f:
                     self._translations[lang_code] = json.load(f)
-            except Exception as e:
-                print(f"Error loading translation {lang_code}: {e}")
+            except Exception:
+                logger.exception("translation_load_failed", lang=lang_code)
     
     def get(self, key: str, lang: Optional[str] = None, **kwargs) -> str:
         """Get translated string by key.
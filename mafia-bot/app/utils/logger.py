@@ -1,20 +1,129 @@
 # app/utils/logger.py
 
+import atexit
 import logging
+import queue
+import random
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Optional
 
-def get_logger(name: str) -> logging.Logger:
-    """Создаёт настроенный логгер."""
-    logger = logging.getLogger(name)
-    
-    # Избегаем дублирования хендлеров
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-        logger.setLevel(logging.INFO)
-    
-    return logger
+import structlog
+
+from app.config import settings
+
+_listener: Optional[QueueListener] = None
+
+
+def sample_debug(logger: Any, method_name: str, event_dict: dict) -> dict:
+    """Пропускает только долю debug-событий (LOG_DEBUG_SAMPLE_RATE)."""
+    if method_name == "debug" or event_dict.get("level") == "debug":
+        if random.random() >= settings.LOG_DEBUG_SAMPLE_RATE:
+            raise structlog.DropEvent
+    return event_dict
+
+
+class _PreparedQueueHandler(QueueHandler):
+    """QueueHandler, который рендерит запись в вызывающем потоке.
+
+    Контекст апдейта хранится в contextvars, поэтому форматирование
+    (включая merge_contextvars) должно произойти до передачи записи
+    в фоновый поток; в фоне выполняется только запись в поток вывода.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.enqueue(self.prepare(record))
+        except structlog.DropEvent:
+            pass
+        except Exception:
+            self.handleError(record)
+
+
+def setup_logging(
+    level: Optional[str] = None,
+    json_output: Optional[bool] = None,
+) -> QueueListener:
+    """Настраивает structlog поверх stdlib logging с фоновой записью.
+
+    Все логгеры (наши, aiogram, apscheduler, sqlalchemy) пишут в очередь,
+    а QueueListener в отдельном потоке выводит готовые строки в stdout,
+    так что медленный вывод не блокирует event loop.
+    """
+    global _listener
+
+    level = level or settings.LOG_LEVEL
+    json_output = settings.LOG_JSON if json_output is None else json_output
+
+    shared_processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.stdlib.add_log_level,
+        sample_debug,
+        structlog.stdlib.add_logger_name,
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+    ]
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            *shared_processors,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+    renderer = (
+        structlog.processors.JSONRenderer()
+        if json_output
+        else structlog.dev.ConsoleRenderer(colors=False)
+    )
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors,
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.format_exc_info,
+            renderer,
+        ],
+    )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _PreparedQueueHandler(log_queue)
+    queue_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    root = logging.getLogger()
+    root.handlers[:] = [queue_handler]
+    root.setLevel(level)
+
+    if _listener is not None:
+        _listener.stop()
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+    return _listener
+
+
+def shutdown_logging() -> None:
+    """Дописывает очередь логов и останавливает фоновый поток."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def bind_log_context(**values: Any) -> None:
+    """Добавляет поля (например, game_id) в контекст логов текущего апдейта."""
+    structlog.contextvars.bind_contextvars(**values)
+
+
+def get_logger(name: str) -> structlog.stdlib.BoundLogger:
+    """Создаёт структурированный логгер."""
+    return structlog.stdlib.get_logger(name)
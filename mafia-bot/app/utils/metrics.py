@@ -0,0 +1,330 @@
+"""In-process metrics registry with Prometheus text exposition.
+
+Metrics are updated from the event loop thread only, so no locking is done;
+each update is a dict lookup and an integer/float addition.
+"""
+
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, values: Sequence[str]) -> LabelValues:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        return tuple(str(v) for v in values)
+
+    def samples(self) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increment counter for label values."""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, *labels: str) -> float:
+        """Get current value for label values."""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterable[str]:
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, or is read from a callback at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set gauge for label values."""
+        self._values[self._key(labels)] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Increment gauge for label values."""
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        """Decrement gauge for label values."""
+        self.inc(*labels, amount=-amount)
+
+    def get(self, *labels: str) -> float:
+        """Get current value for label values."""
+        if self.callback is not None:
+            return self.callback()
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterable[str]:
+        if self.callback is not None:
+            yield f"{self.name} {self.callback()}"
+            return
+        for key, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value}"
+
+
+class Histogram(_Metric):
+    """Bucketed distribution of observed values."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record an observation for label values."""
+        key = self._key(labels)
+        state = self._values.get(key)
+        if state is None:
+            state = self._values[key] = [0] * (len(self.buckets) + 2)
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def count(self, *labels: str) -> int:
+        """Get number of observations for label values."""
+        state = self._values.get(self._key(labels))
+        return int(sum(state[:-1])) if state else 0
+
+    def samples(self) -> Iterable[str]:
+        for key, state in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                labels = _format_labels(self.labelnames, key, f'le="{le}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {state[-1]}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Add metric to the registry."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Create and register a counter."""
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        """Create and register a gauge."""
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+# Dispatcher
+UPDATES = registry.counter(
+    "mafia_updates_total", "Updates received by type", ["type"]
+)
+HANDLER_LATENCY = registry.histogram(
+    "mafia_handler_seconds", "Handler latency including inner middlewares", ["router", "handler"]
+)
+HANDLER_ERRORS = registry.counter(
+    "mafia_handler_errors_total", "Handlers that raised", ["router", "handler"]
+)
+MIDDLEWARE_LATENCY = registry.histogram(
+    "mafia_middleware_seconds",
+    "Time spent in middleware excluding downstream handlers",
+    ["middleware"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+# Update lanes
+UPDATES_QUEUED = registry.gauge(
+    "mafia_updates_queued", "Updates waiting for their lane or a concurrency slot"
+)
+UPDATES_IN_FLIGHT = registry.gauge(
+    "mafia_updates_in_flight", "Updates being handled"
+)
+LANES_ACTIVE = registry.gauge(
+    "mafia_update_lanes", "Users with queued or running updates"
+)
+LANE_WAIT = registry.histogram(
+    "mafia_update_lane_wait_seconds", "Time from receiving an update until its handling starts"
+)
+LANE_DROPPED = registry.counter(
+    "mafia_updates_dropped_total", "Updates dropped because the user's lane was full"
+)
+
+# Background tasks
+BACKGROUND_TASKS = registry.gauge(
+    "mafia_background_tasks", "Background tasks currently running"
+)
+BACKGROUND_ERRORS = registry.counter(
+    "mafia_background_task_errors_total", "Background tasks that raised", ["task"]
+)
+
+# Database
+DB_POOL_CHECKOUTS = registry.counter(
+    "mafia_db_pool_checkouts_total", "Connections checked out of the pool"
+)
+DB_SESSIONS = registry.counter(
+    "mafia_db_sessions_total", "Updates by whether the handler used the database", ["handler", "used"]
+)
+DB_ROUTED = registry.counter(
+    "mafia_db_routed_total", "Update sessions by database target", ["target"]
+)
+DB_REPLICA_LAG = registry.gauge(
+    "mafia_db_replica_lag_seconds", "Last measured replica replay lag"
+)
+DB_POOL_WAIT = registry.histogram(
+    "mafia_db_pool_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+# Scheduler
+SCHEDULER_JOB_LATENCY = registry.histogram(
+    "mafia_scheduler_job_seconds", "Scheduled job and phase transition durations", ["job"]
+)
+SCHEDULER_LEADER = registry.gauge(
+    "mafia_scheduler_leader", "1 while this instance runs cluster-wide scheduled jobs", ["instance"]
+)
+SCHEDULER_LEADER_CHANGES = registry.counter(
+    "mafia_scheduler_leader_changes_total", "Leadership gained or lost by this instance", ["event"]
+)
+
+# Outbound Bot API traffic
+OUTBOUND_LATENCY = registry.histogram(
+    "mafia_outbound_seconds", "Bot API request latency", ["method"]
+)
+EDITS_SUPPRESSED = registry.counter(
+    "mafia_edits_suppressed_total", "Message edits not sent to the Bot API", ["reason"]
+)
+OUTBOUND_RETRY_AFTER = registry.counter(
+    "mafia_outbound_retry_after_total", "Bot API requests rejected with 429", ["method"]
+)
+
+
+def timed(histogram: Histogram, *labels: str):
+    """Decorate a coroutine function to observe its duration."""
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started, *labels)
+
+        return wrapper
+
+    return decorator
+
+
+async def _metrics_view(request: web.Request) -> web.Response:
+    return web.Response(
+        text=request.app["registry"].render(),
+        content_type="text/plain",
+        charset="utf-8",
+        headers={"X-Content-Type-Options": "nosniff"},
+    )
+
+
+async def start_metrics_server(host: str, port: int, metrics: Registry = registry) -> web.AppRunner:
+    """Serve ``/metrics`` on a local HTTP endpoint."""
+    app = web.Application()
+    app["registry"] = metrics
+    app.router.add_get("/metrics", _metrics_view)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
@@ -0,0 +1,39 @@
+"""Seeded random streams.
+
+Every game carries a seed; each kind of decision draws from its own
+stream derived from that seed, so a game can be replayed or simulated
+exactly and games never share a generator between workers.
+
+Streams are keyed by name and, where a decision repeats, by the day it
+belongs to: a phase job can rebuild the stream it needs without knowing
+how many numbers earlier phases drew.
+"""
+
+import hashlib
+import random
+import secrets
+from typing import Union
+
+
+class Stream:
+    """Stream name constants."""
+    ROLES = "roles"          # Role assignment
+    EVENTS = "events"        # Whether and which random event happens
+    EFFECTS = "effects"      # Targets of event effects
+    TIEBREAK = "tiebreak"    # Ties in votes
+
+
+def new_seed() -> int:
+    """Random seed for a new game (fits a signed BIGINT)."""
+    return secrets.randbits(63)
+
+
+def derive_seed(seed: int, *key: Union[int, str]) -> int:
+    """Seed of the stream ``key`` of ``seed``; unrelated keys give unrelated seeds."""
+    digest = hashlib.blake2b(repr((seed, *key)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def stream(seed: int, name: str, *key: Union[int, str]) -> random.Random:
+    """Independent generator for stream ``name`` (and ``key``) of a game seed."""
+    return random.Random(derive_seed(seed, name, *key))
@@ -0,0 +1,90 @@
+"""Per-update SQL statement counting and N+1 detection."""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Placeholder lists produced by expanding IN parameters: ($1, $2, ...), (?, ?), ...
+_PARAM_LIST = re.compile(r"\(\s*(?:\$\d+|\?|%\(\w+\)s)(?:\s*,\s*(?:\$\d+|\?|%\(\w+\)s))*\s*\)")
+_PARAM = re.compile(r"\$\d+|%\(\w+\)s")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize SQL so that statements differing only in parameters match."""
+    shape = _PARAM_LIST.sub("(?)", statement)
+    shape = _PARAM.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class QueryStats:
+    """SQL statements issued while handling one update."""
+
+    handler: str = "unknown"
+    count: int = 0
+    total_time: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        """Record one executed statement."""
+        self.count += 1
+        self.total_time += elapsed
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Get statement shapes executed at least ``threshold`` times (N+1 suspects)."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("sql_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info["query_start_time"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def install_query_counter(engine: Union[Engine, AsyncEngine]) -> None:
+    """Hook statement counting into engine events."""
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(handler: str = "unknown") -> Iterator[QueryStats]:
+    """Count statements executed inside the block.
+
+    Example:
+        with track_queries("show_profile") as stats:
+            await show_profile(...)
+        assert stats.count <= 2
+    """
+    stats = QueryStats(handler=handler)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Get stats of the update being handled, if tracked."""
+    return _current_stats.get()
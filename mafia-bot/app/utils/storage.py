@@ -0,0 +1,42 @@
+"""FSM storage factory."""
+
+import json
+from typing import Any
+
+from aiogram.fsm.storage.base import BaseStorage
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.config import settings
+from app.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def compact_dumps(data: Any) -> str:
+    """Serialize state data without whitespace or escaped non-ASCII text."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def create_fsm_storage() -> BaseStorage:
+    """Create Redis FSM storage if REDIS_URL is set, otherwise in-memory storage.
+
+    Redis keys expire after FSM_STATE_TTL / FSM_DATA_TTL, so abandoned
+    registration or admin flows do not accumulate.
+    """
+    if not settings.REDIS_URL:
+        logger.info("fsm_storage", backend="memory")
+        return MemoryStorage()
+
+    try:
+        from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+    except ImportError as e:
+        raise RuntimeError("REDIS_URL is set but the redis package is not installed") from e
+
+    logger.info("fsm_storage", backend="redis")
+    return RedisStorage.from_url(
+        settings.REDIS_URL,
+        key_builder=DefaultKeyBuilder(prefix=settings.FSM_KEY_PREFIX),
+        state_ttl=settings.FSM_STATE_TTL,
+        data_ttl=settings.FSM_DATA_TTL,
+        json_dumps=compact_dumps,
+    )
@@ -1,30 +1,48 @@
 # mafia-bot/bot.py
 
 import asyncio
-import logging
 import sys
+from typing import Optional
+
 from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.types import BotCommand
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
 
 # Импорты из вашего пакета
 from app.config import settings
 from app.handlers import get_routers
-from app.middlewares import DatabaseMiddleware, I18nMiddleware, ThrottlingMiddleware
-from app.services.game_scheduler import GameScheduler
-
-# Настройка логгера
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    stream=sys.stdout
+from app.middlewares import (
+    CallbackDataMiddleware,
+    DatabaseMiddleware,
+    EditCoalescingMiddleware,
+    HandlerLogContextMiddleware,
+    HandlerMetricsMiddleware,
+    I18nMiddleware,
+    QueryStatsMiddleware,
+    RequestMetricsMiddleware,
+    ThrottlingMiddleware,
+    TimedMiddleware,
+    UpdateLogContextMiddleware,
+    UpdateMetricsMiddleware,
+    UserLanesMiddleware,
 )
-logger = logging.getLogger(__name__)
+from app.services.background import background_tasks
+from app.services.leader import LeaderElection
+from app.services.matchmaking import Matchmaker
+from app.services.scheduler import GameScheduler, create_scheduler
+from app.utils.logger import get_logger, setup_logging, shutdown_logging
+from app.utils.metrics import start_metrics_server
+from app.utils.storage import create_fsm_storage
+
+# Настройка логгера: structlog + фоновая запись в stdout
+setup_logging()
+logger = get_logger(__name__)
 
 
-async def on_startup(bot: Bot) -> None:
+async def on_startup(bot: Bot, leader_election: LeaderElection) -> None:
     """Инициализация при запуске бота."""
     # Устанавливаем команды меню
     await bot.set_my_commands([
@@ -49,55 +67,123 @@ async def on_startup(bot: Bot) -> None:
     logger.info("Database initialized")
     logger.info("Default roles initialized")
 
+    # Смену фаз, подбор игроков и напоминания ведёт одна реплика; остальные только обслуживают апдейты
+    await leader_election.start()
+
 
 async def on_shutdown(bot: Bot) -> None:
     """Очистка при завершении работы."""
     logger.info("Bot shutting down...")
 
 
-async def main() -> None:
-    """Основная точка входа."""
-    # Создаём бота с правильными настройками
+def create_bot(session: Optional[BaseSession] = None) -> Bot:
+    """Создать бота с настройками по умолчанию и middleware исходящих запросов."""
     bot = Bot(
         token=settings.BOT_TOKEN,
+        session=session,
         default=DefaultBotProperties(parse_mode=ParseMode.HTML)
     )
+    bot.session.middleware(EditCoalescingMiddleware())
+    bot.session.middleware(RequestMetricsMiddleware())
+    return bot
 
-    dp = Dispatcher()
-    scheduler = AsyncIOScheduler(timezone="UTC")
 
+def setup_dispatcher(dp: Dispatcher) -> None:
+    """Подключить роутеры и middleware (используется и нагрузочным тестом)."""
     # Подключаем все роутеры
     for router in get_routers():
         dp.include_router(router)
 
     # Middleware
-    dp.message.middleware(ThrottlingMiddleware())
-    dp.callback_query.middleware(ThrottlingMiddleware())
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    dp.update.outer_middleware(UpdateLogContextMiddleware())
+    # Апдейты одного пользователя — по порядку, разных — параллельно
+    dp.update.outer_middleware(UserLanesMiddleware())
+    dp.callback_query.outer_middleware(CallbackDataMiddleware())
+
+    for observer in (dp.message, dp.callback_query):
+        observer.middleware(HandlerLogContextMiddleware())
+        observer.middleware(HandlerMetricsMiddleware())
+        observer.middleware(TimedMiddleware("throttling", ThrottlingMiddleware()))
+        observer.middleware(QueryStatsMiddleware())
+        observer.middleware(TimedMiddleware("database", DatabaseMiddleware()))
+        observer.middleware(TimedMiddleware("i18n", I18nMiddleware()))
 
-    dp.message.middleware(DatabaseMiddleware())
-    dp.callback_query.middleware(DatabaseMiddleware())
 
-    dp.message.middleware(I18nMiddleware())
-    dp.callback_query.middleware(I18nMiddleware())
+async def main() -> None:
+    """Основная точка входа."""
+    bot = create_bot()
+    matchmaker = Matchmaker(bot)
+    # Задачи этого процесса (отставание реплики)
+    scheduler = create_scheduler(persist=False)
+    # Задачи всего кластера: работают только у лидера
+    leader_scheduler = create_scheduler()
+
+    # Смена фаз хранится в БД и переживает перезапуск
+    phase_scheduler = GameScheduler(leader_scheduler, bot=bot)
+    phase_scheduler.add_jobs()
+
+    # Новый лидер доигрывает фазы, закончившиеся, пока лидера не было
+    leader_election = LeaderElection(leader_scheduler, on_elected=phase_scheduler.catch_up)
+
+    dp = Dispatcher(
+        storage=create_fsm_storage(),
+        matchmaker=matchmaker,
+        phase_scheduler=phase_scheduler,
+        leader_election=leader_election,
+    )
+    setup_dispatcher(dp)
 
     # События жизненного цикла
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
 
-    # Планировщик игровых событий
-    game_scheduler = GameScheduler(scheduler)
-    game_scheduler.start()
+    # Подбор игроков: заполнение городов и автостарт игр. Только у лидера:
+    # очередь каждый проход собирается заново из тикетов в БД
+    leader_scheduler.add_job(
+        matchmaker.run_matching,
+        trigger=IntervalTrigger(seconds=settings.MATCHMAKING_INTERVAL),
+        id="matchmaking",
+    )
+
+    # Проверка отставания реплики для read-only хендлеров
+    if settings.DATABASE_REPLICA_URL:
+        from app.models.database import replica_router
+        await replica_router.refresh()
+        scheduler.add_job(
+            replica_router.refresh,
+            trigger=IntervalTrigger(seconds=settings.REPLICA_CHECK_INTERVAL),
+            id="replica_lag",
+        )
+
+    scheduler.start()
+    # Возобновляется при избрании лидером
+    leader_scheduler.start(paused=True)
     logger.info("Scheduler started")
 
+    # Метрики в формате Prometheus
+    metrics_runner = None
+    if settings.METRICS_PORT:
+        metrics_runner = await start_metrics_server(settings.METRICS_HOST, settings.METRICS_PORT)
+        logger.info(f"Metrics available on {settings.METRICS_HOST}:{settings.METRICS_PORT}/metrics")
+
     logger.info("Bot starting up...")
 
     try:
-        await dp.start_polling(bot)
+        await dp.start_polling(bot, handle_as_tasks=True)
     except KeyboardInterrupt:
         logger.info("Received keyboard interrupt")
     finally:
-        await scheduler.shutdown()
+        await leader_election.stop()
+        leader_scheduler.shutdown()
+        scheduler.shutdown()
+        # Фоновые задачи хендлеров: дожидаемся или отменяем до закрытия сессий
+        await background_tasks.shutdown()
+        if metrics_runner:
+            await metrics_runner.cleanup()
+        await dp.storage.close()
         await bot.session.close()
+        shutdown_logging()
 
 
 if __name__ == "__main__":
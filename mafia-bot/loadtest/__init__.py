@@ -0,0 +1 @@
+"""Load testing against a local fake of the Telegram Bot API."""
@@ -0,0 +1,100 @@
+"""Run the load test: ``python -m loadtest --users 1000 --duration 60``.
+
+The bot's real dispatcher, routers and middlewares handle the updates and
+talk to the database from ``DATABASE_URL``; only the Telegram side is
+replaced by a local fake. Use a throwaway database.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from aiogram import Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+from app.models.database import AsyncSessionLocal, init_db
+from app.services.background import background_tasks
+from app.services.matchmaking import Matchmaker
+from app.services.role_manager import RoleManager
+from app.utils.storage import create_fsm_storage
+from bot import create_bot, setup_dispatcher
+from loadtest.fake_api import FakeBotAPI
+from loadtest.stats import HandlerStatsMiddleware, LoadStats, UpdateCountMiddleware
+from loadtest.users import VirtualUser
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000, help="virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of load after ramp-up")
+    parser.add_argument("--ramp", type=float, default=10, help="seconds over which users arrive")
+    parser.add_argument("--think", type=float, default=1.0, help="mean pause between user actions")
+    parser.add_argument("--timeout", type=float, default=5.0, help="how long a user waits for a reply")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake Bot API latency, seconds")
+    parser.add_argument("--jitter", type=float, default=0.02, help="fake Bot API latency spread")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="share of calls answered with 429")
+    parser.add_argument("--retry-after", type=int, default=1, help="retry_after of injected 429s")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for user behaviour")
+    return parser.parse_args()
+
+
+async def run(args: argparse.Namespace) -> None:
+    api = FakeBotAPI(
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_limit_ratio=args.rate_limit,
+        retry_after=args.retry_after,
+    )
+    url = await api.start()
+    bot = create_bot(AiohttpSession(api=TelegramAPIServer.from_base(url)))
+
+    stats = LoadStats()
+    dp = Dispatcher(storage=create_fsm_storage(), matchmaker=Matchmaker(bot))
+    # Registered first so they wrap the bot's own middlewares
+    dp.update.outer_middleware(UpdateCountMiddleware(stats))
+    for observer in (dp.message, dp.callback_query):
+        observer.middleware(HandlerStatsMiddleware(stats))
+    setup_dispatcher(dp)
+
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        await RoleManager(session).initialize_default_roles()
+
+    polling = asyncio.create_task(
+        dp.start_polling(bot, handle_as_tasks=True, handle_signals=False, polling_timeout=1)
+    )
+
+    rng = random.Random(args.seed)
+    deadline = time.monotonic() + args.ramp + args.duration
+    users = [
+        VirtualUser(api, i, random.Random(rng.random()), args.think, args.timeout)
+        for i in range(args.users)
+    ]
+
+    async def arrive(user: VirtualUser, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await user.run(deadline)
+
+    print(f"{args.users} users against {url}, ramp {args.ramp}s, load {args.duration}s")
+    stats.reset()
+    try:
+        await asyncio.gather(*(arrive(u, rng.uniform(0, args.ramp)) for u in users))
+    finally:
+        await dp.stop_polling()
+        await polling
+        await background_tasks.shutdown()
+        await bot.session.close()
+        await api.close()
+
+    print(stats.report())
+    print()
+    print(f"user timeouts: {sum(u.timeouts for u in users)}")
+    print("bot api calls: " + ", ".join(f"{m}={n}" for m, n in sorted(api.calls.items())))
+    if api.rate_limited:
+        print("injected 429: " + ", ".join(f"{m}={n}" for m, n in sorted(api.rate_limited.items())))
+
+
+if __name__ == "__main__":
+    asyncio.run(run(parse_args()))
@@ -0,0 +1,237 @@
+"""Local fake of the Telegram Bot API.
+
+Implements the methods the bot uses in the flows driven by the load
+generator. Updates are queued with ``push_update`` and served through
+``getUpdates`` long polling; everything the bot sends to a chat is kept as
+that chat's screen and announced to whoever waits on ``wait_screen``.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiohttp import web
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Mafia", "username": "mafia_loadtest_bot"}
+
+
+class ApiError(Exception):
+    """Error answered to the bot as a failed Bot API call."""
+
+    def __init__(self, code: int, description: str, retry_after: Optional[int] = None):
+        super().__init__(description)
+        self.code = code
+        self.description = description
+        self.retry_after = retry_after
+
+
+class Screen:
+    """Last message the bot showed in a chat."""
+
+    __slots__ = ("message_id", "text", "buttons", "version")
+
+    def __init__(self, message_id: int, text: str, buttons: List[str], version: int):
+        self.message_id = message_id
+        self.text = text
+        self.buttons = buttons
+        self.version = version
+
+
+def _buttons(reply_markup: Any) -> List[str]:
+    if not reply_markup:
+        return []
+    markup = json.loads(reply_markup) if isinstance(reply_markup, str) else reply_markup
+    return [
+        button["callback_data"]
+        for row in markup.get("inline_keyboard", [])
+        for button in row
+        if button.get("callback_data")
+    ]
+
+
+class FakeBotAPI:
+    """In-process Bot API server.
+
+    Args:
+        latency: Mean delay added to every call, in seconds
+        jitter: Uniform +/- spread around ``latency``
+        rate_limit_ratio: Share of outgoing calls answered with 429
+        retry_after: ``retry_after`` reported with injected 429s
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        rate_limit_ratio: float = 0.0,
+        retry_after: int = 1,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+
+        self._updates: List[Dict[str, Any]] = []
+        self._next_update_id = 1
+        self._has_updates = asyncio.Condition()
+        self._message_ids: Dict[int, int] = defaultdict(int)
+        self._screens: Dict[int, Screen] = {}
+        self._screen_changed: Dict[int, asyncio.Event] = defaultdict(asyncio.Event)
+        self._version = 0
+
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.rate_limited: Dict[str, int] = defaultdict(int)
+
+        self.app = web.Application()
+        self.app.router.add_post("/bot{token}/{method}", self._dispatch)
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base URL."""
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockname = site._server.sockets[0].getsockname()
+        self.url = f"http://{sockname[0]}:{sockname[1]}"
+        return self.url
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    # Client side (virtual users)
+
+    async def push_update(self, kind: str, payload: Dict[str, Any]) -> int:
+        """Queue an update of ``kind`` ("message", "callback_query") for the bot."""
+        async with self._has_updates:
+            update_id = self._next_update_id
+            self._next_update_id += 1
+            self._updates.append({"update_id": update_id, kind: payload})
+            self._has_updates.notify_all()
+        return update_id
+
+    def screen(self, chat_id: int) -> Optional[Screen]:
+        """Get the last message shown in a chat."""
+        return self._screens.get(chat_id)
+
+    async def wait_screen(self, chat_id: int, after_version: int, timeout: float) -> Optional[Screen]:
+        """Wait until the chat shows something newer than ``after_version``."""
+        deadline = time.monotonic() + timeout
+        while True:
+            screen = self._screens.get(chat_id)
+            if screen is not None and screen.version > after_version:
+                return screen
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            event = self._screen_changed[chat_id]
+            event.clear()
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+
+    def message_payload(self, chat_id: int, screen: Screen) -> Dict[str, Any]:
+        """Build the message object a callback query refers to."""
+        return {
+            "message_id": screen.message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": screen.text,
+        }
+
+    # Server side (the bot)
+
+    async def _dispatch(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = dict(await request.post())
+        self.calls[method] += 1
+
+        handler = getattr(self, f"_api_{method}", None)
+        try:
+            if method != "getUpdates":
+                await self._delay()
+                if self.rate_limit_ratio and random.random() < self.rate_limit_ratio:
+                    self.rate_limited[method] += 1
+                    raise ApiError(
+                        429,
+                        f"Too Many Requests: retry after {self.retry_after}",
+                        retry_after=self.retry_after,
+                    )
+            result = await handler(params) if handler else True
+        except ApiError as e:
+            body: Dict[str, Any] = {"ok": False, "error_code": e.code, "description": e.description}
+            if e.retry_after is not None:
+                body["parameters"] = {"retry_after": e.retry_after}
+            return web.json_response(body, status=e.code)
+
+        return web.json_response({"ok": True, "result": result})
+
+    async def _delay(self) -> None:
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _show(self, chat_id: int, message_id: int, text: str, reply_markup: Any) -> Dict[str, Any]:
+        self._version += 1
+        screen = Screen(message_id, text, _buttons(reply_markup), self._version)
+        self._screens[chat_id] = screen
+        self._screen_changed[chat_id].set()
+
+        message = self.message_payload(chat_id, screen)
+        if reply_markup:
+            message["reply_markup"] = (
+                json.loads(reply_markup) if isinstance(reply_markup, str) else reply_markup
+            )
+        return message
+
+    async def _api_getMe(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return BOT_USER
+
+    async def _api_getUpdates(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        timeout = float(params.get("timeout") or 0)
+
+        async with self._has_updates:
+            # Updates below offset are confirmed by the bot
+            self._updates = [u for u in self._updates if u["update_id"] >= offset]
+            if not self._updates and timeout:
+                try:
+                    await asyncio.wait_for(self._has_updates.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            return self._updates[:limit]
+
+    async def _api_sendMessage(self, params: Dict[str, str]) -> Dict[str, Any]:
+        chat_id = int(params["chat_id"])
+        self._message_ids[chat_id] += 1
+        return self._show(chat_id, self._message_ids[chat_id], params.get("text", ""), params.get("reply_markup"))
+
+    async def _api_editMessageText(self, params: Dict[str, str]) -> Dict[str, Any]:
+        chat_id, message_id = self._target(params)
+        return self._show(chat_id, message_id, params.get("text", ""), params.get("reply_markup"))
+
+    async def _api_editMessageReplyMarkup(self, params: Dict[str, str]) -> Dict[str, Any]:
+        chat_id, message_id = self._target(params)
+        screen = self._screens.get(chat_id)
+        text = screen.text if screen is not None else ""
+        return self._show(chat_id, message_id, text, params.get("reply_markup"))
+
+    async def _api_answerCallbackQuery(self, params: Dict[str, str]) -> bool:
+        return True
+
+    def _target(self, params: Dict[str, str]) -> Tuple[int, int]:
+        if "chat_id" not in params or "message_id" not in params:
+            raise ApiError(400, "Bad Request: inline messages are not supported")
+        chat_id, message_id = int(params["chat_id"]), int(params["message_id"])
+        if message_id > self._message_ids[chat_id]:
+            raise ApiError(400, "Bad Request: message to edit not found")
+        return chat_id, message_id
@@ -0,0 +1,118 @@
+"""Measurements collected while the load test runs."""
+
+import math
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, List, Sequence
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from app.middlewares.query_stats import handler_name
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile, ``q`` in 0..100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class LoadStats:
+    """Per-handler latencies, SQL statement counts and update throughput."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop everything measured so far (e.g. after warm-up)."""
+        self.started = time.perf_counter()
+        self.updates = 0
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.queries: Dict[str, List[int]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, handler: str, seconds: float, queries: int, failed: bool) -> None:
+        """Record one handled update."""
+        self.latencies[handler].append(seconds)
+        self.queries[handler].append(queries)
+        if failed:
+            self.errors[handler] += 1
+
+    def report(self) -> str:
+        """Render a plain-text summary table."""
+        elapsed = time.perf_counter() - self.started
+        handled = sum(len(v) for v in self.latencies.values())
+        all_queries = [q for v in self.queries.values() for q in v]
+
+        lines = [
+            f"elapsed: {elapsed:.1f}s",
+            f"updates: {self.updates} ({self.updates / elapsed:.1f}/s), "
+            f"handled: {handled}, unhandled: {self.updates - handled}",
+            f"db queries per handled update: {sum(all_queries) / max(len(all_queries), 1):.2f}",
+            "",
+            f"{'handler':<40} {'count':>7} {'p50 ms':>9} {'p99 ms':>9} {'queries':>8} {'errors':>7}",
+        ]
+        for name in sorted(self.latencies, key=lambda n: -len(self.latencies[n])):
+            latencies = self.latencies[name]
+            queries = self.queries[name]
+            lines.append(
+                f"{name:<40} {len(latencies):>7} "
+                f"{percentile(latencies, 50) * 1000:>9.1f} {percentile(latencies, 99) * 1000:>9.1f} "
+                f"{sum(queries) / len(queries):>8.2f} {self.errors[name]:>7}"
+            )
+        return "\n".join(lines)
+
+
+class UpdateCountMiddleware(BaseMiddleware):
+    """Outer update middleware counting updates that finished processing."""
+
+    def __init__(self, stats: LoadStats):
+        self.stats = stats
+        super().__init__()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        try:
+            return await handler(event, data)
+        finally:
+            self.stats.updates += 1
+
+
+class HandlerStatsMiddleware(BaseMiddleware):
+    """Inner middleware recording handler latency and SQL statements.
+
+    Must be registered before the bot's own middlewares so that it wraps
+    them and sees the ``query_stats`` left in handler data.
+    """
+
+    def __init__(self, stats: LoadStats):
+        self.stats = stats
+        super().__init__()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        started = time.perf_counter()
+        failed = True
+        try:
+            result = await handler(event, data)
+            failed = False
+            return result
+        finally:
+            query_stats = data.get("query_stats")
+            self.stats.record(
+                handler_name(data),
+                time.perf_counter() - started,
+                query_stats.count if query_stats is not None else 0,
+                failed,
+            )
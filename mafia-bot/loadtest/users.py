@@ -0,0 +1,177 @@
+"""Virtual users clicking through the bot like real players."""
+
+import asyncio
+import random
+import time
+from typing import List, Optional
+
+from app.keyboards.callbacks import ActionTargetCallback, VoteCallback
+from app.utils.callback_data import SEPARATOR
+from loadtest.fake_api import FakeBotAPI, Screen
+
+USER_ID_BASE = 10_000_000
+
+
+class VirtualUser:
+    """One simulated player in a private chat with the bot.
+
+    Every step sends an update and waits for the chat screen to change.
+    Steps answered only with a toast (``callback.answer(text)``) do not
+    change the screen and end with a timeout, which is counted.
+    """
+
+    def __init__(
+        self,
+        api: FakeBotAPI,
+        index: int,
+        rng: random.Random,
+        think_time: float = 1.0,
+        response_timeout: float = 5.0,
+    ):
+        self.api = api
+        self.user_id = USER_ID_BASE + index
+        self.rng = rng
+        self.think_time = think_time
+        self.response_timeout = response_timeout
+        self.screen: Optional[Screen] = None
+        self.timeouts = 0
+        self._message_id = 0
+
+    @property
+    def profile(self) -> dict:
+        return {
+            "id": self.user_id,
+            "is_bot": False,
+            "first_name": f"Player{self.user_id - USER_ID_BASE}",
+            "language_code": "ru",
+        }
+
+    # Primitives
+
+    async def think(self) -> None:
+        if self.think_time > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think_time))
+
+    async def send(self, text: str) -> Optional[Screen]:
+        """Send a text message."""
+        self._message_id += 1
+        payload = {
+            "message_id": self._message_id,
+            "date": int(time.time()),
+            "chat": {"id": self.user_id, "type": "private"},
+            "from": self.profile,
+            "text": text,
+        }
+        if text.startswith("/"):
+            payload["entities"] = [{"type": "bot_command", "offset": 0, "length": len(text.split()[0])}]
+        return await self._push("message", payload)
+
+    async def click(self, data: str, wait: bool = True) -> Optional[Screen]:
+        """Press an inline button on the current screen."""
+        screen = self.api.screen(self.user_id)
+        if screen is None:
+            return None
+        payload = {
+            "id": f"{self.user_id}:{screen.version}:{self.rng.getrandbits(32)}",
+            "from": self.profile,
+            "chat_instance": str(self.user_id),
+            "message": self.api.message_payload(self.user_id, screen),
+            "data": data,
+        }
+        return await self._push("callback_query", payload, wait)
+
+    async def _push(self, kind: str, payload: dict, wait: bool = True) -> Optional[Screen]:
+        current = self.api.screen(self.user_id)
+        version = current.version if current is not None else 0
+        await self.api.push_update(kind, payload)
+        if not wait:
+            await self.think()
+            return None
+
+        screen = await self.api.wait_screen(self.user_id, version, self.response_timeout)
+        if screen is None:
+            self.timeouts += 1
+        else:
+            self.screen = screen
+        await self.think()
+        return screen
+
+    def buttons(self, prefix: str) -> List[str]:
+        """Buttons on the current screen with a callback prefix."""
+        if self.screen is None:
+            return []
+        return [
+            data for data in self.screen.buttons
+            if data == prefix or data.startswith(prefix + SEPARATOR)
+        ]
+
+    async def click_any(self, prefix: str) -> Optional[Screen]:
+        """Press a random button with the prefix, if there is one."""
+        choices = self.buttons(prefix)
+        if not choices:
+            return None
+        return await self.click(self.rng.choice(choices))
+
+    # Flows
+
+    async def register(self) -> None:
+        """/start, pick a language and keep the Telegram name."""
+        await self.send("/start")
+        if await self.click_any("lang") is None:
+            return  # already registered
+        if self.rng.random() < 0.3:
+            await self.send(f"Игрок {self.user_id - USER_ID_BASE}")
+        else:
+            await self.click_any("reg:use_telegram_name")
+
+    async def create_city(self) -> None:
+        await self.send("/city")
+        if await self.click_any("city:create") is None:
+            return
+        await self.send(f"Город {self.user_id - USER_ID_BASE}-{self.rng.randint(0, 999)}")
+        await self.send("Нагрузочный тест")
+
+    async def join_city(self) -> None:
+        """Browse the city list, open a city and join or start a game there."""
+        await self.send("/city")
+        if await self.click_any("city:list") is None:
+            return
+        if self.rng.random() < 0.3:
+            await self.click_any("city:page")
+        if await self.click_any("city:view") is None:
+            return
+
+        if self.buttons("game:start") and self.rng.random() < 0.5:
+            await self.click_any("game:start")
+        elif self.buttons("city:join"):
+            await self.click_any("city:join")
+
+    async def look_around(self) -> None:
+        await self.send(self.rng.choice(["/profile", "/menu"]))
+        await self.click_any(self.rng.choice(["menu:journal", "menu:profile", "game:players"]))
+
+    async def night_action(self) -> None:
+        """Use a night action button, or send one as an in-game keyboard would."""
+        if await self.click_any("action") is None:
+            target = USER_ID_BASE + self.rng.randrange(1000)
+            await self.click(ActionTargetCallback(action="kill", target_id=target).pack(), wait=False)
+
+    async def vote(self) -> None:
+        """Vote from the voting keyboard, or send a vote as it would."""
+        if await self.click_any("vote") is None:
+            target = USER_ID_BASE + self.rng.randrange(1000)
+            await self.click(VoteCallback(player_id=target).pack(), wait=False)
+
+    async def run(self, deadline: float) -> None:
+        """Register, then keep doing random flows until ``deadline``."""
+        await self.register()
+        flows = [
+            (self.join_city, 40),
+            (self.look_around, 25),
+            (self.night_action, 15),
+            (self.vote, 15),
+            (self.create_city, 5),
+        ]
+        while time.monotonic() < deadline:
+            flow = self.rng.choices([f for f, _ in flows], weights=[w for _, w in flows])[0]
+            await flow()
@@ -0,0 +1 @@
+"""Monte Carlo balance simulator for role distributions."""
@@ -0,0 +1,145 @@
+"""Run the balance simulator: ``python -m simulator --players 4-20 --games 1000000``.
+
+Every scenario (player count, mafia count, town role mix) is split into
+chunks that worker processes simulate with independent seeds. Win rates
+are printed per scenario and, with ``--output``, the mafia count closest
+to ``--target`` for each player count is written as a balance table for
+``BALANCE_TABLE_PATH``.
+"""
+
+import argparse
+import json
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from simulator.engine import ASSIGNER_MIX, MAFIA_WON, TOWN_WON, UNFINISHED, RoleMix, Scenario, simulate
+
+Task = Tuple[Scenario, int, np.random.SeedSequence]
+
+
+def parse_players(value: str) -> List[int]:
+    """``"4-20"`` or ``"5,7,9"``."""
+    counts = set()
+    for part in value.split(","):
+        low, _, high = part.partition("-")
+        counts.update(range(int(low), int(high or low) + 1))
+    if not counts or min(counts) < 3:
+        raise argparse.ArgumentTypeError("player counts start at 3")
+    return sorted(counts)
+
+
+def parse_mix(value: str) -> RoleMix:
+    """``"assigner"`` or ``"doctors,sheriffs,blockers"``, e.g. ``"1,1,0"``."""
+    if value == ASSIGNER_MIX.name:
+        return ASSIGNER_MIX
+    try:
+        doctors, sheriffs, blockers = (int(n) for n in value.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad role mix {value!r}") from None
+    return RoleMix(value, counts=(doctors, sheriffs, blockers))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m simulator", description=__doc__.splitlines()[0])
+    parser.add_argument("--players", type=parse_players, default=parse_players("4-20"), help="player counts, e.g. 4-20")
+    parser.add_argument("--mix", type=parse_mix, action="append", help="town role mix, repeatable (default: assigner)")
+    parser.add_argument("--games", type=int, default=100_000, help="games per scenario")
+    parser.add_argument("--chunk", type=int, default=10_000, help="games per worker task")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=None, help="root seed")
+    parser.add_argument("--target", type=float, default=0.5, help="mafia win rate the balance table aims at")
+    parser.add_argument("--output", default=None, help="write the balance table (JSON) here")
+    args = parser.parse_args()
+    args.mix = args.mix or [ASSIGNER_MIX]
+    return args
+
+
+def scenarios(players: List[int], mixes: List[RoleMix]) -> List[Scenario]:
+    """Every mix with every mafia count that does not win outright."""
+    return [
+        Scenario(n, mafia, mix)
+        for n in players
+        for mafia in range(1, (n - 1) // 2 + 1)
+        for mix in mixes
+        if mix.counts is None or sum(mix.counts) <= n - mafia
+    ]
+
+
+def tasks(items: List[Scenario], games: int, chunk: int, seed) -> List[Task]:
+    """Split scenarios into chunks, each with its own spawned seed."""
+    sizes = [(s, min(chunk, games - start)) for s in items for start in range(0, games, chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return [(scenario, size, child) for (scenario, size), child in zip(sizes, seeds)]
+
+
+def run_task(task: Task) -> Tuple[Scenario, np.ndarray]:
+    scenario, games, seed = task
+    return scenario, simulate(scenario, games, seed)
+
+
+def run(args: argparse.Namespace) -> Dict[Scenario, np.ndarray]:
+    items = scenarios(args.players, args.mix)
+    work = tasks(items, args.games, args.chunk, args.seed)
+    totals: Dict[Scenario, np.ndarray] = defaultdict(lambda: np.zeros(3, dtype=np.int64))
+
+    print(f"{len(items)} scenarios x {args.games} games in {len(work)} tasks on {args.workers} workers")
+    started = time.monotonic()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for scenario, counts in pool.map(run_task, work, chunksize=max(1, len(work) // (args.workers * 4))):
+            totals[scenario] += counts
+    elapsed = time.monotonic() - started
+    print(f"{len(items) * args.games} games in {elapsed:.1f}s")
+    return dict(totals)
+
+
+def report(totals: Dict[Scenario, np.ndarray]) -> str:
+    lines = [f"{'players':>7} {'mafia':>5} {'mix':<12} {'games':>9} {'mafia':>7} {'town':>7} {'unfin':>7}"]
+    for scenario in sorted(totals, key=lambda s: (s.players, s.mafia, s.mix.name)):
+        counts = totals[scenario]
+        games = counts.sum()
+        lines.append(
+            f"{scenario.players:>7} {scenario.mafia:>5} {scenario.mix.name:<12} {games:>9}"
+            f" {counts[MAFIA_WON] / games:>7.1%} {counts[TOWN_WON] / games:>7.1%} {counts[UNFINISHED] / games:>7.1%}"
+        )
+    return "\n".join(lines)
+
+
+def balance_table(totals: Dict[Scenario, np.ndarray], mix: RoleMix, target: float) -> dict:
+    """Mafia count per player count whose mafia win rate is closest to ``target``."""
+    rates: Dict[int, Dict[int, float]] = defaultdict(dict)
+    for scenario, counts in totals.items():
+        if scenario.mix == mix:
+            rates[scenario.players][scenario.mafia] = float(counts[MAFIA_WON] / counts.sum())
+
+    return {
+        "target_mafia_win_rate": target,
+        "mix": mix.name,
+        "player_counts": {
+            str(n): {
+                "mafia": min(by_mafia, key=lambda m: (abs(by_mafia[m] - target), m)),
+                "win_rates": {str(m): round(rate, 4) for m, rate in sorted(by_mafia.items())},
+            }
+            for n, by_mafia in sorted(rates.items())
+        },
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    totals = run(args)
+    print(report(totals))
+
+    if args.output:
+        table = balance_table(totals, args.mix[0], args.target)
+        with open(args.output, "w") as f:
+            json.dump(table, f, indent=2)
+        print(f"balance table for mix {args.mix[0].name!r} written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
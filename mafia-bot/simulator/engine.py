@@ -0,0 +1,183 @@
+"""Vectorized game simulation.
+
+A batch of games is a set of ``(games, players)`` arrays: role codes and
+alive flags. Every night and day step is a handful of NumPy operations
+over the whole batch, with scripted policies standing in for players:
+
+* mafia agree on a random town target; the kill lands unless every alive
+  mafioso is blocked or the target is healed (one kill per night);
+* doctors heal, blockers block and sheriffs investigate a random alive
+  player other than themselves (a bodyguard's protection is a heal here,
+  a don's investigation and cupid's pairing do nothing);
+* by day, town votes for a mafioso a living sheriff has exposed, otherwise
+  for a random player; mafia vote together for a random town player.
+
+Win checks follow ``app.services.rules.winner`` and, like the engine,
+happen after nights only. Only NumPy is imported here, so worker
+processes start without loading the bot.
+"""
+
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Role codes
+CIVILIAN, MAFIA, DOCTOR, SHERIFF, BLOCKER = range(5)
+TOWN_CODES = (CIVILIAN, DOCTOR, SHERIFF, BLOCKER)
+
+# Result columns
+MAFIA_WON, TOWN_WON, UNFINISHED = range(3)
+
+
+@dataclass(frozen=True)
+class RoleMix:
+    """How town roles are dealt.
+
+    Either exact ``counts`` of doctors, sheriffs and blockers (the rest are
+    civilians) or per-player ``weights`` of civilian, doctor, sheriff and
+    blocker, like the role assigner's uniform pick from town roles.
+    """
+
+    name: str
+    counts: Optional[Tuple[int, int, int]] = None
+    weights: Optional[Tuple[float, float, float, float]] = None
+
+    def deal(self, rng: np.random.Generator, games: int, town: int) -> np.ndarray:
+        """Town role codes, ``(games, town)``."""
+        if self.counts is not None:
+            doctors, sheriffs, blockers = self.counts
+            row = [DOCTOR] * doctors + [SHERIFF] * sheriffs + [BLOCKER] * blockers
+            row = (row + [CIVILIAN] * town)[:town]
+            return np.tile(np.array(row, dtype=np.int8), (games, 1))
+
+        weights = np.asarray(self.weights, dtype=float)
+        return rng.choice(np.array(TOWN_CODES, dtype=np.int8), size=(games, town), p=weights / weights.sum())
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Player count, mafia count and town role mix."""
+
+    players: int
+    mafia: int
+    mix: RoleMix
+
+
+def _choose(rng: np.random.Generator, actors: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Random target index per actor, excluding itself; -1 for non-actors or no target.
+
+    ``actors`` and ``targets`` are ``(games, players)`` masks. Each actor
+    draws a rank among the targets, so the cost grows with players, not
+    with actors times targets.
+    """
+    order = np.argsort(~targets, axis=1, kind="stable")  # target columns first
+    rank = np.cumsum(targets, axis=1) - 1
+    available = targets.sum(axis=1)[:, None] - targets
+    drawn = (rng.random(actors.shape) * available).astype(np.intp)
+    # Skip the actor's own rank
+    drawn += targets & (drawn >= rank)
+    chosen = np.take_along_axis(order, np.minimum(drawn, actors.shape[1] - 1), axis=1)
+    return np.where(actors & (available > 0), chosen, -1)
+
+
+def _pick(rng: np.random.Generator, mask: np.ndarray) -> np.ndarray:
+    """Random True column per row; -1 for rows without any."""
+    keys = rng.random(mask.shape)
+    keys[~mask] = -1.0
+    picked = keys.argmax(axis=1)
+    picked[~mask.any(axis=1)] = -1
+    return picked
+
+
+def _marks(chosen: np.ndarray, players: int) -> np.ndarray:
+    """``(games, players)`` mask of players chosen by any actor."""
+    marked = np.zeros((chosen.shape[0], players), dtype=bool)
+    game_idx, actor_idx = np.nonzero(chosen >= 0)
+    marked[game_idx, chosen[game_idx, actor_idx]] = True
+    return marked
+
+
+def _day_votes(rng: np.random.Generator, roles: np.ndarray, alive: np.ndarray, exposed: np.ndarray) -> np.ndarray:
+    """Vote target per player; -1 for the dead.
+
+    Town follows a living sheriff's finding, otherwise votes at random;
+    mafia vote together for a random alive town player.
+    """
+    mafia = roles == MAFIA
+    suspect = _pick(rng, alive & exposed)
+    steered = (alive & (roles == SHERIFF)).any(axis=1) & (suspect >= 0)
+    votes = _choose(rng, alive, alive)
+    votes = np.where(alive & ~mafia & steered[:, None], suspect[:, None], votes)
+    framed = _pick(rng, alive & ~mafia)
+    return np.where(alive & mafia, framed[:, None], votes)
+
+
+def simulate(scenario: Scenario, games: int, seed, max_days: int = 50) -> np.ndarray:
+    """Play ``games`` games; returns counts indexed by ``MAFIA_WON``, ``TOWN_WON``, ``UNFINISHED``.
+
+    Heals and split votes can stall a game, so games still running after
+    ``max_days`` nights and days count as unfinished.
+    """
+    rng = np.random.default_rng(seed)
+    n, m = scenario.players, scenario.mafia
+
+    roles = np.concatenate(
+        [np.full((games, m), MAFIA, dtype=np.int8), scenario.mix.deal(rng, games, n - m)],
+        axis=1,
+    )
+    roles = rng.permuted(roles, axis=1)
+    alive = np.ones((games, n), dtype=bool)
+    exposed = np.zeros((games, n), dtype=bool)
+    result = np.full(games, UNFINISHED, dtype=np.int8)
+    # Finished games are dropped from the arrays; ids map rows back to games
+    ids = np.arange(games)
+
+    for _ in range(max_days):
+        mafia = roles == MAFIA
+        rows = np.arange(len(ids))
+
+        # Night: blocks first (lowest priority number), then heals, kill, investigations
+        blocked = _marks(_choose(rng, alive & (roles == BLOCKER), alive), n)
+        acting = alive & ~blocked
+        healed = _marks(_choose(rng, acting & (roles == DOCTOR), alive), n)
+
+        target = _pick(rng, alive & ~mafia)
+        can_kill = (acting & mafia).any(axis=1) & (target >= 0)
+        victims = rows[can_kill]
+        victims = victims[~healed[victims, target[victims]]]
+        alive[victims, target[victims]] = False
+
+        checked = _choose(rng, acting & (roles == SHERIFF), alive)
+        exposed |= _marks(checked, n) & mafia
+
+        alive_mafia = (alive & mafia).sum(axis=1)
+        alive_town = (alive & ~mafia).sum(axis=1)
+        mafia_won = alive_mafia >= alive_town
+        town_won = ~mafia_won & (alive_mafia == 0)
+        result[ids[mafia_won]] = MAFIA_WON
+        result[ids[town_won]] = TOWN_WON
+
+        running = ~(mafia_won | town_won)
+        if not running.all():
+            roles, alive, exposed, ids = roles[running], alive[running], exposed[running], ids[running]
+            rows = rows[: len(ids)]
+        if not len(ids):
+            break
+
+        votes = _day_votes(rng, roles, alive, exposed)
+        counts = np.zeros(alive.shape, dtype=np.int16)
+        game_idx, voter_idx = np.nonzero(votes >= 0)
+        np.add.at(counts, (game_idx, votes[game_idx, voter_idx]), 1)
+        leader = counts.argmax(axis=1)
+        # Need majority to execute
+        executed = counts[rows, leader] > alive.sum(axis=1) / 2
+        alive[rows[executed], leader[executed]] = False
+
+    return np.bincount(result, minlength=3)
+
+
+# The role assigner picks every town player's role uniformly from the town
+# roles of RoleManager.DEFAULT_ROLES: Civilian, Cupid (civilians), Doctor,
+# Bodyguard (heal/protect), Sheriff and Prostitute (block).
+ASSIGNER_MIX = RoleMix("assigner", weights=(2, 2, 1, 1))
@@ -0,0 +1,60 @@
+"""Tests for supervised background tasks."""
+
+import asyncio
+
+from app.services.background import BackgroundTasks
+from app.utils.metrics import BACKGROUND_ERRORS
+
+
+def test_keyed_tasks_are_exclusive():
+    """Test that a busy key refuses new tasks until the first one finishes."""
+    tasks = BackgroundTasks()
+    started = []
+
+    async def work(n):
+        started.append(n)
+        await asyncio.sleep(0.01)
+
+    async def run():
+        first = tasks.spawn(work(1), name="work", key="city:1")
+        assert tasks.spawn(work(2), name="work", key="city:1") is None
+        assert tasks.spawn(work(3), name="work", key="city:2") is not None
+        await first
+        await asyncio.sleep(0)
+        assert not tasks.running("city:1")
+        assert tasks.spawn(work(4), name="work", key="city:1") is not None
+        await tasks.shutdown()
+
+    asyncio.run(run())
+
+    assert sorted(started) == [1, 3, 4]
+    assert len(tasks) == 0
+
+
+def test_errors_counted_and_shutdown_cancels():
+    """Test failure accounting and cancellation of unfinished tasks."""
+    tasks = BackgroundTasks()
+    cancelled = []
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    async def hang():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def run():
+        errors = BACKGROUND_ERRORS.get("test_fail")
+        tasks.spawn(fail(), name="test_fail")
+        tasks.spawn(hang(), name="test_hang")
+        await asyncio.sleep(0.01)
+        assert BACKGROUND_ERRORS.get("test_fail") == errors + 1
+        await tasks.shutdown(timeout=0.01)
+
+    asyncio.run(run())
+
+    assert cancelled == [True]
+    assert len(tasks) == 0
@@ -0,0 +1,49 @@
+"""Tests for the balance table and role planning."""
+
+import json
+from types import SimpleNamespace
+
+from app.models.role import RoleType
+from app.services.balance import BalanceTable, default_mafia_count
+from app.services.rules import plan_roles
+
+MAFIA = SimpleNamespace(id=1, role_type=RoleType.MAFIA)
+CIVILIAN = SimpleNamespace(id=2, role_type=RoleType.CIVILIAN)
+
+
+def test_balance_table_loads_simulator_output(tmp_path):
+    """Test that the simulator's JSON gives mafia counts and unknown sizes fall back."""
+    path = tmp_path / "balance.json"
+    path.write_text(json.dumps({
+        "target_mafia_win_rate": 0.5,
+        "mix": "assigner",
+        "player_counts": {
+            "6": {"mafia": 1, "win_rates": {"1": 0.48, "2": 0.71}},
+            "9": {"mafia": 2, "win_rates": {"1": 0.3, "2": 0.52, "3": 0.74, "4": 0.9}},
+        },
+    }))
+    table = BalanceTable.load(str(path))
+
+    assert table.mafia_count(6) == 1
+    assert table.mafia_count(9) == 2
+    assert table.mafia_count(12) == default_mafia_count(12) == 4
+
+
+def test_balance_table_keeps_town_majority():
+    """Test that a table entry can not hand mafia the game at the start."""
+    table = BalanceTable({6: 3, 4: 0})
+
+    assert table.mafia_count(6) == 2
+    assert table.mafia_count(4) == 1
+
+
+def test_plan_roles_mafia_count():
+    """Test that the planned mafia count follows the argument and defaults to a third."""
+    players = list(range(100, 109))
+
+    def mafia(plan):
+        return sum(1 for _, role in plan if role is MAFIA)
+
+    assert mafia(plan_roles(7, players, [MAFIA, CIVILIAN])) == 3
+    assert mafia(plan_roles(7, players, [MAFIA, CIVILIAN], mafia_count=2)) == 2
+    assert plan_roles(7, players, [MAFIA, CIVILIAN], mafia_count=3) == plan_roles(7, players, [MAFIA, CIVILIAN])
@@ -0,0 +1,90 @@
+"""Tests for typed callback data and schema dispatch."""
+
+import asyncio
+from datetime import datetime
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+from app.keyboards.callbacks import (
+    AdminEventCallback,
+    AdminEventCityCallback,
+    CityJoinCallback,
+    CityJoinMenuCallback,
+    CityPageCallback,
+)
+from app.middlewares.callback_data import CallbackDataMiddleware
+from app.models.event import EventType
+from app.utils.callback_data import CallbackRouter, parse_callback, registered_schemas
+
+
+def test_pack_and_parse_round_trip():
+    """Test that packed schemas parse back to equal instances."""
+    page = CityPageCallback(filter_token="10ru", direction="p", cursor="123_4")
+
+    assert page.pack() == "city:page:10ru:p:123_4"
+    assert parse_callback(page.pack()) == page
+    assert parse_callback("city:join") == CityJoinMenuCallback()
+    assert parse_callback("city:join:7") == CityJoinCallback(id=7)
+
+
+def test_longest_prefix_wins():
+    """Test that admin:event:city:{id} is not taken for admin:event:{type}."""
+    assert parse_callback("admin:event:city:5") == AdminEventCityCallback(city_id=5)
+    assert parse_callback("admin:event:plague") == AdminEventCallback(event_type=EventType.PLAGUE)
+    assert parse_callback("admin:event:unknown") is None
+    assert parse_callback("city:join:abc") is None
+
+
+def test_prefixes_are_unique():
+    """Test that schema prefixes and arities do not collide."""
+    keys = [(schema.__prefix__, len(schema.model_fields)) for schema in registered_schemas()]
+
+    assert len(keys) == len(set(keys))
+
+
+def make_update(data: str) -> Update:
+    user = User(id=1, is_bot=False, first_name="Test")
+    message = Message(
+        message_id=1,
+        date=datetime.now(),
+        chat=Chat(id=1, type="private"),
+    )
+    return Update(
+        update_id=1,
+        callback_query=CallbackQuery(
+            id="1",
+            from_user=user,
+            chat_instance="1",
+            message=message,
+            data=data,
+        ),
+    )
+
+
+def test_router_dispatches_by_schema():
+    """Test dispatch table routing and injection of parsed fields."""
+    router = CallbackRouter()
+    calls = []
+
+    @router.callback_query(AdminEventCallback.filter())
+    async def select_event(callback: CallbackQuery, callback_data: AdminEventCallback) -> None:
+        calls.append(("event", callback_data.event_type))
+
+    @router.callback_query(AdminEventCityCallback.filter())
+    async def select_city(callback: CallbackQuery, callback_data: AdminEventCityCallback) -> None:
+        calls.append(("city", callback_data.city_id))
+
+    dp = Dispatcher()
+    dp.callback_query.outer_middleware(CallbackDataMiddleware())
+    dp.include_router(router)
+    bot = Bot("42:TEST")
+
+    async def run():
+        await dp.feed_update(bot, make_update("admin:event:city:5"))
+        await dp.feed_update(bot, make_update("admin:event:curfew"))
+        await dp.feed_update(bot, make_update("unknown:data"))
+
+    asyncio.run(run())
+
+    assert calls == [("city", 5), ("event", EventType.CURFEW)]
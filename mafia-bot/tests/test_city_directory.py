@@ -0,0 +1,42 @@
+"""Tests for city directory pagination tokens."""
+
+from datetime import datetime, timezone
+
+from app.services.city_directory import CityCursor, CityFilter
+
+
+def test_city_filter_roundtrip():
+    """Test filter packing into callback data."""
+    city_filter = CityFilter(open_only=True, not_started=False, language="en")
+
+    assert city_filter.pack() == "10en"
+    assert CityFilter.unpack(city_filter.pack()) == city_filter
+    assert CityFilter.unpack(CityFilter().pack()) == CityFilter()
+
+
+def test_city_filter_toggles():
+    """Test filter toggles."""
+    city_filter = CityFilter()
+
+    assert city_filter.toggle_open().open_only
+    assert city_filter.toggle_not_started().not_started
+    assert city_filter.toggle_language("de").language == "de"
+    assert city_filter.toggle_language("de").toggle_language("de").language is None
+
+
+def test_city_cursor_roundtrip():
+    """Test cursor packing keeps microsecond precision."""
+    cursor = CityCursor(
+        created_at=datetime(2024, 1, 15, 8, 30, 12, 345678, tzinfo=timezone.utc),
+        city_id=42,
+    )
+
+    packed = cursor.pack()
+
+    assert len(f"city:page:00ru:n:{packed}") <= 64
+    assert CityCursor.unpack(packed) == cursor
+
+
+def test_city_cursor_first_page():
+    """Test that the first page token has no cursor."""
+    assert CityCursor.unpack("0") is None
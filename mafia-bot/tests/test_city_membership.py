@@ -0,0 +1,157 @@
+"""Tests for city membership."""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base
+from app.models.city import City, CityPlayer
+from app.models.player import Player
+from app.services.city_membership import CityMembership, JoinResult
+
+# Capacity checks rely on PostgreSQL row locks and data-modifying CTEs
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+needs_postgres = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL (PostgreSQL) is not set")
+
+
+class MembershipSession:
+    """Answers membership checks and the join/leave statement in turn."""
+
+    def __init__(self, members, changed):
+        self.members = list(members)
+        self.changed = changed
+        self.statements = []
+        self.commits = 0
+
+    async def scalar(self, statement):
+        return self.members.pop(0)
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(scalar_one_or_none=lambda: self.changed)
+
+    async def commit(self):
+        self.commits += 1
+
+
+async def test_join_results():
+    """Test that join reports joined, full and already-member outcomes."""
+    session = MembershipSession([False], changed=3)
+    assert await CityMembership(session).join(1, 10) == JoinResult.JOINED
+    assert session.commits == 1
+
+    session = MembershipSession([True], changed=None)
+    assert await CityMembership(session).join(1, 10) == JoinResult.ALREADY_MEMBER
+    assert session.statements == []
+
+    # Nothing inserted: full, or a duplicate tap won the race
+    session = MembershipSession([False, False], changed=None)
+    assert await CityMembership(session).join(1, 10) == JoinResult.FULL
+    session = MembershipSession([False, True], changed=None)
+    assert await CityMembership(session).join(1, 10) == JoinResult.ALREADY_MEMBER
+    assert session.commits == 0
+
+
+async def test_join_checks_capacity_under_the_city_lock():
+    """Test that the seat is taken and counted in one statement holding the city row lock."""
+    session = MembershipSession([False], changed=1)
+    await CityMembership(session).join(1, 10)
+
+    (statement,) = session.statements
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "cities.player_count < cities.max_players" in sql
+    assert "FOR UPDATE" in sql
+    assert "ON CONFLICT DO NOTHING" in sql
+    assert "SET player_count=(cities.player_count + " in sql
+
+
+async def test_leave_results():
+    """Test that leave reports whether the player was a member."""
+    session = MembershipSession([], changed=2)
+    assert await CityMembership(session).leave(1, 10)
+    assert session.commits == 1
+
+    session = MembershipSession([], changed=None)
+    assert not await CityMembership(session).leave(1, 10)
+    assert session.commits == 0
+
+
+@pytest.fixture
+async def database():
+    engine = create_async_engine(TEST_DATABASE_URL, pool_size=20)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    try:
+        yield async_sessionmaker(engine, expire_on_commit=False)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+async def create_city(database, players, max_players):
+    async with database() as session:
+        player_ids = list(await session.scalars(
+            insert(Player).returning(Player.id),
+            [{"telegram_id": 1000 + i, "first_name": f"p{i}"} for i in range(players)],
+        ))
+        city_id = await session.scalar(
+            insert(City)
+            .values(name="Test", creator_id=player_ids[0], max_players=max_players, player_count=0)
+            .returning(City.id)
+        )
+        await session.commit()
+    return city_id, player_ids
+
+
+async def roster(database, city_id):
+    async with database() as session:
+        count = await session.scalar(select(City.player_count).where(City.id == city_id))
+        members = await session.scalar(
+            select(func.count()).select_from(CityPlayer).where(CityPlayer.city_id == city_id)
+        )
+    return count, members
+
+
+@pytest.mark.postgres
+@needs_postgres
+async def test_join_and_leave_keep_player_count(database):
+    """Test joined, full and already-member outcomes and the counter on join and leave."""
+    city_id, player_ids = await create_city(database, players=3, max_players=2)
+
+    async with database() as session:
+        membership = CityMembership(session)
+        assert await membership.join(city_id, player_ids[0]) == JoinResult.JOINED
+        assert await membership.join(city_id, player_ids[0]) == JoinResult.ALREADY_MEMBER
+        assert await membership.join(city_id, player_ids[1]) == JoinResult.JOINED
+        assert await membership.join(city_id, player_ids[2]) == JoinResult.FULL
+    assert await roster(database, city_id) == (2, 2)
+
+    async with database() as session:
+        membership = CityMembership(session)
+        assert await membership.leave(city_id, player_ids[0])
+        assert not await membership.leave(city_id, player_ids[0])
+    assert await roster(database, city_id) == (1, 1)
+
+
+@pytest.mark.postgres
+@needs_postgres
+async def test_concurrent_joins_do_not_overfill(database):
+    """Test that 500 players joining a new city at once fill exactly its seats."""
+    city_id, player_ids = await create_city(database, players=500, max_players=20)
+
+    async def join(player_id):
+        async with database() as session:
+            return await CityMembership(session).join(city_id, player_id)
+
+    results = await asyncio.gather(*(join(player_id) for player_id in player_ids))
+
+    assert results.count(JoinResult.JOINED) == 20
+    assert results.count(JoinResult.FULL) == 480
+    assert await roster(database, city_id) == (20, 20)
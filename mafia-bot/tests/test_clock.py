@@ -0,0 +1,78 @@
+"""Tests for the injectable clock."""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from apscheduler.triggers.cron import CronTrigger
+
+from app.config import settings
+from app.services.game_engine import GameEngine
+from app.utils.clock import SystemClock, VirtualClock, get_clock, set_clock, utcnow
+
+
+def test_virtual_sleepers_wake_in_deadline_order():
+    """Test that advancing wakes sleepers in order at their deadlines."""
+    clock = VirtualClock(datetime(2024, 1, 1))
+    woken = []
+
+    async def sleeper(name, seconds):
+        await clock.sleep(seconds)
+        woken.append((name, clock.utcnow()))
+
+    async def run():
+        tasks = [asyncio.create_task(sleeper(n, s)) for n, s in (("late", 3600), ("early", 60))]
+        await asyncio.sleep(0)
+        assert await clock.advance_to_next()
+        assert [n for n, _ in woken] == ["early"]
+        await clock.advance(86400)
+        await asyncio.gather(*tasks)
+        assert not await clock.advance_to_next()
+
+    asyncio.run(run())
+
+    assert woken == [
+        ("early", datetime(2024, 1, 1, 0, 1)),
+        ("late", datetime(2024, 1, 1, 1, 0)),
+    ]
+    assert clock.utcnow() == datetime(2024, 1, 1, 0, 1) + timedelta(days=1)
+
+
+def test_run_jobs_fires_a_week_of_cron_jobs():
+    """Test that a week of daily jobs runs instantly at their fire times."""
+    clock = VirtualClock(datetime(2024, 1, 1))
+    fired = []
+
+    async def job():
+        fired.append(clock.utcnow())
+
+    trigger = CronTrigger(hour=8, minute=0, timezone="UTC")
+    runs = asyncio.run(clock.run_jobs([(job, trigger)], datetime(2024, 1, 8)))
+
+    assert runs == 7
+    assert fired[0] == datetime(2024, 1, 1, 8, 0)
+    assert fired[-1] == datetime(2024, 1, 7, 8, 0)
+    assert clock.utcnow() == datetime(2024, 1, 8)
+
+
+def test_engine_and_defaults_use_installed_clock():
+    """Test that phase deadlines and column defaults follow the current clock."""
+    clock = VirtualClock(datetime(2030, 5, 1, 12))
+    previous = set_clock(clock)
+    try:
+        assert utcnow() == datetime(2030, 5, 1, 12)
+
+        async def commit():
+            pass
+
+        async def scalars(statement):
+            return []
+
+        game = SimpleNamespace(id=1, status=None, day_number=1, phase_index=3, phase_end_time=None)
+        engine = GameEngine(SimpleNamespace(commit=commit, scalars=scalars))
+        asyncio.run(engine.start_day(game))
+    finally:
+        set_clock(previous)
+
+    assert game.phase_end_time == datetime(2030, 5, 1, 12) + timedelta(hours=settings.DAY_START_HOUR + 16)
+    assert isinstance(get_clock(), SystemClock)
@@ -0,0 +1,45 @@
+"""Tests for database engine configuration."""
+
+from app.config import settings
+from app.models.database import engine_options
+
+
+def test_engine_options_use_pool_settings():
+    """Test that pool settings are passed to the engine."""
+    options = engine_options()
+
+    assert options["pool_size"] == settings.DB_POOL_SIZE
+    assert options["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert options["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+    assert options["connect_args"]["statement_cache_size"] == settings.DB_STATEMENT_CACHE_SIZE
+
+
+def test_engine_options_pgbouncer_disables_statement_caches(monkeypatch):
+    """Test that pgbouncer mode disables prepared statement caching."""
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+
+    connect_args = engine_options()["connect_args"]
+
+    assert connect_args["statement_cache_size"] == 0
+    assert connect_args["prepared_statement_cache_size"] == 0
+    assert connect_args["prepared_statement_name_func"]() != connect_args["prepared_statement_name_func"]()
+
+
+def test_replica_router_falls_back_and_sticks_to_primary(monkeypatch):
+    """Test replica routing for read-only updates."""
+    from app.models import database
+
+    replica = object()
+    monkeypatch.setattr(database, "ReplicaSessionLocal", replica)
+    router = database.ReplicaRouter()
+
+    # Replica lag not measured yet
+    assert router.session_factory(read_only=True, user_id=1) is database.AsyncSessionLocal
+
+    router.healthy = True
+    assert router.session_factory(read_only=True, user_id=1) is replica
+    assert router.session_factory(read_only=False, user_id=1) is database.AsyncSessionLocal
+
+    router.mark_write(1)
+    assert router.session_factory(read_only=True, user_id=1) is database.AsyncSessionLocal
+    assert router.session_factory(read_only=True, user_id=2) is replica
@@ -0,0 +1,68 @@
+"""Tests for message edit coalescing."""
+
+import asyncio
+
+from aiogram.methods import EditMessageReplyMarkup, EditMessageText, SendMessage
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from app.middlewares.edit_coalescing import EditCoalescingMiddleware
+
+
+def markup(text: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[[InlineKeyboardButton(text=text, callback_data="menu:main")]]
+    )
+
+
+def edit(text: str, message_id: int = 1, button: str = "Back") -> EditMessageText:
+    return EditMessageText(chat_id=1, message_id=message_id, text=text, reply_markup=markup(button))
+
+
+def test_identical_edits_suppressed():
+    """Test that unchanged edits are not sent."""
+    middleware = EditCoalescingMiddleware(debounce=0)
+    sent = []
+
+    async def make_request(bot, method):
+        sent.append(method)
+        return True
+
+    async def run():
+        assert await middleware(make_request, None, edit("a")) is True
+        assert await middleware(make_request, None, edit("a")) is True
+        await middleware(make_request, None, edit("a", button="Next"))
+        await middleware(make_request, None, edit("a", message_id=2))
+        await middleware(
+            make_request, None,
+            EditMessageReplyMarkup(chat_id=1, message_id=1, reply_markup=markup("Next")),
+        )
+        await middleware(make_request, None, SendMessage(chat_id=1, text="a"))
+        await middleware(make_request, None, SendMessage(chat_id=1, text="a"))
+
+    asyncio.run(run())
+
+    assert [type(m).__name__ for m in sent] == [
+        "EditMessageText", "EditMessageText", "EditMessageText", "SendMessage", "SendMessage",
+    ]
+
+
+def test_rapid_edits_coalesced():
+    """Test that only the newest of rapid edits is sent."""
+    middleware = EditCoalescingMiddleware(debounce=0.05)
+    sent = []
+
+    async def make_request(bot, method):
+        sent.append(method.text)
+        return True
+
+    async def run():
+        await middleware(make_request, None, edit("1"))
+        await asyncio.gather(
+            middleware(make_request, None, edit("2")),
+            middleware(make_request, None, edit("3")),
+            middleware(make_request, None, edit("4")),
+        )
+
+    asyncio.run(run())
+
+    assert sent == ["1", "4"]
@@ -0,0 +1,111 @@
+"""Tests for event effects."""
+
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.event import EffectKind, Event, EventEffect, EventType
+from app.services.event_manager import GAME_EFFECTS, EventManager, active_modifiers_query
+
+
+def test_active_modifiers_is_one_indexed_query():
+    """Test that a game's modifiers come from one query filtered by game and active events."""
+    sql = str(active_modifiers_query(7).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("SELECT") == 1
+    assert "JOIN events ON events.id = event_effects.event_id" in sql
+    assert "event_effects.game_id = " in sql
+    assert "events.is_active" in sql
+
+    indexes = {index.name: [c.name for c in index.columns] for index in Event.__table__.indexes}
+    assert indexes["ix_events_game_active"] == ["game_id", "is_active"]
+    indexes = {index.name: [c.name for c in index.columns] for index in EventEffect.__table__.indexes}
+    assert indexes["ix_event_effects_game_role"] == ["game_id", "player_role_id"]
+
+
+def test_effect_data_is_jsonb_on_postgres():
+    """Test that effect data uses JSONB on PostgreSQL."""
+    column_type = EventEffect.__table__.c.data.type.dialect_impl(postgresql.dialect())
+    assert isinstance(column_type, postgresql.JSONB)
+
+
+def test_game_wide_events_have_effects():
+    """Test that events without a random target still record a typed effect."""
+    for event_type in (
+        EventType.INQUISITOR,
+        EventType.MAYOR_ELECTION,
+        EventType.FULL_MOON,
+        EventType.CURFEW,
+        EventType.DOUBLE_TROUBLE,
+    ):
+        assert GAME_EFFECTS[event_type]
+
+    kinds = [kind for kind, _ in GAME_EFFECTS[EventType.DOUBLE_TROUBLE]]
+    assert kinds == [EffectKind.EXTRA_KILL]
+
+
+def test_completed_event_is_not_active():
+    """Test that completing an event drops it from the active index."""
+    event = Event(is_active=True, is_completed=False)
+    event.complete()
+
+    assert not event.is_active
+    assert not event.is_ongoing
+
+
+class EventSession:
+    def __init__(self, events, blocked=()):
+        self.results = [events, blocked]
+
+    async def scalars(self, statement):
+        return self.results.pop(0)
+
+
+async def test_events_expire_after_the_next_phase():
+    """Test that an event covers the phase it starts in and the next one, like on replay."""
+    blocked = SimpleNamespace(ability_cooldown=1)
+    plague = Event(event_type=EventType.PLAGUE, day_number=1, started_phase=2, is_active=True)
+    later = Event(event_type=EventType.DOUBLE_TROUBLE, day_number=2, started_phase=3, is_active=True)
+
+    night = SimpleNamespace(id=1, phase_index=3)
+    assert await EventManager(EventSession([plague, later])).expire_events(night) == []
+
+    night.phase_index = 4
+    assert await EventManager(EventSession([plague, later], [blocked])).expire_events(night) == [plague]
+    assert not plague.is_active
+    assert plague.is_active_in(3) and not plague.is_active_in(4)
+    assert later.is_active
+    assert blocked.ability_cooldown == 0
+
+
+class TriggerSession:
+    def __init__(self, alive):
+        self.alive = alive
+        self.added = []
+
+    def add(self, item):
+        self.added.append(item)
+
+    async def flush(self):
+        pass
+
+    async def scalars(self, statement):
+        return SimpleNamespace(all=lambda: self.alive)
+
+    async def commit(self):
+        pass
+
+
+async def test_mayor_election_elects_a_mayor():
+    """Test that the election makes one alive player the mayor and keeps an alive mayor in office."""
+    alive = [SimpleNamespace(id=i, player_id=100 + i, is_mayor=False) for i in range(1, 6)]
+    game = SimpleNamespace(id=1, seed=42, day_number=2, phase_index=3)
+
+    event = await EventManager(TriggerSession(alive)).trigger_event(game, EventType.MAYOR_ELECTION)
+    (mayor,) = [role for role in alive if role.is_mayor]
+    assert event.affected_player_id == mayor.player_id
+
+    game.day_number = 3
+    again = await EventManager(TriggerSession(alive)).trigger_event(game, EventType.MAYOR_ELECTION)
+    assert again.affected_player_id == mayor.player_id
+    assert [role for role in alive if role.is_mayor] == [mayor]
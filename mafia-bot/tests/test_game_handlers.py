@@ -0,0 +1,61 @@
+"""Tests for game handlers."""
+
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.handlers.game import show_journal
+from app.services.game_lookup import GameLookup, PlayerActiveGame
+from app.utils.i18n import i18n
+
+
+class JournalSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def scalar(self, statement):
+        return 10
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: self.rows)
+
+
+class FakeMessage:
+    def __init__(self):
+        self.texts = []
+
+    async def edit_text(self, text, reply_markup=None):
+        self.texts.append(text)
+
+
+async def test_journal_shows_own_investigations(monkeypatch):
+    """Test that the journal lists only the viewer's stored results by night."""
+    current = PlayerActiveGame(
+        game=SimpleNamespace(id=3, day_number=2),
+        player_role=SimpleNamespace(id=7),
+        city_name="Town",
+    )
+
+    async def get_player_active_game(self, player_id):
+        return current
+
+    monkeypatch.setattr(GameLookup, "get_player_active_game", get_player_active_game)
+
+    session = JournalSession([(1, "Alice", "is_mafia"), (2, "Bob", "don")])
+    callback = SimpleNamespace(from_user=SimpleNamespace(id=555), message=FakeMessage())
+    await show_journal(callback, session, "en")
+
+    (statement,) = session.statements
+    assert {3, 7} <= set(statement.compile(dialect=postgresql.dialect()).params.values())
+    (text,) = callback.message.texts
+    assert f"Ночь 1: Alice — {i18n.get('actions.is_mafia', 'en')}" in text
+    assert f"Ночь 2: Bob — {i18n.get_role_name('don', 'en')}" in text
+
+    current.player_role = None
+    callback.message.texts.clear()
+    await show_journal(callback, session, "en")
+
+    assert len(session.statements) == 1
+    assert callback.message.texts[0].endswith("Пока нет записей в журнале.")
@@ -0,0 +1,102 @@
+"""Tests for per-user ordered update processing."""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.middlewares.lanes import UserLanesMiddleware
+from app.utils.metrics import UPDATES_QUEUED
+
+
+def user_data(user_id: int) -> dict:
+    return {"event_from_user": SimpleNamespace(id=user_id)}
+
+
+def test_same_user_in_order_other_users_concurrent():
+    """Test per-user ordering and cross-user concurrency."""
+    middleware = UserLanesMiddleware(max_concurrency=10, max_lane_depth=10)
+    log = []
+
+    async def handler(event, data):
+        log.append(("start", event))
+        await asyncio.sleep(0.01 if event == "a1" else 0)
+        log.append(("end", event))
+
+    async def run():
+        await asyncio.gather(
+            middleware(handler, "a1", user_data(1)),
+            middleware(handler, "a2", user_data(1)),
+            middleware(handler, "b1", user_data(2)),
+        )
+
+    asyncio.run(run())
+
+    assert log.index(("end", "a1")) < log.index(("start", "a2"))
+    assert log.index(("start", "b1")) < log.index(("end", "a1"))
+
+
+def test_concurrency_cap_and_lane_depth():
+    """Test global concurrency cap and dropping updates from full lanes."""
+    middleware = UserLanesMiddleware(max_concurrency=2, max_lane_depth=2)
+    running = 0
+    peak = 0
+
+    async def handler(event, data):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return event
+
+    async def run():
+        return await asyncio.gather(
+            *(middleware(handler, i, user_data(i)) for i in range(5)),
+            *(middleware(handler, f"x{i}", user_data(100)) for i in range(3)),
+        )
+
+    results = asyncio.run(run())
+
+    assert peak == 2
+    assert results[:5] == [0, 1, 2, 3, 4]
+    assert results[5:] == ["x0", "x1", None]
+
+
+def test_keyless_updates_keep_queue_gauge_balanced():
+    """Test that updates without a user or chat do not drive the queued gauge negative."""
+    middleware = UserLanesMiddleware(max_concurrency=2, max_lane_depth=2)
+    before = UPDATES_QUEUED.get()
+
+    async def handler(event, data):
+        return event
+
+    assert asyncio.run(middleware(handler, "poll", {})) == "poll"
+    assert UPDATES_QUEUED.get() == before
+
+
+def test_dropped_callback_is_answered():
+    """Test that a callback query dropped from a full lane is still answered."""
+    middleware = UserLanesMiddleware(max_concurrency=2, max_lane_depth=1)
+    answered = []
+
+    class Bot:
+        async def answer_callback_query(self, callback_query_id):
+            answered.append(callback_query_id)
+
+    async def handler(event, data):
+        await asyncio.sleep(0.01)
+        return event
+
+    def update(callback_id):
+        return SimpleNamespace(callback_query=SimpleNamespace(id=callback_id))
+
+    async def run():
+        data = {**user_data(1), "bot": Bot()}
+        return await asyncio.gather(
+            middleware(handler, update("1"), dict(data)),
+            middleware(handler, update("2"), dict(data)),
+        )
+
+    first, dropped = asyncio.run(run())
+
+    assert first.callback_query.id == "1" and dropped is None
+    assert answered == ["2"]
@@ -0,0 +1,45 @@
+"""Tests for lazily opened database session."""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.middlewares.database import HAS_WRITES, LazySession
+
+
+class FakeSession:
+    """Minimal stand-in for AsyncSession."""
+
+    def __init__(self):
+        self.new, self.dirty, self.deleted = set(), set(), set()
+        self.sync_session = SimpleNamespace(info={})
+        self.commits = 0
+
+    async def commit(self):
+        self.commits += 1
+
+
+def test_unused_session_is_never_created():
+    """Test that handlers not touching the DB cost no session."""
+    created = []
+    lazy = LazySession(lambda: created.append(FakeSession()) or created[-1])
+
+    assert asyncio.run(lazy.commit_if_needed()) is False
+    assert not lazy.opened
+    assert created == []
+
+
+def test_commit_only_with_changes():
+    """Test that read-only use skips commit and writes are committed."""
+    session = FakeSession()
+    lazy = LazySession(lambda: session)
+
+    lazy.new.add(object())
+    assert lazy.opened
+    assert asyncio.run(lazy.commit_if_needed()) is True
+
+    session.new.clear()
+    assert asyncio.run(lazy.commit_if_needed()) is False
+
+    session.sync_session.info[HAS_WRITES] = True
+    assert asyncio.run(lazy.commit_if_needed()) is True
+    assert session.commits == 2
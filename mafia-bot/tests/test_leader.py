@@ -0,0 +1,105 @@
+"""Tests for scheduler leader election."""
+
+import asyncio
+from types import SimpleNamespace
+
+from app.services.leader import LeaderElection
+from app.utils.metrics import SCHEDULER_LEADER
+
+
+class FakeScheduler:
+    """Records pause/resume calls."""
+
+    def __init__(self):
+        self.running = False
+
+    def resume(self):
+        self.running = True
+
+    def pause(self):
+        self.running = False
+
+
+class FakeConnection:
+    """Connection to a fake server holding advisory locks per connection."""
+
+    def __init__(self, server):
+        self.server = server
+        self.broken = False
+
+    async def execution_options(self, **options):
+        return self
+
+    async def scalar(self, statement, params):
+        holder = self.server.locks.setdefault(params["key"], self)
+        return holder is self
+
+    async def execute(self, statement, params=None):
+        if self.broken:
+            raise ConnectionError("connection lost")
+        if "unlock" in str(statement):
+            self.server.locks.pop(params["key"], None)
+
+    async def close(self):
+        # The server drops session locks with the connection
+        for key, holder in list(self.server.locks.items()):
+            if holder is self:
+                del self.server.locks[key]
+
+
+class FakeEngine:
+    """Engine whose connections share one lock table."""
+
+    def __init__(self, dialect="postgresql"):
+        self.dialect = SimpleNamespace(name=dialect)
+        self.locks = {}
+
+    async def connect(self):
+        return FakeConnection(self)
+
+
+def test_single_leader_and_failover():
+    """Test that one of two replicas leads and the other takes over when it dies."""
+    async def scenario():
+        engine = FakeEngine()
+        elected = []
+        first = LeaderElection(FakeScheduler(), engine, on_elected=lambda: asyncio.sleep(0, elected.append(1)))
+        second = LeaderElection(FakeScheduler(), engine, on_elected=lambda: asyncio.sleep(0, elected.append(2)))
+        second.instance = "second"
+
+        assert await first.check() is True
+        assert await second.check() is False
+        assert first.scheduler.running and not second.scheduler.running
+
+        # Leader's connection dies: the server releases the lock
+        first._conn.broken = True
+        await first._conn.close()
+        assert await first.check() is False
+        assert not first.scheduler.running
+
+        assert await second.check() is True
+        assert second.scheduler.running
+        assert SCHEDULER_LEADER.get("second") == 1
+        assert elected == [1, 2]
+
+        await second.stop()
+        assert not second.scheduler.running
+        assert engine.locks == {}
+
+    asyncio.run(scenario())
+
+
+def test_without_postgres_process_always_leads():
+    """Test that development databases without advisory locks need no election."""
+    scheduler = FakeScheduler()
+    election = LeaderElection(scheduler, FakeEngine(dialect="sqlite"))
+
+    async def scenario():
+        await election.start()
+        assert election.is_leader and scheduler.running
+        assert election._task is None
+        await election.stop()
+
+    asyncio.run(scenario())
+    assert election.is_leader is False
+    assert scheduler.running is False
@@ -0,0 +1,63 @@
+"""Tests for the load test harness."""
+
+import asyncio
+
+import pytest
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetUpdates
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from loadtest.fake_api import FakeBotAPI
+from loadtest.stats import percentile
+
+
+def test_fake_api_roundtrip():
+    """Test updates, screens and 429 injection through a real Bot client."""
+
+    async def run():
+        api = FakeBotAPI()
+        url = await api.start()
+        bot = Bot("1:test", session=AiohttpSession(api=TelegramAPIServer.from_base(url)))
+        try:
+            first = await api.push_update("message", {
+                "message_id": 1, "date": 0, "text": "/start",
+                "chat": {"id": 5, "type": "private"},
+                "from": {"id": 5, "is_bot": False, "first_name": "A"},
+            })
+            updates = await bot(GetUpdates(offset=first, timeout=1))
+            assert [u.message.text for u in updates] == ["/start"]
+            assert await bot(GetUpdates(offset=first + 1, timeout=0)) == []
+
+            markup = InlineKeyboardMarkup(
+                inline_keyboard=[[InlineKeyboardButton(text="City", callback_data="menu:city")]]
+            )
+            message = await bot.send_message(5, "Menu", reply_markup=markup)
+            screen = await api.wait_screen(5, 0, timeout=1)
+            assert screen.message_id == message.message_id
+            assert screen.buttons == ["menu:city"]
+
+            await bot.edit_message_text("Cities", chat_id=5, message_id=message.message_id)
+            assert api.screen(5).text == "Cities"
+            assert api.screen(5).buttons == []
+
+            api.rate_limit_ratio = 1.0
+            with pytest.raises(TelegramRetryAfter):
+                await bot.send_message(5, "Menu")
+            assert api.rate_limited["sendMessage"] == 1
+        finally:
+            await bot.session.close()
+            await api.close()
+
+    asyncio.run(run())
+
+
+def test_percentile():
+    """Test nearest-rank percentiles."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3
+    assert percentile([], 50) == 0
@@ -0,0 +1,21 @@
+"""Tests for structured logging setup."""
+
+import pytest
+import structlog
+
+from app.config import settings
+from app.utils.logger import sample_debug
+
+
+def test_sample_debug_drops_debug_events(monkeypatch):
+    """Test that debug events are sampled and other levels pass."""
+    monkeypatch.setattr(settings, "LOG_DEBUG_SAMPLE_RATE", 0.0)
+
+    with pytest.raises(structlog.DropEvent):
+        sample_debug(None, "debug", {"event": "tick", "level": "debug"})
+
+    event = {"event": "started", "level": "info"}
+    assert sample_debug(None, "info", event) is event
+
+    monkeypatch.setattr(settings, "LOG_DEBUG_SAMPLE_RATE", 1.0)
+    assert sample_debug(None, "debug", {"event": "tick", "level": "debug"})
@@ -0,0 +1,220 @@
+"""Tests for matchmaking queue."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.config import settings
+from app.services import matchmaking
+from app.services.matchmaking import Matchmaker, MatchmakingQueue, partition_key
+
+
+def test_queue_orders_by_wait_time():
+    """Test that longest waiting players are popped first."""
+    queue = MatchmakingQueue()
+    key = partition_key("ru", 1)
+
+    queue.push(key, 3, enqueued_at=30.0)
+    queue.push(key, 1, enqueued_at=10.0)
+    queue.push(key, 2, enqueued_at=20.0)
+
+    assert queue.oldest(key) == 10.0
+    assert [e.player_id for e in queue.pop_batch(key, 2)] == [1, 2]
+    assert queue.size(key) == 1
+    assert len(queue) == 1
+
+
+def test_queue_rejects_duplicates_and_cancels():
+    """Test duplicate enqueue and cancellation."""
+    queue = MatchmakingQueue()
+    key = partition_key("en", 1)
+
+    assert queue.push(key, 1, enqueued_at=1.0)
+    assert not queue.push(key, 1, enqueued_at=2.0)
+
+    queue.push(key, 2, enqueued_at=3.0)
+    assert queue.remove(1)
+    assert not queue.remove(1)
+
+    assert queue.oldest(key) == 3.0
+    assert [e.player_id for e in queue.pop_batch(key, 10)] == [2]
+    assert queue.partitions() == []
+
+
+def test_queue_partitions_by_language_and_level():
+    """Test partitioning by language and level band."""
+    assert partition_key("ru", 1) == partition_key("ru", settings.MATCHMAKING_LEVEL_BAND)
+    assert partition_key("ru", 1) != partition_key("ru", settings.MATCHMAKING_LEVEL_BAND + 1)
+    assert partition_key("ru", 1) != partition_key("en", 1)
+
+
+def test_collect_batches():
+    """Test full batches form immediately and partial ones after the fill window."""
+    matchmaker = Matchmaker(bot=None)
+    full, partial = partition_key("ru", 1), partition_key("en", 1)
+
+    for player_id in range(settings.MAX_PLAYERS + 1):
+        matchmaker.queue.push(full, player_id, enqueued_at=100.0)
+    for player_id in range(1000, 1000 + settings.MIN_PLAYERS):
+        matchmaker.queue.push(partial, player_id, enqueued_at=100.0)
+
+    batches = matchmaker.collect_batches(now=100.0)
+
+    assert [(key, len(entries)) for key, entries in batches] == [(full, settings.MAX_PLAYERS)]
+
+    batches = matchmaker.collect_batches(now=100.0 + settings.MATCHMAKING_FILL_WINDOW)
+
+    assert [(key, len(entries)) for key, entries in batches] == [(partial, settings.MIN_PLAYERS)]
+    assert matchmaker.queue.size(full) == 1
+
+
+class FakeSession:
+    """Session over a ``FakeDatabase``: ticket claims apply on commit."""
+
+    def __init__(self, db):
+        self.db = db
+        self.pending = []
+        self.claimed = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def stream_scalars(self, statement):
+        # Tickets from the sync time, if the query has one
+        since = next(iter(statement.compile().params.values()), None)
+        tickets = sorted(
+            (t for t in self.db.tickets.values() if since is None or t.enqueued_at >= since),
+            key=lambda t: t.enqueued_at,
+        )
+        self.db.reads += len(tickets)
+        # Tickets cancelled through another replica after this read
+        for player_id in self.db.cancel_after_read:
+            self.db.tickets.pop(player_id, None)
+
+        async def rows():
+            for ticket in tickets:
+                yield ticket
+
+        return rows()
+
+    async def scalars(self, statement):
+        # DELETE ... RETURNING of the batch's tickets
+        (player_ids,) = statement.compile().params.values()
+        self.claimed = {p for p in player_ids if p in self.db.tickets}
+        return sorted(self.claimed)
+
+    async def scalar(self, statement):
+        self.pending.append(statement)
+        return 1
+
+    async def execute(self, statement, params=None):
+        self.pending.append(statement)
+
+    async def commit(self):
+        for player_id in self.claimed:
+            del self.db.tickets[player_id]
+        self.db.committed.extend(self.pending)
+        self.pending, self.claimed = [], set()
+
+    async def rollback(self):
+        self.db.rollbacks += 1
+        self.pending, self.claimed = [], set()
+
+
+class FakeDatabase:
+    def __init__(self, tickets):
+        self.tickets = {t.player_id: t for t in tickets}
+        self.cancel_after_read = set()
+        self.committed = []
+        self.rollbacks = 0
+        self.reads = 0
+
+    def session(self):
+        return FakeSession(self)
+
+
+def tickets(language, player_ids, start=datetime(2024, 1, 1, tzinfo=timezone.utc)):
+    return [
+        SimpleNamespace(player_id=p, language=language, level=1, enqueued_at=start + timedelta(seconds=i))
+        for i, p in enumerate(player_ids)
+    ]
+
+
+def fake_engine(started):
+    class RecordingEngine:
+        def __init__(self, session):
+            self.session = session
+
+        async def start_game(self, city_id, player_ids):
+            if started is None:
+                raise RuntimeError("no roles")
+            started.append(list(player_ids))
+            await self.session.commit()
+            return SimpleNamespace(id=len(started))
+
+    return RecordingEngine
+
+
+async def test_failed_game_start_keeps_tickets(monkeypatch):
+    """Test that a batch whose game fails to start leaves no city behind and stays queued."""
+    db = FakeDatabase(tickets("ru", range(settings.MAX_PLAYERS)))
+    monkeypatch.setattr(matchmaking, "AsyncSessionLocal", db.session)
+    monkeypatch.setattr(matchmaking, "GameEngine", fake_engine(None))
+
+    matchmaker = Matchmaker(bot=None)
+    assert await matchmaker.run_matching() == 0
+
+    assert db.committed == []
+    assert db.rollbacks == 1
+    assert len(db.tickets) == settings.MAX_PLAYERS
+
+    # The next pass finds the same players again
+    started = []
+    monkeypatch.setattr(matchmaking, "GameEngine", fake_engine(started))
+    monkeypatch.setattr(matchmaking, "notify_game_start", no_notify)
+    assert await matchmaker.run_matching() == 1
+    assert started == [list(range(settings.MAX_PLAYERS))]
+
+
+async def test_matching_only_starts_claimed_tickets(monkeypatch):
+    """Test that players cancelled elsewhere are left out and a batch too small waits."""
+    db = FakeDatabase(
+        tickets("ru", range(settings.MAX_PLAYERS))
+        + tickets("en", range(1000, 1000 + settings.MIN_PLAYERS))
+    )
+    db.cancel_after_read = {0, 1000}
+    started = []
+    monkeypatch.setattr(matchmaking, "AsyncSessionLocal", db.session)
+    monkeypatch.setattr(matchmaking, "GameEngine", fake_engine(started))
+    monkeypatch.setattr(matchmaking, "notify_game_start", no_notify)
+
+    assert await Matchmaker(bot=None).run_matching() == 1
+
+    assert started == [list(range(1, settings.MAX_PLAYERS))]
+    assert db.rollbacks == 1
+    assert sorted(db.tickets) == list(range(1001, 1000 + settings.MIN_PLAYERS))
+
+
+async def no_notify(bot, session, game):
+    pass
+
+
+async def test_sync_reads_only_new_tickets(monkeypatch):
+    """Test that passes after the first read only recent tickets and keep waiting players."""
+    db = FakeDatabase(tickets("ru", range(settings.MIN_PLAYERS - 1)))
+    monkeypatch.setattr(matchmaking, "AsyncSessionLocal", db.session)
+
+    matchmaker = Matchmaker(bot=None)
+    assert await matchmaker.run_matching() == 0
+    assert db.reads == settings.MIN_PLAYERS - 1
+
+    # Enqueued through another replica
+    new = tickets("ru", [100], start=datetime.now(timezone.utc))
+    db.tickets.update((t.player_id, t) for t in new)
+    db.reads = 0
+    assert await matchmaker.sync() == 1
+
+    assert db.reads == 1
+    assert len(matchmaker.queue) == settings.MIN_PLAYERS
@@ -0,0 +1,61 @@
+"""Tests for metrics registry."""
+
+import asyncio
+
+from app.middlewares.metrics import TimedMiddleware
+from app.utils.metrics import MIDDLEWARE_LATENCY, Registry, registry
+
+
+def test_counter_and_gauge_render():
+    """Test counter and callback gauge exposition."""
+    metrics = Registry()
+    updates = metrics.counter("updates_total", "Updates", ["type"])
+    metrics.gauge("pool_checked_out", "Checked out", callback=lambda: 3)
+
+    updates.inc("message")
+    updates.inc("message")
+    updates.inc("callback_query")
+
+    text = metrics.render()
+
+    assert updates.get("message") == 2
+    assert '# TYPE updates_total counter' in text
+    assert 'updates_total{type="message"} 2' in text
+    assert 'updates_total{type="callback_query"} 1' in text
+    assert "pool_checked_out 3" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    """Test histogram bucket, sum and count samples."""
+    metrics = Registry()
+    latency = metrics.histogram("latency_seconds", "Latency", ["handler"], buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, "profile")
+
+    text = metrics.render()
+
+    assert latency.count("profile") == 3
+    assert 'latency_seconds_bucket{handler="profile",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{handler="profile",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{handler="profile",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{handler="profile"} 3' in text
+
+
+def test_timed_middleware_excludes_handler_time():
+    """Test that middleware time does not include downstream handler time."""
+
+    async def passthrough(handler, event, data):
+        return await handler(event, data)
+
+    async def slow_handler(event, data):
+        await asyncio.sleep(0.05)
+        return "done"
+
+    middleware = TimedMiddleware("test_passthrough", passthrough)
+
+    assert asyncio.run(middleware(slow_handler, None, {})) == "done"
+    assert MIDDLEWARE_LATENCY.count("test_passthrough") == 1
+    assert 'mafia_middleware_seconds_bucket{middleware="test_passthrough",le="0.01"} 1' in (
+        registry.render()
+    )
@@ -0,0 +1,130 @@
+"""Tests for event modifiers and night resolution."""
+
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.action import ActionType
+from app.models.event import EffectKind, EventType
+from app.services.event_manager import GAME_EFFECTS, Modifier
+from app.services.game_engine import GameEngine
+from app.services.modifiers import NO_MODIFIERS, compile_modifiers
+from app.services.night import NightAction, resolve_night
+from app.services.notifications import investigation_text, notify_investigations
+from app.utils.i18n import i18n
+
+
+def game_modifiers(event_type, event_id=1):
+    return [
+        Modifier(event_id=event_id, event_type=event_type, kind=kind, data=data)
+        for kind, data in GAME_EFFECTS[event_type]
+    ]
+
+
+def kill(actor, target, group="mafia", priority=3):
+    return NightAction(actor, ActionType.KILL, priority, group, target)
+
+
+def test_compile_modifiers():
+    """Test that events compile into resolver hooks."""
+    modifiers = compile_modifiers(
+        game_modifiers(EventType.DOUBLE_TROUBLE)
+        + game_modifiers(EventType.FULL_MOON)
+        + game_modifiers(EventType.INQUISITOR)
+        + game_modifiers(EventType.MAYOR_ELECTION)
+        + [
+            Modifier(2, EventType.PLAGUE, EffectKind.ABILITY_BLOCKED, player_role_id=5),
+            Modifier(3, EventType.REVELATION, EffectKind.REVEALED, player_role_id=6),
+            Modifier(4, EventType.NONE, EffectKind.VOTE_WEIGHT, player_role_id=7, data={"weight": 0}),
+        ]
+    )
+
+    assert modifiers.kill_slots("mafia") == 2
+    assert modifiers.kill_slots("Maniac") == 2
+    assert modifiers.kill_slots("Don") == 1
+    assert modifiers.blocked == {5}
+    assert modifiers.investigate_role
+    assert modifiers.vote_weight(1, is_mayor=True, weight=1) == 2
+    assert modifiers.vote_weight(1, is_mayor=False, weight=1) == 1
+    assert modifiers.vote_weight(7, is_mayor=True, weight=1) == 0
+    assert compile_modifiers([]) == NO_MODIFIERS
+
+
+def test_kill_slots_limit_kills():
+    """Test that the mafia kills once per night unless an event adds a slot."""
+    actions = [kill(1, 10), kill(2, 11), NightAction(3, ActionType.KILL, 1, "Maniac", 12)]
+
+    assert resolve_night(actions).killed == [12, 10]
+
+    double = compile_modifiers(game_modifiers(EventType.DOUBLE_TROUBLE))
+    assert sorted(resolve_night(actions, double).killed) == [10, 11, 12]
+
+
+def test_heal_and_block():
+    """Test that heals save regardless of order and blocks stop later actions."""
+    actions = [
+        kill(1, 10),
+        NightAction(2, ActionType.HEAL, 4, "Doctor", 10),
+        NightAction(3, ActionType.BLOCK, 2, "Prostitute", 4),
+        NightAction(4, ActionType.KILL, 3, "Don", 11),
+    ]
+    outcome = resolve_night(actions)
+
+    assert outcome.killed == []
+    assert outcome.saved == [10]
+    assert outcome.blocked == {4}
+
+    plague = compile_modifiers([Modifier(1, EventType.PLAGUE, EffectKind.ABILITY_BLOCKED, player_role_id=2)])
+    assert resolve_night(actions, plague).killed == [10]
+
+
+def test_inquisitor_reveals_role():
+    """Test that investigations show the exact role during the inquisitor event."""
+    actions = [NightAction(1, ActionType.INVESTIGATE, 5, "Sheriff", 9, target_is_mafia=True, target_role_key="don")]
+
+    assert resolve_night(actions).investigations == {1: "is_mafia"}
+    inquisitor = compile_modifiers(game_modifiers(EventType.INQUISITOR))
+    assert resolve_night(actions, inquisitor).investigations == {1: "don"}
+
+
+class RecordingSession:
+    def __init__(self, rows=()):
+        self.statements = []
+        self.rows = list(rows)
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: self.rows)
+
+    async def commit(self):
+        pass
+
+
+class RecordingBot:
+    def __init__(self):
+        self.sent = []
+
+    async def send_message(self, chat_id, text):
+        self.sent.append((chat_id, text))
+
+
+async def test_inquisitor_result_reaches_investigator():
+    """Test that the exact role is stored on the sheriff's action and sent to the sheriff."""
+    actions = [NightAction(1, ActionType.INVESTIGATE, 5, "Sheriff", 9, target_is_mafia=True, target_role_key="don")]
+    outcome = resolve_night(actions, compile_modifiers(game_modifiers(EventType.INQUISITOR)))
+
+    session = RecordingSession()
+    await GameEngine(session)._apply_night_outcome(SimpleNamespace(id=3, day_number=2), outcome)
+    (update,) = session.statements
+    params = update.compile(dialect=postgresql.dialect()).params
+    assert str(update.table) == "actions"
+    assert params["result"] == "don"
+    assert {3, 2, 1, ActionType.INVESTIGATE} <= set(params.values())
+
+    bot = RecordingBot()
+    await notify_investigations(bot, RecordingSession([(10, 555, "en", "Alice", params["result"])]), 3, 2)
+
+    assert bot.sent == [(555, i18n.get(
+        "actions.investigation_result", "en", target="Alice", result=i18n.get_role_name("don", "en"),
+    ))]
+    assert investigation_text("is_mafia", "en") == i18n.get("actions.is_mafia", "en")
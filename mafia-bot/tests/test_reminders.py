@@ -0,0 +1,118 @@
+"""Tests for night action reminders."""
+
+import asyncio
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.services import reminders
+from app.services.reminders import pending_reminders_query, send_action_reminders
+
+
+def test_pending_reminders_is_one_anti_join_query():
+    """Test that pending actors are found with NOT EXISTS instead of per-game queries."""
+    sql = str(pending_reminders_query(after_role_id=10, limit=50).compile(dialect=postgresql.dialect()))
+
+    assert sql.count("NOT (EXISTS") == 2
+    assert "actions.actor_role_id = player_roles.id" in sql
+    assert "action_reminders.player_role_id = player_roles.id" in sql
+    assert "players.notifications_enabled" in sql
+    assert "player_roles.id > " in sql
+    assert "ORDER BY player_roles.id" in sql
+
+
+def test_reminders_without_bot_send_nothing():
+    """Test that a scheduler without a bot skips reminders."""
+    assert asyncio.run(send_action_reminders(None)) == 0
+
+
+class FakeReminderDatabase:
+    """Pending actors and the action_reminders table."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.reminded = set()
+
+    def session(self):
+        return FakeReminderSession(self)
+
+
+class FakeReminderSession:
+    def __init__(self, db):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if isinstance(statement, tuple):
+            _, after, limit = statement
+            rows = [
+                r for r in self.db.rows
+                if r.player_role_id > after and (r.player_role_id, r.game_night) not in self.db.reminded
+            ]
+            return SimpleNamespace(all=lambda: rows[:limit])
+
+        # DELETE of released reminders
+        (keys,) = statement.compile(dialect=postgresql.dialect()).params.values()
+        self.db.reminded -= set(keys)
+
+    async def scalars(self, statement):
+        # INSERT ... ON CONFLICT DO NOTHING RETURNING
+        params = statement.compile(dialect=postgresql.dialect()).params
+        claimed = []
+        for i in range(len(params) // 2):
+            key = (params[f"player_role_id_m{i}"], params[f"game_night_m{i}"])
+            if key not in self.db.reminded:
+                self.db.reminded.add(key)
+                claimed.append(key[0])
+        return SimpleNamespace(all=lambda: claimed)
+
+    async def commit(self):
+        pass
+
+
+class FakeBot:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.sent = []
+
+    async def send_message(self, chat_id, text, reply_markup=None):
+        if chat_id in self.failing:
+            raise RuntimeError("network error")
+        self.sent.append(chat_id)
+
+
+def reminder_db(monkeypatch):
+    db = FakeReminderDatabase([
+        SimpleNamespace(player_role_id=i, game_night=1, telegram_id=100 + i, language="en")
+        for i in range(1, 6)
+    ])
+    monkeypatch.setattr(reminders, "AsyncSessionLocal", db.session)
+    monkeypatch.setattr(reminders, "pending_reminders_query", lambda after, limit: ("pending", after, limit))
+    return db
+
+
+async def test_reminders_are_sent_once(monkeypatch):
+    """Test that a player reminded once is skipped by later and overlapping runs."""
+    reminder_db(monkeypatch)
+    first, second = FakeBot(), FakeBot()
+
+    assert await send_action_reminders(first, batch_size=2) == 5
+    assert await send_action_reminders(second, batch_size=2) == 0
+    assert sorted(first.sent) == [101, 102, 103, 104, 105]
+
+
+async def test_failed_reminder_is_retried(monkeypatch):
+    """Test that a reminder that failed to send is released for the next run."""
+    db = reminder_db(monkeypatch)
+
+    assert await send_action_reminders(FakeBot(failing={103}), batch_size=2) == 4
+    assert (3, 1) not in db.reminded
+
+    retry = FakeBot()
+    assert await send_action_reminders(retry, batch_size=2) == 1
+    assert retry.sent == [103]
@@ -0,0 +1,78 @@
+"""Tests for deterministic game replay."""
+
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+from app.models.action import ActionType
+from app.models.event import EffectKind, Event, EventType
+from app.models.game import Game, GameStatus
+from app.models.role import RoleType
+from app.services.event_manager import Modifier
+from app.services.replay import DAY, NIGHT, Replay, ReplayEvent, last_resolved_phase, log_query, phase_index
+
+
+def role(name, role_type, team, priority=5):
+    return SimpleNamespace(name=name, name_key=name.lower(), role_type=role_type, team=team, action_priority=priority)
+
+
+MAFIA = role("Mafia", RoleType.MAFIA, "mafia", 3)
+DOCTOR = role("Doctor", RoleType.CIVILIAN, "town", 4)
+CIVILIAN = role("Civilian", RoleType.CIVILIAN, "town", 10)
+
+
+def roles():
+    return {1: MAFIA, 2: MAFIA, 3: DOCTOR, 4: CIVILIAN, 5: CIVILIAN, 6: CIVILIAN}
+
+
+def test_replay_timeline():
+    """Test that nights and days are resolved in order until a faction wins."""
+    replay = Replay(seed=7, roles=roles())
+
+    night = replay.night(1, [(1, 4, ActionType.KILL), (2, 5, ActionType.KILL), (3, 4, ActionType.HEAL)])
+    assert night.saved == [4] and night.killed == []
+
+    day = replay.day(2, [(voter, 1, 1) for voter in (2, 3, 4, 5)])
+    assert day.executed == 1
+    assert replay.death_causes == {1: "executed"}
+
+    night = replay.night(2, [(1, 4, ActionType.KILL), (2, 6, ActionType.KILL)])
+    assert night.killed == [6]
+    assert replay.winner is None
+    assert [entry.name for entry in replay.timeline] == ["night 1", "day 2", "night 2"]
+
+
+def test_events_apply_from_their_phase():
+    """Test that an event started during a night affects that night, not the day before."""
+    event = Event(id=1, event_type=EventType.DOUBLE_TROUBLE, day_number=2, started_phase=4)
+    modifiers = [Modifier(1, EventType.DOUBLE_TROUBLE, EffectKind.EXTRA_KILL, data={"team": "mafia"})]
+    replay = Replay(seed=7, roles=roles(), events=[ReplayEvent(event, modifiers)])
+
+    assert replay.modifiers((1, DAY)).kill_slots("mafia") == 1
+    assert replay.modifiers((2, NIGHT)).kill_slots("mafia") == 2
+
+    replay.night(1, [])
+    replay.day(2, [])
+    night = replay.night(2, [(1, 4, ActionType.KILL), (2, 5, ActionType.KILL)])
+    assert night.events == ["double_trouble"]
+    assert sorted(night.killed) == [4, 5]
+
+
+def test_phase_positions_match_game():
+    """Test that replay phase keys line up with the game's phase index."""
+    assert phase_index((2, NIGHT)) == Game(status=GameStatus.NIGHT, day_number=2).phase_index
+    assert phase_index((2, DAY)) == Game(status=GameStatus.VOTING, day_number=3).phase_index
+
+    assert last_resolved_phase(GameStatus.ENDED, 3) == (3, NIGHT)
+    assert last_resolved_phase(GameStatus.NIGHT, 3) == (2, DAY)
+    assert last_resolved_phase(GameStatus.VOTING, 3) == (2, NIGHT)
+    assert last_resolved_phase(GameStatus.NIGHT, 1) is None
+
+
+def test_log_is_one_ordered_stream():
+    """Test that actions and active votes are read as one stream in phase order."""
+    sql = str(log_query(5).compile(dialect=postgresql.dialect()))
+
+    assert "UNION ALL" in sql
+    assert "votes.is_active" in sql
+    assert sql.rstrip().endswith("ORDER BY anon_1.number, anon_1.phase, anon_1.created_at, anon_1.record_id")
@@ -0,0 +1,30 @@
+"""Tests for seeded random streams."""
+
+from app.models.game import Game
+from app.utils.rng import Stream, derive_seed, new_seed, stream
+
+
+def test_streams_are_reproducible():
+    """Test that a seed and stream key always give the same numbers."""
+    first = [stream(42, Stream.ROLES).random() for _ in range(3)]
+    again = [stream(42, Stream.ROLES).random() for _ in range(3)]
+
+    assert first == again
+    assert stream(42, Stream.EVENTS, 3).random() == stream(42, Stream.EVENTS, 3).random()
+
+
+def test_streams_are_independent():
+    """Test that streams of one game and equal streams of other games differ."""
+    seeds = {
+        derive_seed(42, Stream.ROLES),
+        derive_seed(42, Stream.EVENTS, 1),
+        derive_seed(42, Stream.EVENTS, 2),
+        derive_seed(43, Stream.ROLES),
+    }
+    assert len(seeds) == 4
+
+
+def test_new_seed_fits_bigint():
+    """Test that seeds fit a signed 64-bit column."""
+    assert all(0 <= new_seed() < 2 ** 63 for _ in range(100))
+    assert Game.__table__.c.seed.default.arg.__name__ == "new_seed"
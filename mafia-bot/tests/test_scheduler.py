@@ -0,0 +1,143 @@
+"""Tests for the game phase scheduler."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.models import Base
+from app.models.game import Game
+from app.services import scheduler as phases
+from app.services.game_engine import GameEngine
+from app.services.scheduler import PERSISTENT_JOBSTORE, GameScheduler, create_scheduler
+from app.utils.clock import VirtualClock
+
+
+def test_phase_jobs_are_persistable_and_coalesced():
+    """Test that phase jobs reference a module-level entry point with misfire settings."""
+    scheduler = create_scheduler(persist=False)
+    GameScheduler(scheduler).add_jobs()
+
+    async def inspect():
+        scheduler.start(paused=True)
+        try:
+            return {job.id: job for job in scheduler.get_jobs(jobstore=PERSISTENT_JOBSTORE)}
+        finally:
+            scheduler.shutdown(wait=False)
+
+    jobs = asyncio.run(inspect())
+    assert set(jobs) == {"end_nights", "end_voting", "action_reminders"}
+    job = jobs["end_nights"]
+    assert job.func_ref == "app.services.scheduler:run_phase_job"
+    assert job.args == ("end_nights",)
+    assert job.coalesce is True
+    assert job.misfire_grace_time == settings.SCHEDULER_MISFIRE_GRACE
+
+
+async def test_restart_keeps_missed_run(tmp_path, monkeypatch):
+    """Test that a restart keeps a stored run missed while the bot was down."""
+    monkeypatch.setattr(settings, "SCHEDULER_JOBSTORE_URL", f"sqlite:///{tmp_path}/jobs.db")
+    missed = datetime.now(timezone.utc).replace(microsecond=0) - timedelta(hours=1)
+
+    scheduler = create_scheduler(persist=True)
+    GameScheduler(scheduler).add_jobs()
+    scheduler.start(paused=True)
+    scheduler.modify_job("action_reminders", jobstore=PERSISTENT_JOBSTORE, next_run_time=missed)
+    scheduled = scheduler.get_job("end_nights", jobstore=PERSISTENT_JOBSTORE).next_run_time
+    scheduler.shutdown(wait=False)
+
+    # Restart, with the night end moved an hour later
+    monkeypatch.setattr(settings, "DAY_START_HOUR", (settings.DAY_START_HOUR + 1) % 24)
+    scheduler = create_scheduler(persist=True)
+    GameScheduler(scheduler).add_jobs()
+    scheduler.start(paused=True)
+    try:
+        reminders = scheduler.get_job("action_reminders", jobstore=PERSISTENT_JOBSTORE)
+        nights = scheduler.get_job("end_nights", jobstore=PERSISTENT_JOBSTORE)
+    finally:
+        scheduler.shutdown(wait=False)
+
+    assert reminders.next_run_time == missed
+    # A changed schedule replaces the stored job
+    assert nights.next_run_time != scheduled
+    assert nights.trigger.fields[5].expressions[0].first == settings.DAY_START_HOUR
+
+
+def test_run_phase_job_dispatches_to_active_scheduler():
+    """Test that the stored entry point runs the job of the registered scheduler."""
+    calls = []
+
+    class RecordingScheduler(GameScheduler):
+        async def end_all_voting(self):
+            calls.append("end_voting")
+
+    RecordingScheduler(create_scheduler(persist=False)).add_jobs()
+    asyncio.run(phases.run_phase_job("end_voting"))
+
+    assert calls == ["end_voting"]
+
+
+def test_jobstore_url_uses_sync_driver():
+    """Test deriving the job store URL from the asyncpg URL."""
+    url = settings.model_copy(update={
+        "DATABASE_URL": "postgresql+asyncpg://u:p@db/mafia",
+        "SCHEDULER_JOBSTORE_URL": None,
+    }).scheduler_jobstore_url
+
+    assert url == "postgresql+psycopg2://u:p@db/mafia"
+
+
+class StartGameSession:
+    def __init__(self):
+        self.added = []
+
+    def add(self, game):
+        game.id = 1
+        self.added.append(game)
+
+    def add_all(self, items):
+        pass
+
+    async def flush(self):
+        pass
+
+    async def execute(self, statement):
+        pass
+
+    async def commit(self):
+        pass
+
+
+async def test_catch_up_ends_first_night(tmp_path, monkeypatch):
+    """Test that a game still on its first night is caught up after a missed night end."""
+    clock = VirtualClock(datetime(2030, 5, 1, 12))
+    monkeypatch.setattr(GameEngine, "assign_roles", lambda self, game, player_ids: asyncio.sleep(0))
+    session = StartGameSession()
+    game = await GameEngine(session, clock).start_game(1, [1, 2, 3, 4])
+    assert game.phase_end_time == datetime(2030, 5, 2, settings.DAY_START_HOUR)
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/games.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Game).values(
+            id=game.id, city_id=1, status=game.status, day_number=1, phase_end_time=game.phase_end_time,
+        ))
+    monkeypatch.setattr(phases, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+
+    ended = []
+
+    async def end_night(self, game):
+        ended.append(game.id)
+
+    monkeypatch.setattr(GameEngine, "end_night", end_night)
+    try:
+        # The bot was down over the night end
+        assert await GameScheduler(clock=clock).catch_up() == 0
+        await clock.advance_to(datetime(2030, 5, 2, settings.DAY_START_HOUR, 30))
+        assert await GameScheduler(clock=clock).catch_up() == 1
+    finally:
+        await engine.dispose()
+
+    assert ended == [1]
@@ -0,0 +1,91 @@
+"""Tests for the Monte Carlo balance simulator."""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.models.role import RoleType
+from app.services.role_manager import RoleManager
+from simulator.__main__ import balance_table, parse_mix, parse_players, scenarios, tasks
+from simulator.engine import (
+    ASSIGNER_MIX,
+    CIVILIAN,
+    MAFIA,
+    MAFIA_WON,
+    SHERIFF,
+    UNFINISHED,
+    RoleMix,
+    Scenario,
+    _day_votes,
+    simulate,
+)
+
+
+def test_simulation_is_reproducible():
+    """Test that every game ends and a seed always gives the same results."""
+    scenario = Scenario(9, 2, ASSIGNER_MIX)
+    counts = simulate(scenario, 2000, 42)
+
+    assert counts.sum() == 2000
+    assert counts[UNFINISHED] == 0
+    assert (simulate(scenario, 2000, 42) == counts).all()
+
+
+def test_day_votes_go_to_alive_players():
+    """Test that nobody votes for a dead player and the dead do not vote."""
+    rng = np.random.default_rng(5)
+    roles = np.tile(np.array([MAFIA, MAFIA, SHERIFF, CIVILIAN, CIVILIAN, CIVILIAN, CIVILIAN], dtype=np.int8), (500, 1))
+    alive = rng.random(roles.shape) < 0.7
+    alive[:, [0, 3, 4]] = True
+    exposed = np.zeros(roles.shape, dtype=bool)
+    exposed[:, 1] = True
+
+    votes = _day_votes(rng, roles, alive, exposed)
+
+    assert (votes[~alive] == -1).all()
+    voted = votes[alive]
+    assert (voted >= 0).all()
+    game_idx = np.nonzero(alive)[0]
+    assert alive[game_idx, voted].all()
+
+
+def test_more_mafia_win_more():
+    """Test that win rates move the expected way with mafia and town roles."""
+    plain = RoleMix("plain", counts=(0, 0, 0))
+    one = simulate(Scenario(10, 1, plain), 4000, 1)[MAFIA_WON]
+    three = simulate(Scenario(10, 3, plain), 4000, 1)[MAFIA_WON]
+    sheriffs = simulate(Scenario(10, 3, RoleMix("sheriffs", counts=(0, 2, 0))), 4000, 1)[MAFIA_WON]
+
+    assert one < three
+    assert sheriffs < three
+
+
+def test_assigner_mix_matches_default_roles():
+    """Test that the assigner mix has one weight per town role the assigner can pick."""
+    town = [r for r in RoleManager.DEFAULT_ROLES if r["role_type"] == RoleType.CIVILIAN and not r.get("is_special")]
+
+    assert sum(ASSIGNER_MIX.weights) == len(town)
+    assert ASSIGNER_MIX.weights[2] == sum(1 for r in town if r.get("can_investigate"))
+    assert ASSIGNER_MIX.weights[3] == sum(1 for r in town if r.get("can_block"))
+
+
+def test_scenarios_and_tasks():
+    """Test that scenarios keep town the majority and chunks get distinct seeds."""
+    items = scenarios(parse_players("4-6,9"), [ASSIGNER_MIX, parse_mix("1,1,0")])
+    assert {(s.players, s.mafia) for s in items} == {(4, 1), (5, 1), (5, 2), (6, 1), (6, 2), (9, 1), (9, 2), (9, 3), (9, 4)}
+
+    work = tasks(items[:2], games=25, chunk=10, seed=3)
+    assert [games for _, games, _ in work] == [10, 10, 5, 10, 10, 5]
+    assert len({seed.spawn_key for _, _, seed in work}) == len(work)
+
+
+def test_balance_table_picks_closest_rate():
+    """Test that the table picks the mafia count closest to the target."""
+    totals = {
+        Scenario(9, 2, ASSIGNER_MIX): np.array([45, 55, 0]),
+        Scenario(9, 3, ASSIGNER_MIX): np.array([70, 30, 0]),
+        Scenario(9, 3, RoleMix("other", counts=(1, 1, 0))): np.array([50, 50, 0]),
+    }
+    table = balance_table(totals, ASSIGNER_MIX, 0.5)
+
+    assert table["player_counts"]["9"] == {"mafia": 2, "win_rates": {"2": 0.45, "3": 0.7}}
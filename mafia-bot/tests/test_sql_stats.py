@@ -0,0 +1,33 @@
+"""Tests for per-update SQL statement counting."""
+
+from sqlalchemy import create_engine, text
+
+from app.utils.sql_stats import install_query_counter, statement_shape, track_queries
+
+
+def test_statement_shape_ignores_parameters():
+    """Test that expanded IN lists and numbered parameters normalize alike."""
+    assert statement_shape("SELECT 1 WHERE id IN ($1, $2, $3)") == statement_shape(
+        "SELECT 1 WHERE id IN ($4)"
+    )
+    assert statement_shape("SELECT 1\n  WHERE id = $1") == "SELECT 1 WHERE id = ?"
+
+
+def test_track_queries_counts_and_detects_repeats():
+    """Test counting statements and flagging repeated shapes."""
+    engine = create_engine("sqlite://")
+    install_query_counter(engine)
+    install_query_counter(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+        with track_queries("profile.show_profile") as stats:
+            for value in range(3):
+                conn.execute(text("SELECT :value"), {"value": value})
+            conn.execute(text("SELECT 2"))
+
+    assert stats.handler == "profile.show_profile"
+    assert stats.count == 4
+    assert stats.total_time > 0
+    assert stats.repeated(3) == [("SELECT ?", 3)]
@@ -0,0 +1,23 @@
+"""Tests for FSM storage factory."""
+
+import json
+
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.config import settings
+from app.utils.storage import compact_dumps, create_fsm_storage
+
+
+def test_memory_storage_without_redis(monkeypatch):
+    """Test fallback to in-memory storage when Redis is not configured."""
+    monkeypatch.setattr(settings, "REDIS_URL", None)
+
+    assert isinstance(create_fsm_storage(), MemoryStorage)
+
+
+def test_compact_dumps():
+    """Test compact state data serialization."""
+    data = {"language": "ru", "name": "Город"}
+
+    assert compact_dumps(data) == '{"language":"ru","name":"Город"}'
+    assert json.loads(compact_dumps(data)) == data